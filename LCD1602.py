@@ -1,5 +1,24 @@
 from machine import Pin, PWM
 import time
+import os
+from array import array
+try:
+    import asyncio
+except ImportError:
+    import uasyncio as asyncio
+
+# 已知MCU的GPIO输出置位/清零/翻转寄存器地址，数据引脚都在同一端口时可一次写入全部数据线
+# 按 os.uname().machine 中 " with " 之后的芯片名称精确匹配，如 "ESP32S3 module with ESP32S3"；
+# 未列出的芯片（如 ESP32-C2/H2/P4）不使用整端口写入，逐个引脚写入
+GPIO_PORTS = {
+    "RP2040": {"set": 0xD0000014, "clr": 0xD0000018, "xor": 0xD000001C, "first": 0, "last": 29},
+    "RP2350": {"set": 0xD0000018, "clr": 0xD0000020, "xor": 0xD0000028, "first": 0, "last": 31},
+    "ESP32": {"set": 0x3FF44008, "clr": 0x3FF4400C, "first": 0, "last": 31},
+    "ESP32S2": {"set": 0x3F404008, "clr": 0x3F40400C, "first": 0, "last": 31},
+    "ESP32S3": {"set": 0x60004008, "clr": 0x6000400C, "first": 0, "last": 31},
+    "ESP32C3": {"set": 0x60004008, "clr": 0x6000400C, "first": 0, "last": 21},
+    "ESP32C6": {"set": 0x60091008, "clr": 0x6009100C, "first": 0, "last": 30},
+}
 
 class LCD1602:
     """
@@ -8,13 +27,17 @@ class LCD1602:
     hi@leilei.name
     2025 by LeiLei
     """
-    def __init__(self, name = 'lcd1620'):
+    def __init__(self, name = 'lcd1620', transport=None, timing=None):
         """
         通过名称初始化 LCD1602 实例
         Initialize LCD1602 instance with a name.
         并初始化为默认配置
         Initialize with default configuration.
         :param name: 实例名称，默认为 'lcd1620'
+        :param transport: 外部传输对象（如 I2C 转接板），为 None 时按默认配置使用GPIO直连
+        An external transport (such as an I2C backpack). None uses direct GPIO with the default configuration.
+        :param timing: 时序配置名称或字典（如 load_timing_profile() 读取的校准结果），为 None 时使用 "default"
+        A timing profile name or dict (such as a calibration result read by load_timing_profile()). None uses "default".
         """
         # 类版本号
         self.version = "1.0.2"
@@ -65,6 +88,12 @@ class LCD1602:
         # 存储LCD引脚名称和对应绑定了MCU引脚的 Pin 对象的字典 用于实际操作引脚
         self.bind_mcu_pins = {}
 
+        # 数据引脚整端口写入的配置
+        # 手动指定的GPIO端口描述，None 表示按MCU型号自动识别，格式同 GPIO_PORTS
+        self.gpio_port = None
+        # 检查通过后可用于整端口写入的端口描述，None 表示逐个引脚写入
+        self.data_port = None
+
         # 配置LCD电源引脚连接到MCU引脚的名称或编号
         # VSS
         self.__vss_to_mcu_pin__ = "GND"
@@ -108,9 +137,34 @@ class LCD1602:
             "enable": False,                       # 是否启用BLA PWM控制
             "pin_name": self.__default_pins__[14], # 取得LCD BLA 引脚名称
             "freq": 1000,                          # PWM 频率
-            "duty_u16": 32768,                     # 默认占空比为50%
+            "duty_u16": 32768,                     # 占空比，初始化时按 gamma 查找表由背光亮度计算
             "brightness_percent": 50,              # 默认背光亮度为50%
         }
+        # 背光和对比度渐变，见 fade_backlight()
+        self.fade = {
+            "gamma": 2.2,  # 背光亮度的 gamma 值，见 set_backlight_gamma()
+            "levels": None,  # 背光 gamma 查找表，256级亮度对应的占空比
+            "step_ms": 20,  # 渐变每一步的间隔（毫秒）
+            "timer_id": -1,  # machine.Timer 编号，-1 为虚拟定时器，ESP32 等需改为硬件定时器编号
+            "timer": None,  # 运行中的定时器，没有定时器渐变时为 None
+            "jobs": {},  # 正在进行的渐变，PWM 引脚名称 "BLA"/"V0" -> 渐变状态
+        }
+        self.set_backlight_gamma(self.fade["gamma"])
+        # 背光占空比与亮度百分比保持一致
+        self.bla_pwm["duty_u16"] = self.backlight_duty(self.bla_pwm["brightness_percent"])
+        # 空闲电源管理，见 set_power_manager()
+        self.power = {
+            "enabled": False,  # 是否开启空闲电源管理
+            "dim_s": 30,  # 内容无变化多少秒后调暗背光
+            "off_s": 60,  # 调暗后再过多少秒关闭显示
+            "dim_percent": 10,  # 调暗后的背光亮度百分比
+            "fade_ms": 1000,  # 调暗的渐变时间（毫秒），0 为立即调暗
+            "state": "on",  # 电源状态："on" 正常，"dim" 背光调暗，"off" 显示关闭
+            "last_ms": 0,  # 最近一次内容变化的时间
+            "state_ms": 0,  # 进入当前状态的时间
+            "time_ms": {"on": 0, "dim": 0, "off": 0},  # 各状态累计的时间（毫秒），不含当前状态正在经过的时间
+            "saved": None,  # 调暗前的背光亮度、显示开关和传输对象背光，唤醒时恢复
+        }
 
         # ########################################
         # 关于LCD的基本设置和互动方式的相关配置
@@ -126,7 +180,27 @@ class LCD1602:
             "data_trans_bits": 4,  # 默认数据传输位数，4位或8位
             "display_lines": 2,  # 默认显示行数，1或2
             "dot_matrix": 7,  # 默认点阵大小设置为7（5x7），可选：10（5x10）
+            "busy_flag_polling": False,  # 是否通过RW读取忙标志代替固定延时，需要RW引脚连接到GPIO
+            "busy_timeout_us": 10000,  # 轮询忙标志的超时时间（微秒）
+            "data_port_write": True,  # 数据引脚都在同一GPIO端口时，是否通过端口寄存器一次写入全部数据线
+            "write_planner": True,  # 刷新时是否按传输代价选择地址跳转/重写间隔/清屏，并延迟发送光标定位
+        }
+
+        # 时序配置（微秒/毫秒），见 set_timing_profile()
+        # enable_us: 使能脉冲高电平宽度; pulse_us: 每次使能脉冲后的等待; command_us: 模式命令后的额外等待;
+        # clear_us: 清屏/归位后的等待; power_on_ms: 上电延时; wake_ms: 第一次唤醒后的等待
+        self.timing_profiles = {
+            # 按最慢的兼容芯片调整，与固定延时的旧版本相同
+            "default": {"enable_us": 1, "pulse_us": 100, "command_us": 40, "clear_us": 2000, "power_on_ms": 15, "wake_ms": 5},
+            # HD44780 数据手册：5V，振荡频率 270kHz，指令执行 37us + tADD 4us，清屏 1.52ms
+            "strict": {"enable_us": 1, "pulse_us": 41, "command_us": 40, "clear_us": 1520, "power_on_ms": 15, "wake_ms": 5},
+            # 振荡频率较高的兼容芯片
+            "fast": {"enable_us": 1, "pulse_us": 20, "command_us": 20, "clear_us": 800, "power_on_ms": 15, "wake_ms": 5},
+            # 3.3V 供电：振荡频率较低，电源升到 2.7V 后须等待≥40ms
+            "3v3": {"enable_us": 1, "pulse_us": 55, "command_us": 55, "clear_us": 2200, "power_on_ms": 40, "wake_ms": 5},
         }
+        # 当前使用的时序
+        self.timing = self.timing_profile("default")
 
         # 定义LCD1602命令集
         self.command = {
@@ -166,13 +240,63 @@ class LCD1602:
 
         # 长文本浏览器
         self.browser = {
-            "content": "", # 存储文本内容的缓冲区
+            "buffer": None, # 存储显示字符码的环形缓冲区，在设置缓冲区大小或第一次写入时分配
+            "head": 0, # 环形缓冲区中最早内容的位置
+            "offset": 0, # 最早内容在写入流中的绝对位置，淘汰内容时增加
+            "word_wrap": False, # 是否按单词换行
+            "index": None, # 行索引，见 browser_index_reset()
+            "file": None, # 文件内容源，见 browser_open_file()，为 None 时显示缓冲区内容
+            "search": None, # 搜索状态和匹配位置缓存，见 browser_find()
             "content_length": 0, # 内容长度从1开始计数
             "content_max_length": 65536,
             "line_width": 16,
             "line_count": 0, # 行数从1开始计数
             "line_pointer": 0, # 行指针从0开始计数
-            "print_speed": 3 # 默认打印速度为3次每秒
+            "print_speed": 3, # 默认打印速度为3次每秒
+            "follow": False, # 跟随模式，写入时只追加内容，由限速刷新显示最新的2行
+            "follow_rate": 4, # 跟随模式每秒最多刷新次数
+            "follow_pending": False, # 是否有尚未显示的新内容
+            "follow_last_ms": 0 # 跟随模式上次刷新的时间
+        }
+        self.browser_index_reset()
+
+        # ########################################
+        # 关于显示缓冲区（DDRAM影子）的相关配置
+        #
+
+        # 显示缓冲区，每行对应DDRAM的40个单元
+        self.framebuffer = {
+            "frame": [bytearray(b" " * 40), bytearray(b" " * 40)],  # 期望显示的内容
+            "shadow": [bytearray(b" " * 40), bytearray(b" " * 40)],  # 屏幕DDRAM当前内容的镜像
+            "shadow_valid": False,  # 镜像是否与屏幕一致，不一致时下一次刷新将重写全部单元
+            "address": None,  # 硬件地址计数器AC的镜像，None 表示未知
+            "auto_flush": True,  # 写入缓冲区后是否立即刷新到屏幕
+            "shift": 0,  # 显示移位量，屏幕左移为正，屏幕第0列显示DDRAM第 shift 列
+            "frame_rate": 0,  # 自动刷新的最大帧率（每秒），0 为不限速，见 set_frame_rate()
+            "pending": False,  # 是否有限速推迟、尚未刷新的内容
+            "refresh_ms": 0,  # 上次限速刷新的时间
+            "updates": 0,  # 写入缓冲区后请求自动刷新的次数
+            "refreshes": 0,  # 自动刷新实际执行的次数，与 updates 之比为合并比
+        }
+
+        # ########################################
+        # 关于字符编码的相关配置
+        #
+
+        # 字符 ROM 编码表，见 set_rom_code()
+        self.rom = {
+            "code": None,  # ROM 编码表名称，None 表示直接发送 ord(char) & 0xFF
+            "table": None,  # 编译后的查找表，键为 Unicode 码位
+            "translate": hasattr(str, "translate"),  # 是否支持 str.translate()，MicroPython 不支持时逐字符查表
+        }
+
+        # 自定义字符，任意数量的逻辑字形按最近最少使用分配到8个CGRAM槽位
+        self.glyphs = {
+            "patterns": {},  # 逻辑字形，字符 -> 8行点阵
+            "slots": [None] * 8,  # 每个CGRAM槽位分配的字符
+            "shadow": [None] * 8,  # CGRAM内容的镜像，None 表示未知
+            "used": [0] * 8,  # 每个槽位最近一次使用的计数
+            "tick": 0,  # 使用计数
         }
 
         # ########################################
@@ -185,9 +309,39 @@ class LCD1602:
         self.is_write_ready = False
         # 是否准备好读取数据
         self.is_read_ready = False
+        # 发送和读取数据的传输对象，在初始化引脚时生成
+        self.transport = None
+        # 是否使用外部传入的传输对象，为 True 时初始化不再绑定GPIO数据和控制引脚
+        self.is_external_transport = False
+        # 延时函数，统计开启时被替换为计数的版本
+        self.sleep = time.sleep
+        self.sleep_ms = time.sleep_ms
+        self.sleep_us = time.sleep_us
+
+        # ########################################
+        # 关于总线统计的相关配置
+        #
+
+        # 总线统计计数，关闭时不安装任何计数包装，不产生额外开销
+        self.counters = {
+            "enabled": False,  # 是否开启统计
+            "methods": {},  # 按公共方法分类的计数
+            "current": None,  # 当前计数的方法的计数字典
+            "depth": 0,  # 公共方法嵌套调用深度，只统计最外层方法
+            "wrapped": [],  # 被计数包装覆盖的公共方法名
+            "saved": [],  # 被计数包装替换的传输对象属性，关闭统计时恢复
+        }
 
         # 启动默认初始化
-        self.init_by_default()
+        if transport is None:
+            if timing is not None:
+                self.set_timing_profile(timing)
+            self.init_by_default()
+        else:
+            self.set_transport(transport)
+            if timing is not None:
+                self.set_timing_profile(timing)
+            self.init_lcd_write()
     # end of __init__
     
     # Class 的字符串表示
@@ -237,6 +391,9 @@ class LCD1602:
                 raise ValueError(f"Invalid GPIO pin number: {mcu_pin_name}. Must be in range {self.get_mcu_gpio_pins_list()}.")
         # 设置LCD引脚所连接的MCU引脚值
         self.enabled_pins[pin_name] = mcu_pin_name
+        # 数据引脚变化后重新检查能否整端口写入
+        if pin_name in self.__default_data_pins__:
+            self.check_data_port()
         return True
     # end of enable_pin
 
@@ -319,6 +476,7 @@ class LCD1602:
                 self.enabled_pins[self.__default_data_pins__[i]] = pin
         else:
             raise ValueError("Invalid data transmit mode. Use '4bits' or '8bits'.")
+        self.check_data_port()
         return True
         
     # 停用LCD引脚并动态断开引脚的连接
@@ -489,6 +647,80 @@ class LCD1602:
         else:
             return False
 
+    # 手动指定数据引脚整端口写入所用的GPIO端口
+    def set_gpio_port(self, port=None):
+        """
+        手动指定GPIO端口的置位/清零寄存器，用于未能自动识别的MCU或模拟端口
+        Manually set the GPIO port set/clear registers, for MCUs that are not detected or for a simulated port.
+        :param port: 端口描述字典，包含 "set"、"clr"、可选的 "xor" 寄存器地址，端口引脚范围 "first"、"last"，
+        以及可选的内存访问对象 "mem"（默认为 machine.mem32）；为 None 时恢复自动识别
+        A dict with the "set", "clr" and optional "xor" register addresses, the port pin range "first" and "last",
+        and an optional memory accessor "mem" (machine.mem32 by default). None restores auto detection.
+        :return: 当前数据引脚能否整端口写入
+        Returns whether the current data pins can use the whole-port write.
+        """
+        if port is not None:
+            for key in ["set", "clr", "first", "last"]:
+                if key not in port:
+                    raise ValueError(f"Invalid GPIO port. Missing key: {key}.")
+        self.gpio_port = port
+        return self.check_data_port()
+
+    # 获取当前MCU的GPIO端口描述
+    def get_gpio_port(self):
+        """
+        获取手动指定或按MCU型号识别的GPIO端口描述
+        Get the GPIO port description, either set manually or detected from the MCU model.
+        :return: 端口描述字典，无法识别时返回 None
+        Returns the port description, or None if the MCU is not known.
+        """
+        if self.gpio_port is not None:
+            port = self.gpio_port
+        else:
+            try:
+                machine_name = os.uname().machine
+            except AttributeError:
+                return None
+            # 只按芯片名称精确匹配，避免 ESP32S2 等型号误用 ESP32 的寄存器地址
+            port = GPIO_PORTS.get(machine_name.split(" with ")[-1].strip())
+            if port is None:
+                return None
+        if "mem" in port:
+            return port
+        try:
+            from machine import mem32
+        except ImportError:
+            return None
+        port = dict(port)
+        port["mem"] = mem32
+        return port
+
+    # 检查数据引脚能否整端口写入
+    def check_data_port(self):
+        """
+        检查当前传输模式所用的数据引脚是否都在同一GPIO端口，可以通过端口寄存器一次写入
+        Check whether the data pins of the current transmission mode are all on one GPIO port and can be written at once.
+        :return: 可以整端口写入返回 True，否则返回 False
+        Returns True if the whole-port write is possible, otherwise False.
+        """
+        self.data_port = None
+        if not self.settings["data_port_write"]:
+            return False
+        if self.settings["data_trans_bits"] == 4:
+            data_pins = self.__default_data_pins__[4:]
+        else:
+            data_pins = self.__default_data_pins__
+        port = self.get_gpio_port()
+        if port is None:
+            return False
+        for pin_name in data_pins:
+            if pin_name not in self.enabled_pins:
+                return False
+            if not port["first"] <= self.enabled_pins[pin_name] <= port["last"]:
+                return False
+        self.data_port = port
+        return True
+
     # ########################################
     # 以下是获取并返回引脚信息以便程序处理的方法
     #
@@ -683,10 +915,7 @@ class LCD1602:
         发送使能脉冲信号
         Send a pulse to the enable pin.
         """
-        self.bind_mcu_pins[self.__default_pins__[5]].value(1)
-        time.sleep_us(1)
-        self.bind_mcu_pins[self.__default_pins__[5]].value(0)
-        time.sleep_us(100)
+        self.transport.pulse()
 
     # 发送清屏命令
     def set_clear(self):
@@ -696,7 +925,14 @@ class LCD1602:
         """
         self.send_byte_command(self.command["LCD_CLEARDISPLAY"])  # 发送清屏命令
         self.settings["cursor_position"] = 0x00
-        time.sleep_ms(2)  # 等待清屏完成
+        # 清屏后DDRAM全部为空格，同步显示缓冲区
+        for row in range(2):
+            self.framebuffer["frame"][row][:] = b" " * 40
+            self.framebuffer["shadow"][row][:] = b" " * 40
+        self.framebuffer["shadow_valid"] = True
+        self.framebuffer["address"] = 0x00
+        self.framebuffer["shift"] = 0
+        self.wait_ready(self.timing["clear_us"])  # 等待清屏完成
         return True
     # 清屏命令别名
     def clear(self):
@@ -708,10 +944,12 @@ class LCD1602:
         清空指定行
         Clear the specified line.
         """
-        self.cursor_position(line, 0)
-        for i in range(40):
-            self.send_byte_data(0x20)
-        self.cursor_position(line, 0)
+        if line not in [0, 1]:
+            raise ValueError("Invalid line number. Line must be 0 or 1.")
+        self.framebuffer["frame"][line][:] = b" " * 40
+        # 清除后光标停在行首
+        self.settings["cursor_position"] = line * 0x40
+        self.frame_update()
         return True
 
     # 发送光标归位命令
@@ -722,7 +960,9 @@ class LCD1602:
         """
         self.send_byte_command(self.command["LCD_RETURNHOME"])  # 光标归位到左上角00位置
         self.settings["cursor_position"] = 0x00
-        time.sleep_ms(2)  # 等待光标归位完成
+        self.framebuffer["address"] = 0x00
+        self.framebuffer["shift"] = 0  # 归位同时取消显示移位
+        self.wait_ready(self.timing["clear_us"])  # 等待光标归位完成
         return True
 
     # 设置光标AC的Increase模式
@@ -767,7 +1007,7 @@ class LCD1602:
         ]
         # 选择命令并发送
         self.send_byte_command(cmds[ac][display])
-        time.sleep_us(40)  # 等待命令执行完成
+        self.wait_ready(self.timing["command_us"])  # 等待命令执行完成
         return True
 
     # 设置显示开关
@@ -831,8 +1071,11 @@ class LCD1602:
             self.command["LCD_DISPLAYCONTROL_8"], # 0x0F: 显示开，光标开，闪烁开
         ]
         idx = (display << 2) | (cursor << 1) | blink
+        # 显示光标前先让硬件光标回到光标指示器的位置
+        if (cursor or blink) and self.is_write_ready:
+            self.cursor_sync()
         self.send_byte_command(cmds[idx])
-        time.sleep_us(40)  # 等待命令执行完成
+        self.wait_ready(self.timing["command_us"])  # 等待命令执行完成
         return True
 
     # 动态设置数据传输模式
@@ -846,9 +1089,16 @@ class LCD1602:
         # 检查模式是否有效
         if bits not in [4, 8]:
             raise ValueError("Invalid data transmission mode. Use 4 or 8.")
+        # 外部传输对象的数据总线宽度是固定的
+        if self.is_external_transport and bits != self.transport.bits:
+            raise ValueError(f"Invalid data transmission mode. The transport only supports {self.transport.bits} bits.")
         # 更新数据传输模式设置
         self.settings["data_trans_bits"] = bits
-        self.set_data_lines_matrix_mode()  # 更新数据传输接口/显示行数/字符点阵
+        # 只有已绑定的数据总线宽度一致时才能立即发送，否则在 init() 时生效
+        if self.transport is not None and self.transport.bits == bits:
+            self.set_data_lines_matrix_mode()  # 更新数据传输接口/显示行数/字符点阵
+        # 检查新的数据引脚组合能否整端口写入
+        self.check_data_port()
         # 更新数据模式后，须重新手动初始化数据引脚，Pin状态才可用
         self.is_pin_ready = False
         self.is_read_ready = False
@@ -910,7 +1160,7 @@ class LCD1602:
                     self.send_byte_command(self.command["LCD_FUNCTIONSET_8BIT_2LINE_5x7"])
                 elif self.settings["dot_matrix"] == 10:
                     self.send_byte_command(self.command["LCD_FUNCTIONSET_8BIT_2LINE_5x10"])
-        time.sleep_us(40)  # 等待命令执行完成
+        self.wait_ready(self.timing["command_us"])  # 等待命令执行完成
         return True
 
     # ########################################
@@ -926,15 +1176,9 @@ class LCD1602:
         # 检查数据是否完成初始化
         if not self.is_pin_ready:
             raise ValueError("Pin is not ready. Please initialize the pin first.")
-        data_pins_list = self.get_bind_mcu_data_pins_list()
-        if bits_count != len(data_pins_list):
+        if bits_count != self.transport.bits:
             raise ValueError("Invalid bits count. Please check the data pins configuration.")
-        # 通过RW选择进行写操作
-        self.bind_mcu_pins[self.__default_pins__[4]].value(0)
-        # 发送数据
-        for i in range(bits_count):
-            self.bind_mcu_pins[data_pins_list[i]].value((value >> i) & 1)
-        self.pulse_enable()  # 发送使能脉冲信号
+        self.transport.write_bits(value)
         return True
 
     # 发送字节
@@ -945,14 +1189,11 @@ class LCD1602:
         """
         if not isinstance(value, int):
             raise ValueError("Invalid value type. Expected an integer.")
-        # 根据数据传输模式设置发送位数
-        if self.settings["data_trans_bits"] == 4:
-            self.send_bits(value >> 4, 4) #发送高4位数据
-            self.send_bits(value & 0x0F, 4) #发送低4位数据
-        elif self.settings["data_trans_bits"] == 8:
-            self.send_bits(value, 8)
-        else:
-            raise ValueError("Invalid data transmission mode. Use '4bits' or '8bits'.")
+        # 检查数据是否完成初始化
+        if not self.is_pin_ready:
+            raise ValueError("Pin is not ready. Please initialize the pin first.")
+        # 由传输对象按预先生成的电平表发送，4位模式自动拆分为高低4位
+        self.transport.write(value)
         return True
 
     # 发送LCD字节命令
@@ -962,7 +1203,7 @@ class LCD1602:
         Send a command.
         """
         # 通过RS选择发送命令还是发送数据
-        self.bind_mcu_pins[self.__default_pins__[3]].value(0)
+        self.transport.set_rs(0)
         self.send_byte(value)  # 发送命令
         return True
 
@@ -972,9 +1213,22 @@ class LCD1602:
         发送数据
         Send a byte.
         """
+        # 延迟定位时先让硬件地址计数器回到光标位置
+        if self.cursor_is_lazy():
+            self.cursor_sync()
         # 通过RS选择发送命令还是发送数据
-        self.bind_mcu_pins[self.__default_pins__[3]].value(1)
+        self.transport.set_rs(1)
         self.send_byte(value)  # 发送数据
+        if self.power["enabled"]:
+            self.power_activity()
+        # 数据写入了硬件AC所指的单元，同步显示缓冲区
+        address = self.framebuffer["address"]
+        if address is None:
+            self.framebuffer["shadow_valid"] = False
+        else:
+            self.framebuffer["frame"][address >> 6][address & 0x3F] = value & 0xFF
+            self.framebuffer["shadow"][address >> 6][address & 0x3F] = value & 0xFF
+            self.framebuffer["address"] = self.ddram_address_step(address, self.settings["ac_auto_increase"])
         # 更新光标指示器
         self.cursor_position_increase()
         return True
@@ -987,7 +1241,12 @@ class LCD1602:
         """
         if not isinstance(char, str) or len(char) != 1:
             raise ValueError("Invalid character. Expected a single character string.")
-        self.send_byte_data(ord(char))
+        # 写入光标所在的缓冲区单元，再移动光标；带浊点的片假名占两个单元
+        for code in self.glyph_text_to_codes(char):
+            address = self.settings["cursor_position"]
+            self.framebuffer["frame"][address >> 6][address & 0x3F] = code
+            self.settings["cursor_position"] = self.ddram_address_step(address, self.settings["ac_auto_increase"])
+        self.frame_update()
         return True
 
     # 向LCD缓冲区第0行或第1行写入数据，每行最大写入40字节，超出16字节部分默认将不显示
@@ -999,16 +1258,35 @@ class LCD1602:
         :return: 如果发送成功，返回 True
         Returns True if the sending is successful.
         """
-        if line not in [0, 1]:
-            raise ValueError("Invalid line number. Line must be 0 or 1.")
         # 检查数据是否完成初始化
         if not self.is_write_ready:
             raise ValueError("Write is not ready. Please initialize the write first.")
-        # 打印前先清除行
-        self.clear_line(line)
-        # 将字符串转换为ASCII码
-        for char in text[:40]:
-            self.send_byte_data(ord(char))
+        # 先写入显示缓冲区，再只刷新发生变化的单元
+        self.frame_print_line(text, line)
+        self.frame_update()
+        return True
+
+    # 从指定位置写入一段显示字符码
+    def write_bytes(self, buf, row=0, col=0):
+        """
+        从指定行列写入一段已编码的显示字符码，不做字符转换，也不生成字符串；
+        写入显示缓冲区后刷新，连续变化的单元只发送1次地址命令，光标在结束时一次性移动到写入内容之后
+        Write already encoded display codes from the given row and column, without converting characters or
+        building strings. The codes go into the frame buffer and are flushed, so a run of changed cells costs
+        a single address command, and the cursor moves past the codes once at the end.
+        :param buf: 显示字符码（bytes/bytearray/memoryview），超出该行40个单元的部分被丢弃
+        The display codes (bytes/bytearray/memoryview). Codes past the 40 cells of the line are dropped.
+        :param row: 行号 0 或 1
+        The row, 0 or 1.
+        :param col: 起始列 0-39
+        The start column, 0 to 39.
+        """
+        if not self.is_write_ready:
+            raise ValueError("Write is not ready. Please initialize the write first.")
+        if isinstance(buf, str):
+            raise ValueError("Invalid buffer type. Expected bytes, bytearray or memoryview. Use print_line() for strings.")
+        self.frame_write_bytes(buf, row, col)
+        self.frame_update()
         return True
 
     # 以翻页方式逐页显示长文本
@@ -1017,11 +1295,33 @@ class LCD1602:
         以翻页方式逐页显示长文本
         Print long text page by page.
         """
+        for _ in self.print_frames(text, line_width):
+            self.sleep(1 / speed)
+        return True
+
+    # print 的异步版本
+    async def print_async(self, text, speed=1, line_width=16):
+        """
+        print 的异步版本，翻页之间让出执行权，可被取消
+        The async version of print. Yields between pages and can be cancelled.
+        """
+        for _ in self.print_frames(text, line_width):
+            await asyncio.sleep(1 / speed)
+        return True
+
+    # 逐页显示长文本，每显示一页后暂停
+    def print_frames(self, text, line_width=16):
+        """
+        逐页显示长文本的生成器，每显示一页后 yield 一次，由调用者决定页间等待方式
+        A generator that prints long text page by page and yields after each page,
+        leaving the wait between pages to the caller.
+        """
         if line_width < 1 or line_width > 40:
             line_width = 16
+        # 先转换为显示字符码，按显示单元分页
+        text = self.glyph_text_to_codes(text)
         # 将长文本分割为多页
         pages = [text[i:i + line_width] for i in range(0, len(text), line_width)]
-        interval = 1 / speed
         pages_lens = len(pages)
         for lp in range(pages_lens):
             if lp + 1 < pages_lens:
@@ -1030,12 +1330,11 @@ class LCD1602:
             else:
                 self.print_line(pages[lp], 0)
                 self.clear_line(1)  # 最后一页只显示一行
-            time.sleep(interval)
+            yield lp
         self.set_clear()
-        return True
 
     # 在屏幕第0行或第1行滚屏显示字符串1次
-    def scroll_line(self, text, line=0, speed=3):
+    def scroll_line(self, text, line=0, speed=3, marquee=False):
         """
         在指定行滚动显示字符串
         Scroll a string on the specified line.
@@ -1043,6 +1342,30 @@ class LCD1602:
         text: The text to scroll.
         line: The line number to display the text on (0 or 1).
         speed: The speed of the scrolling (default is 2).
+        marquee: 使用硬件显示移位滚动，每帧只发送1条命令 Scroll with the hardware display shift, one command per frame.
+        """
+        frames = self.scroll_line_marquee_frames(text, line) if marquee else self.scroll_line_frames(text, line)
+        for _ in frames:
+            self.sleep(1 / speed)
+        return True
+
+    # scroll_line 的异步版本
+    async def scroll_line_async(self, text, line=0, speed=3, marquee=False):
+        """
+        scroll_line 的异步版本，每帧之间让出执行权，可被取消
+        The async version of scroll_line. Yields between frames and can be cancelled.
+        """
+        frames = self.scroll_line_marquee_frames(text, line) if marquee else self.scroll_line_frames(text, line)
+        for _ in frames:
+            await asyncio.sleep(1 / speed)
+        return True
+
+    # 在指定行逐帧滚动字符串，每显示一帧后暂停
+    def scroll_line_frames(self, text, line=0):
+        """
+        在指定行滚动显示字符串的生成器，每显示一帧后 yield 一次，由调用者决定帧间等待方式
+        A generator that scrolls a string on the specified line and yields after each frame,
+        leaving the wait between frames to the caller.
         """
         # 检查数据是否完成初始化
         if not self.is_write_ready:
@@ -1051,14 +1374,1098 @@ class LCD1602:
         # self.send_byte_command(self.command["LCD_DISPLAYCONTROL_5"])
         # 重置光标到指定行首
         self.cursor_position(line, 0)
-        paded_text = " " * 16 + text + " " * 16
-        interval = 1 / speed
+        paded_text = b" " * 16 + bytes(self.glyph_text_to_codes(text)) + b" " * 16
         for i in range(len(paded_text) - 16):
             text_slice = paded_text[i:i + 16]
             self.print_line(text_slice, line)
-            time.sleep(interval)
+            yield i
         # 清除该行内容
         self.clear_line(line)
+
+    # 用硬件显示移位在指定行逐帧滚动字符串，每显示一帧后暂停
+    def scroll_line_marquee_frames(self, text, line=0):
+        """
+        用硬件显示移位滚动字符串的生成器，效果与 scroll_line_frames 相同。
+        文本先写入该行DDRAM的40个单元，之后每帧只发送1条显示移位命令；文本超出屏幕外的24个单元时，
+        每移位24帧在屏幕外的单元中补写一次后续内容。
+        显示移位同时移动两行，另一行40个单元内容不全相同时，保持它不动的代价与逐帧重写相同，因此退回 scroll_line_frames
+        A generator with the same effect as scroll_line_frames, driven by the hardware display shift.
+        The text goes into the 40 DDRAM cells of the line once, then each frame sends a single display shift
+        command. Text longer than the 24 hidden cells is refilled into the hidden cells once every 24 frames.
+        The shift moves both lines, so when the other line is not uniform it falls back to scroll_line_frames,
+        since keeping the other line still would cost as much as rewriting the scrolled line.
+        """
+        # 检查数据是否完成初始化
+        if not self.is_write_ready:
+            raise ValueError("Write is not ready. Please initialize the write first.")
+        if line not in [0, 1]:
+            raise ValueError("Invalid line number. Line must be 0 or 1.")
+        fb = self.framebuffer
+        self.set_display_shift(0)
+        other_frame = bytes(fb["frame"][1 - line])
+        if other_frame != other_frame[:1] * 40:
+            yield from self.scroll_line_frames(text, line)
+            return
+        frame = fb["frame"][line]
+        codes = b" " * 16 + bytes(self.glyph_text_to_codes(text)) + b" " * 16
+        # 第0帧：DDRAM第j列存放文本第j个字符
+        written = min(40, len(codes))
+        frame[:written] = codes[:written]
+        self.flush()
+        yield 0
+        for i in range(1, len(codes) - 16):
+            refill = i + 16 > written
+            if refill:
+                # 移位前可见的是第 i-1 到 i+14 列，在其余24个屏幕外的单元中写入后续内容
+                end = min(i + 39, len(codes))
+                for j in range(written, end):
+                    frame[j % 40] = codes[j]
+                written = end
+                self.flush()
+            self.set_display_shift(i)
+            yield i
+        # 取消显示移位并清除该行内容
+        self.set_display_shift(0)
+        self.clear_line(line)
+
+    # 设置显示移位量
+    def set_display_shift(self, offset):
+        """
+        用显示移位命令把屏幕移动到指定位置，使屏幕第0列显示DDRAM第 offset 列，按较短的方向移动
+        Shift the display with the display shift commands so that screen column 0 shows DDRAM column offset,
+        moving in the shorter direction.
+        :param offset: 显示移位量 0-39
+        The display shift, 0-39.
+        """
+        fb = self.framebuffer
+        offset %= 40
+        left = (offset - fb["shift"]) % 40
+        if left <= 20:
+            for _ in range(left):
+                self.send_byte_command(self.command["LCD_CURSORSHIFT_3"])  # 屏幕左移
+                self.wait_ready(self.timing["command_us"])
+        else:
+            for _ in range(40 - left):
+                self.send_byte_command(self.command["LCD_CURSORSHIFT_4"])  # 屏幕右移
+                self.wait_ready(self.timing["command_us"])
+        fb["shift"] = offset
+        return True
+
+    # ########################################
+    # 以下是关于字符编码的方法
+    #
+
+    # 设置字符 ROM 编码表
+    def set_rom_code(self, rom="A00"):
+        """
+        设置屏幕的字符 ROM 编码表，之后写入的字符串按编码表转换为显示字符码。
+        编码表在设置时编译为一个查找表，整个字符串一次转换，不在发送循环中逐字符处理
+        Set the character ROM code table of the panel. Strings written afterwards are converted to display
+        codes with it. The table is compiled once here, so whole strings are converted in one pass instead of
+        per character in the send loop.
+        :param rom: "A00"（日文，含半角片假名）、"A02"（欧洲），None 表示直接发送 ord(char) & 0xFF
+        "A00" (Japanese, with half-width katakana), "A02" (European), or None to send ord(char) & 0xFF.
+        """
+        if rom is None:
+            self.rom["table"] = None
+        else:
+            from LCD1602_rom import compile_rom
+            self.rom["table"] = compile_rom(rom)
+        self.rom["code"] = rom
+        return True
+
+    # 把字符串转换为显示字符码
+    def text_to_codes(self, text):
+        """
+        按字符 ROM 编码表把字符串转换为显示字符码。有替代字符的字符显示为替代字符，
+        片假名的浊点和半浊点占一个单元，编码表中没有的字符显示为 "?"
+        Convert a string to display codes with the character ROM code table. Characters with a substitution
+        are shown as the substitution, katakana voiced marks take a cell of their own, and characters that are
+        not in the table are shown as "?".
+        :param text: 字符串；bytes/bytearray/memoryview 视为已编码的显示字符码，原样返回
+        The string. bytes/bytearray/memoryview are taken as display codes and returned unchanged.
+        :return: 显示字符码
+        Returns the display codes.
+        """
+        if not isinstance(text, str):
+            return text
+        table = self.rom["table"]
+        if table is None:
+            return bytes(ord(char) & 0xFF for char in text)
+        if self.rom["translate"]:
+            # 查找表覆盖了 0x80-0xFF，转换后其余超出 Latin-1 的字符编码为 "?"
+            return text.translate(table).encode("latin-1", "replace")
+        codes = bytearray()
+        get = table.get
+        for char in text:
+            code = ord(char)
+            value = get(code, code if code < 0x80 else 0x3F)
+            if isinstance(value, int):
+                codes.append(value)
+            else:
+                for char in value:
+                    codes.append(ord(char))
+        return codes
+
+    # ########################################
+    # 以下是关于自定义字符（CGRAM）的方法
+    #
+
+    # 定义自定义字符
+    def define_glyph(self, char, pattern):
+        """
+        定义一个自定义字符，之后 print_line() 等方法写入的字符串中的该字符会自动分配CGRAM槽位并显示为该点阵。
+        可以定义任意数量的字符，同时显示的字符不超过8个
+        Define a custom glyph. The character in strings written by print_line() and so on is then given a
+        CGRAM slot automatically and shown with this pattern. Any number of glyphs can be defined, and up to 8
+        can be on screen at once.
+        :param char: 代表该字形的单个字符，例如 "\ue000"
+        The single character standing for the glyph, for example "\ue000".
+        :param pattern: 8行点阵，每行低5位有效
+        The 8 rows of the pattern. The low 5 bits of each row are used.
+        """
+        if not isinstance(char, str) or len(char) != 1:
+            raise ValueError("Invalid character. Expected a single character string.")
+        if len(pattern) != 8:
+            raise ValueError("Invalid glyph pattern. Expected 8 rows.")
+        pattern = bytes(row & 0x1F for row in pattern)
+        glyphs = self.glyphs
+        glyphs["patterns"][char] = pattern
+        # 已分配槽位的字形立即更新，屏幕上的该字符随之改变
+        if char in glyphs["slots"] and self.is_write_ready:
+            self.write_cgram(glyphs["slots"].index(char), pattern)
+        return True
+
+    # 删除自定义字符
+    def remove_glyph(self, char):
+        """
+        删除自定义字符并释放其CGRAM槽位，CGRAM内容保持不变
+        Remove a custom glyph and free its CGRAM slot. The CGRAM content is left as is.
+        """
+        glyphs = self.glyphs
+        if char not in glyphs["patterns"]:
+            return False
+        del glyphs["patterns"][char]
+        if char in glyphs["slots"]:
+            glyphs["slots"][glyphs["slots"].index(char)] = None
+        return True
+
+    # 把点阵写入CGRAM槽位
+    def write_cgram(self, slot, pattern):
+        """
+        把点阵写入CGRAM槽位，与CGRAM镜像相同时不发送任何数据
+        Write a pattern into a CGRAM slot. Nothing is sent when the CGRAM shadow already holds it.
+        :return: 发送的数据字节数
+        Returns the number of data bytes sent.
+        """
+        if not self.is_write_ready:
+            raise ValueError("Write is not ready. Please initialize the write first.")
+        shadow = self.glyphs["shadow"]
+        if shadow[slot] == pattern:
+            return 0
+        # AC自动减1时从最后一行倒序写入
+        if self.settings["ac_auto_increase"]:
+            self.send_byte_command(self.command["LCD_SETCGRAMADDR"] | (slot << 3))
+            rows = pattern
+        else:
+            self.send_byte_command(self.command["LCD_SETCGRAMADDR"] | (slot << 3) | 7)
+            rows = pattern[::-1]
+        self.transport.set_rs(1)
+        self.transport.write_run(rows)
+        shadow[slot] = pattern
+        # AC此时指向CGRAM，下一次写入DDRAM前须重新设置地址
+        self.framebuffer["address"] = None
+        return len(pattern)
+
+    # 为自定义字符分配CGRAM槽位
+    def glyph_slot(self, char, reserved):
+        """
+        为自定义字符分配CGRAM槽位：已分配的直接使用，否则使用空闲槽位（优先CGRAM中已是该点阵的），
+        没有空闲槽位时淘汰最近最少使用且不在屏幕上的槽位
+        Give a custom glyph a CGRAM slot. An assigned slot is reused. Otherwise a free slot is taken,
+        preferring one whose CGRAM already holds the pattern. Without a free slot, the least recently used
+        slot that is not on screen is evicted.
+        :param reserved: 本次转换中已使用的槽位，不会被淘汰
+        The slots used earlier in the same conversion, which are never evicted.
+        :return: 槽位号，即显示字符码
+        Returns the slot number, which is the display code.
+        """
+        glyphs = self.glyphs
+        slots = glyphs["slots"]
+        pattern = glyphs["patterns"][char]
+        if char in slots:
+            slot = slots.index(char)
+        else:
+            free = [i for i in range(8) if slots[i] is None]
+            if not free:
+                # 显示缓冲区中出现的字符码 0-7 是屏幕上正在使用的槽位
+                on_screen = reserved + [code for row in self.framebuffer["frame"] for code in row if code < 8]
+                free = [i for i in range(8) if i not in on_screen]
+                if not free:
+                    raise ValueError("Too many custom glyphs on screen. At most 8 can be shown at once.")
+            slot = free[0]
+            for i in free:
+                if glyphs["shadow"][i] == pattern:
+                    slot = i
+                    break
+                if glyphs["used"][i] < glyphs["used"][slot]:
+                    slot = i
+            slots[slot] = char
+        self.write_cgram(slot, pattern)
+        glyphs["tick"] += 1
+        glyphs["used"][slot] = glyphs["tick"]
+        reserved.append(slot)
+        return slot
+
+    # 把可能含有自定义字符的字符串转换为显示字符码
+    def glyph_text_to_codes(self, text):
+        """
+        把字符串转换为显示字符码，其中的自定义字符分配CGRAM槽位，其余部分由 text_to_codes() 转换
+        Convert a string to display codes. Custom glyphs get CGRAM slots and the rest is converted by text_to_codes().
+        """
+        patterns = self.glyphs["patterns"]
+        if not patterns or not isinstance(text, str):
+            return self.text_to_codes(text)
+        codes = None
+        start = 0
+        reserved = []
+        for i, char in enumerate(text):
+            if char in patterns:
+                if codes is None:
+                    codes = bytearray()
+                codes.extend(self.text_to_codes(text[start:i]))
+                codes.append(self.glyph_slot(char, reserved))
+                start = i + 1
+        if codes is None:
+            return self.text_to_codes(text)
+        codes.extend(self.text_to_codes(text[start:]))
+        return codes
+
+    # ########################################
+    # 以下是关于显示缓冲区（DDRAM影子）的方法
+    #
+
+    # 将一行文本写入显示缓冲区，不发送任何数据
+    def frame_print_line(self, text, line=0):
+        """
+        将一行文本写入显示缓冲区，超出40字符的部分被丢弃，其余单元填充空格
+        Write a line of text into the frame buffer without touching the bus.
+        :param text: 要写入的字符串，或已编码的显示字符码（bytes/bytearray/memoryview）
+        The string to write, or already encoded display codes (bytes/bytearray/memoryview).
+        :param line: 行号 0 或 1
+        The line number, 0 or 1.
+        """
+        if line not in [0, 1]:
+            raise ValueError("Invalid line number. Line must be 0 or 1.")
+        self.framebuffer["frame"][line][:] = b" " * 40
+        # 字符串按字符 ROM 编码表转换，已编码的显示字符码（bytes/bytearray/memoryview）直接复制
+        self.frame_write_bytes(self.glyph_text_to_codes(text), line, 0)
+        return True
+
+    # 将显示字符码写入显示缓冲区，不发送任何数据
+    def frame_write_bytes(self, buf, row=0, col=0):
+        """
+        将显示字符码从指定位置写入显示缓冲区的一行，超出该行40个单元的部分被丢弃，光标移动到写入内容之后
+        Write display codes into a line of the frame buffer from the given column. Codes past the 40 cells of
+        the line are dropped, and the cursor moves past the written codes.
+        :param buf: 显示字符码（bytes/bytearray/memoryview）
+        The display codes (bytes/bytearray/memoryview).
+        :return: 写入的单元数
+        Returns the number of cells written.
+        """
+        if row not in [0, 1]:
+            raise ValueError("Invalid line number. Line must be 0 or 1.")
+        if not 0 <= col < 40:
+            raise ValueError("Invalid column. Column must be between 0 and 39.")
+        count = len(buf)
+        end = col + count
+        if end > 40:
+            end = 40
+            count = 40 - col
+            buf = memoryview(buf)[:count]
+        self.framebuffer["frame"][row][col:end] = buf
+        # 光标停在写入内容之后，写到行尾时跳到另一行行首
+        if end < 40:
+            self.settings["cursor_position"] = row * 0x40 + end
+        else:
+            self.settings["cursor_position"] = 0x40 if row == 0 else 0x00
+        return count
+
+    # 把显示缓冲区中与DDRAM影子不同的单元写入屏幕
+    def flush(self):
+        """
+        比较显示缓冲区与DDRAM影子，按写入计划只写入发生变化的单元。
+        开启写入计划时，相隔很近的两段变化单元连同中间未变化的单元一起重写，比发送地址命令更省时；
+        大部分单元需要改写且目标多为空格时先清屏；光标隐藏时不再把地址计数器移回光标位置
+        Compare the frame buffer with the DDRAM shadow and write the changed cells as planned.
+        With the write planner on, two close runs of changed cells are written together with the unchanged
+        cells between them when that is cheaper than an address command, the screen is cleared first when
+        most cells change to spaces, and the address counter is not moved back to the cursor while the cursor is hidden.
+        :return: 本次写入的数据字节数
+        Returns the number of data bytes written.
+        """
+        # 检查数据是否完成初始化
+        if not self.is_write_ready:
+            raise ValueError("Write is not ready. Please initialize the write first.")
+        fb = self.framebuffer
+        # 刷新会写入全部推迟的内容
+        fb["pending"] = False
+        runs, cost = self.write_plan(fb["shadow"] if fb["shadow_valid"] else None, fb["address"])
+        changed = bool(runs)
+        if self.settings["write_planner"] and self.settings["ac_auto_increase"] and fb["shift"] == 0:
+            # 清屏的代价为清屏命令及其等待时间，之后只需写入非空格单元
+            clear_cost = self.transport_write_cost()[1] + self.timing["clear_us"]
+            if clear_cost < cost:
+                blank = bytearray(b" " * 40)
+                clear_runs, clear_cost_total = self.write_plan((blank, blank), 0x00)
+                if clear_cost + clear_cost_total < cost:
+                    self.send_byte_command(self.command["LCD_CLEARDISPLAY"])
+                    self.wait_ready(self.timing["clear_us"])  # 等待清屏完成
+                    for row in range(2):
+                        fb["shadow"][row][:] = blank
+                    fb["shadow_valid"] = True
+                    fb["address"] = 0x00
+                    runs = clear_runs
+        written = 0
+        self.transport.set_rs(1)
+        for row, start, end in runs:
+            frame = fb["frame"][row]
+            address = row * 0x40 + start
+            # 连续的单元依靠AC自动计数，只在地址不连续时发送地址命令
+            if fb["address"] != address:
+                self.send_byte_command(self.command["LCD_SETDDRAMADDR"] | address)
+                self.transport.set_rs(1)
+            run = memoryview(frame)[start:end]
+            self.transport.write_run(run)
+            fb["shadow"][row][start:end] = run
+            fb["address"] = self.ddram_address_step(row * 0x40 + end - 1, self.settings["ac_auto_increase"])
+            written += end - start
+        fb["shadow_valid"] = True
+        # 内容发生变化时记录活动，屏幕调暗或关闭时立即唤醒
+        if changed and self.power["enabled"]:
+            self.power_activity()
+        # 光标可见时让硬件光标回到光标指示器的位置，隐藏时延迟到下一次需要时再定位
+        if not self.cursor_is_lazy():
+            self.cursor_sync()
+        return written
+
+    # 计算刷新的写入计划
+    def write_plan(self, base, address):
+        """
+        计算把屏幕从 base 刷新为显示缓冲区内容的写入计划和代价估算
+        Plan the writes that bring the screen from base to the frame buffer, and estimate their cost.
+        :param base: 屏幕当前两行的内容，None 表示未知，须重写全部单元
+        The current content of the two lines, or None when unknown and every cell must be written.
+        :param address: 当前AC的地址，None 表示未知
+        The current address counter, or None when unknown.
+        :return: ([(行, 起始列, 结束列), ...], 代价估算（微秒）)
+        Returns ([(row, start, end), ...], the estimated cost in microseconds).
+        """
+        fb = self.framebuffer
+        increase = self.settings["ac_auto_increase"]
+        data_cost, command_cost = self.transport_write_cost()
+        # 重写间隔比发送地址命令便宜时合并两段
+        bridge = self.settings["write_planner"] and increase
+        runs = []
+        cost = 0
+        for row in range(2):
+            frame = fb["frame"][row]
+            shadow = base[row] if base is not None else None
+            column = 0
+            while column < 40:
+                if shadow is not None and frame[column] == shadow[column]:
+                    column += 1
+                    continue
+                # 找出一段连续变化的单元，AC自动减1时每段只有1个单元
+                start = column
+                column += 1
+                while increase and column < 40:
+                    if shadow is None or frame[column] != shadow[column]:
+                        column += 1
+                        continue
+                    if not bridge:
+                        break
+                    gap = column
+                    while gap < 40 and frame[gap] == shadow[gap]:
+                        gap += 1
+                    if gap == 40 or (gap - column) * data_cost >= command_cost:
+                        break
+                    column = gap
+                runs.append((row, start, column))
+                if address != row * 0x40 + start:
+                    cost += command_cost
+                cost += (column - start) * data_cost
+                address = self.ddram_address_step(row * 0x40 + column - 1, increase)
+        return runs, cost
+
+    # 获取传输对象的写入代价估算
+    def transport_write_cost(self):
+        """
+        获取传输对象每个数据字节和每条地址命令（含恢复连续写入）的代价估算（微秒），
+        传输对象没有提供 write_cost() 时按命令为数据字节的2倍估算
+        Get the transport's estimated cost in microseconds of a data byte and of an address command,
+        including resuming the run. Transports without write_cost() count a command as 2 data bytes.
+        :return: (数据字节代价, 地址命令代价)
+        Returns (the data byte cost, the address command cost).
+        """
+        write_cost = getattr(self.transport, "write_cost", None)
+        if write_cost is None:
+            return 1, 2
+        return write_cost()
+
+    # 设置是否使用写入计划
+    def set_write_planner(self, mode=True):
+        """
+        设置刷新时是否使用写入计划：按传输代价合并相近的变化单元、必要时清屏，光标隐藏时延迟发送光标定位
+        Set whether flushes use the write planner: merge close runs of changed cells by transport cost,
+        clear the screen when that is cheaper, and defer cursor positioning while the cursor is hidden.
+        """
+        if mode not in [True, False]:
+            return False
+        self.settings["write_planner"] = mode
+        if not mode and self.is_write_ready:
+            self.cursor_sync()
+        return True
+
+    # 光标定位是否可以延迟
+    def cursor_is_lazy(self):
+        """
+        开启写入计划且光标和闪烁都关闭时，光标位置不可见，硬件地址计数器可以延迟到下一次需要时再定位
+        With the write planner on and both the cursor and blinking off, the cursor position is invisible, so
+        positioning the address counter can wait until something needs it.
+        """
+        settings = self.settings
+        return settings["write_planner"] and not (settings["cursor_visible"] or settings["cursor_blink"])
+
+    # 让硬件地址计数器回到光标指示器的位置
+    def cursor_sync(self):
+        """
+        硬件地址计数器与光标指示器不一致时发送地址命令，使两者一致
+        Send an address command when the hardware address counter differs from the cursor position indicator.
+        """
+        fb = self.framebuffer
+        if fb["address"] != self.settings["cursor_position"]:
+            self.send_byte_command(self.command["LCD_SETDDRAMADDR"] | self.settings["cursor_position"])
+            fb["address"] = self.settings["cursor_position"]
+        return True
+
+    # 设置写入缓冲区后是否立即刷新
+    def set_auto_flush(self, mode=True):
+        """
+        设置写入显示缓冲区后是否立即刷新到屏幕，关闭后需手动调用 flush()
+        Set whether writes to the frame buffer are flushed immediately. When off, call flush() manually.
+        """
+        if mode not in [True, False]:
+            return False
+        else:
+            self.framebuffer["auto_flush"] = mode
+            return True
+
+    # 设置自动刷新的最大帧率
+    def set_frame_rate(self, fps=10):
+        """
+        设置自动刷新的最大帧率。限速时写入显示缓冲区只记录最新的内容，距上次刷新不足一帧的更新被推迟，
+        由下一次写入、frame_rate_update() 或 frame_rate_async() 统一刷新，只写入变化的单元，中间值被丢弃
+        Set the maximum frame rate of the automatic flush. While limited, writes to the frame buffer only record
+        the latest content. Updates within one frame of the last refresh are deferred and drawn together by the
+        next write, frame_rate_update() or frame_rate_async(), writing only the changed cells and dropping
+        the intermediate values.
+        :param fps: 每秒最多刷新次数，0 为不限速，每次写入都立即刷新
+        The maximum refreshes per second. 0 removes the limit and every write is flushed at once.
+        """
+        if fps < 0:
+            raise ValueError("Frame rate must not be negative.")
+        fb = self.framebuffer
+        fb["frame_rate"] = fps
+        if fps:
+            # 开启后的第一次更新立即刷新
+            fb["refresh_ms"] = time.ticks_add(time.ticks_ms(), -(1000 // fps))
+        elif fb["pending"]:
+            self.frame_refresh()
+        return True
+
+    # 写入显示缓冲区后按设置自动刷新
+    def frame_update(self):
+        """
+        写入显示缓冲区后调用：关闭自动刷新时不刷新；不限速时立即刷新；限速时距上次刷新已满一帧才刷新，否则推迟
+        Called after a write to the frame buffer. Nothing is flushed with auto flush off. Without a frame rate
+        limit the flush is immediate. With a limit it flushes only when a frame has passed since the last refresh,
+        otherwise it is deferred.
+        """
+        fb = self.framebuffer
+        if not fb["auto_flush"]:
+            return False
+        fb["updates"] += 1
+        if fb["frame_rate"] and time.ticks_diff(time.ticks_ms(), fb["refresh_ms"]) < 1000 // fb["frame_rate"]:
+            fb["pending"] = True
+            return False
+        self.frame_refresh()
+        return True
+
+    # 刷新推迟的内容
+    def frame_rate_update(self, force=False):
+        """
+        限速时有推迟的内容且距上次刷新已满一帧时刷新，须在主循环中定期调用，或使用 frame_rate_async()
+        When limited, flush the deferred content once a frame has passed since the last refresh. Call it regularly
+        from the main loop, or use frame_rate_async().
+        :param force: 是否忽略帧间隔立即刷新
+        Whether to ignore the frame interval and flush now.
+        :return: 如果刷新了屏幕，返回 True
+        Returns True if the screen was flushed.
+        """
+        fb = self.framebuffer
+        if not fb["pending"]:
+            return False
+        if not force and fb["frame_rate"] and time.ticks_diff(time.ticks_ms(), fb["refresh_ms"]) < 1000 // fb["frame_rate"]:
+            return False
+        self.frame_refresh()
+        return True
+
+    # 限速刷新的异步任务
+    async def frame_rate_async(self):
+        """
+        限速刷新任务，每帧检查一次并刷新推迟的内容，直到被取消
+        The frame rate refresh task. It checks once per frame and flushes the deferred content, until it is cancelled.
+        """
+        while True:
+            self.frame_rate_update()
+            await asyncio.sleep(1 / (self.framebuffer["frame_rate"] or 10))
+
+    # 执行一次自动刷新
+    def frame_refresh(self):
+        """
+        执行一次自动刷新并记录刷新时间和次数
+        Run one automatic flush and record its time and count.
+        :return: 本次写入的数据字节数
+        Returns the number of data bytes written.
+        """
+        fb = self.framebuffer
+        fb["refresh_ms"] = time.ticks_ms()
+        fb["refreshes"] += 1
+        return self.flush()
+
+    # 标记DDRAM影子失效
+    def frame_invalidate(self):
+        """
+        标记DDRAM影子与屏幕不一致，下一次刷新将重写全部单元
+        Mark the DDRAM shadow as stale so the next flush rewrites every cell.
+        """
+        self.framebuffer["shadow_valid"] = False
+        self.framebuffer["address"] = None
+        return True
+
+    # 计算AC自动计数后的下一个DDRAM地址
+    def ddram_address_step(self, address, increase=True):
+        """
+        计算写入一个单元后AC自动加1或减1得到的DDRAM地址（两行模式）
+        Get the DDRAM address after the AC auto increments or decrements (2-line mode).
+        :param address: 当前DDRAM地址
+        The current DDRAM address.
+        :param increase: True 为加1，False 为减1
+        True to increment, False to decrement.
+        :return: 下一个DDRAM地址
+        Returns the next DDRAM address.
+        """
+        if increase:
+            if address == 0x27:
+                return 0x40
+            elif address == 0x67:
+                return 0x00
+            return address + 1
+        else:
+            if address == 0x00:
+                return 0x67
+            elif address == 0x40:
+                return 0x27
+            return address - 1
+
+    # ########################################
+    # 以下是关于读取忙标志和地址计数器的方法
+    #
+
+    # 设置是否通过忙标志轮询代替固定延时
+    def set_busy_flag_polling(self, mode=True):
+        """
+        设置是否通过RW读取忙标志，使每条命令只等待LCD实际需要的时间
+        Set whether to poll the busy flag through RW instead of using fixed delays.
+        :raises ValueError: 如果RW引脚未绑定到GPIO，则抛出异常
+        Raises ValueError if the RW pin is not bound to a GPIO.
+        """
+        if mode not in [True, False]:
+            return False
+        if mode and not self.is_read_ready:
+            raise ValueError("Read is not ready. Please connect the RW pin to a GPIO and initialize the pins first.")
+        self.settings["busy_flag_polling"] = mode
+        self.transport.set_busy_polling(mode, self.settings["busy_timeout_us"])
+        return True
+
+    # 读取忙标志和地址计数器
+    def read_busy_address(self):
+        """
+        读取忙标志和地址计数器
+        Read the busy flag and the address counter.
+        :return: (忙标志, 地址计数器)
+        Returns (busy flag, address counter).
+        """
+        if not self.is_read_ready:
+            raise ValueError("Read is not ready. Please connect the RW pin to a GPIO and initialize the pins first.")
+        value = self.transport.read(0)
+        return bool(value & 0x80), value & 0x7F
+
+    # 轮询忙标志直到LCD空闲
+    def wait_busy(self, timeout_us=None):
+        """
+        轮询忙标志直到LCD空闲
+        Poll the busy flag until the LCD is idle.
+        :param timeout_us: 超时时间（微秒），默认使用设置中的 busy_timeout_us
+        The timeout in microseconds, defaults to the busy_timeout_us setting.
+        :return: 空闲时的地址计数器
+        Returns the address counter once idle.
+        :raises ValueError: 如果超时仍为忙，则抛出异常
+        Raises ValueError if the LCD is still busy after the timeout.
+        """
+        if not self.is_read_ready:
+            raise ValueError("Read is not ready. Please connect the RW pin to a GPIO and initialize the pins first.")
+        if timeout_us is None:
+            timeout_us = self.settings["busy_timeout_us"]
+        return self.transport.poll_busy(timeout_us)
+
+    # 等待命令执行完成
+    def wait_ready(self, delay_us):
+        """
+        等待命令执行完成，轮询忙标志时已在发送后等待，否则按固定延时等待
+        Wait for a command to finish. When polling, send_byte has already waited, otherwise sleep for the fixed delay.
+        :param delay_us: 固定延时（微秒）
+        The fixed delay in microseconds.
+        """
+        if not self.transport.busy_polling:
+            self.sleep_us(delay_us)
+        return True
+
+    # 读取硬件地址计数器
+    def read_address_counter(self):
+        """
+        读取硬件地址计数器AC
+        Read the hardware address counter.
+        :return: 地址计数器的值
+        Returns the value of the address counter.
+        """
+        return self.read_busy_address()[1]
+
+    # 检查光标指示器是否与硬件地址计数器一致
+    def check_cursor_position(self):
+        """
+        检查光标指示器与硬件地址计数器是否一致，并用读取结果更新AC镜像
+        Check whether the cursor position matches the hardware address counter and update the AC mirror.
+        :return: 一致返回 True，否则返回 False
+        Returns True if they match, otherwise False.
+        """
+        # 延迟定位时地址计数器可能还没有回到光标位置，先按AC镜像定位
+        if self.cursor_is_lazy():
+            self.cursor_sync()
+        address = self.wait_busy()
+        self.framebuffer["address"] = address
+        return address == self.settings["cursor_position"]
+
+    # ########################################
+    # 以下是关于时序配置的方法
+    #
+
+    # 设置时序配置
+    def set_timing_profile(self, profile="default"):
+        """
+        设置时序配置，替换使能脉冲宽度、每次脉冲后的等待、模式命令和清屏后的等待，以及启动流程的延时。
+        上电延时和唤醒等待在下一次 init() 时生效
+        Set the timing profile, replacing the enable pulse width, the delay after each pulse, the waits after
+        mode commands and clear, and the start-up delays. The power-on and wake-up delays apply from the next init().
+        :param profile: 配置名称 "default"、"strict"、"fast"、"3v3"，或包含各时序项的字典（如 calibrate_timing() 的结果）
+        A profile name, "default", "strict", "fast" or "3v3", or a dict of the timing items (such as the result of calibrate_timing()).
+        :return: 如果设置成功，返回 True
+        Returns True if the setting is successful.
+        """
+        self.timing = self.timing_profile(profile)
+        # 使能脉冲宽度和脉冲后的等待由传输对象执行，PCF8574 等没有固定延时的传输对象不需要
+        if self.transport is not None and hasattr(self.transport, "set_pulse_delay"):
+            self.transport.set_pulse_delay(self.timing["pulse_us"], self.timing["enable_us"])
+        return True
+
+    # 取得时序配置
+    def timing_profile(self, profile="default"):
+        """
+        按名称或字典取得一份检查过的时序配置副本
+        Get a checked copy of a timing profile by name or from a dict.
+        :param profile: 配置名称或字典
+        A profile name or dict.
+        :return: 时序配置字典，"name" 为配置名称
+        Returns the timing profile dict with the profile name in "name".
+        """
+        if isinstance(profile, str):
+            if profile not in self.timing_profiles:
+                raise ValueError(f"Invalid timing profile: {profile}. Use one of {', '.join(self.timing_profiles)}.")
+            name = profile
+            profile = self.timing_profiles[profile]
+        else:
+            name = profile.get("name", "custom")
+        timing = {"name": name}
+        for key in self.timing_profiles["default"]:
+            value = profile.get(key)
+            if not isinstance(value, int) or value < 0:
+                raise ValueError(f"Invalid timing value: {key}={value}. Must be a non-negative integer.")
+            timing[key] = value
+        return timing
+
+    # 在屏幕上自动校准时序
+    def calibrate_timing(self, base="strict", steps=(100, 75, 50, 35, 25, 15, 0), rounds=2, margin=25, path=None):
+        """
+        在目标屏幕上校准时序：从基准配置开始，依次缩短每次脉冲后的等待、模式命令后的等待和清屏后的等待，
+        每一档用 timing_check() 写入测试图案并读回DDRAM检查，每项取最短的可靠值再加上余量。
+        上电延时和唤醒等待无法在运行中测试，保持基准值。需要 RW 连接到GPIO，校准后重新初始化LCD并恢复屏幕内容
+        Calibrate the timing on the target panel. Starting from the base profile, the delay after each pulse,
+        the wait after mode commands and the wait after clear are shortened step by step. Each step writes a test
+        pattern and reads DDRAM back with timing_check(), and each item keeps its shortest reliable value plus the margin.
+        The power-on and wake-up delays cannot be tested on a running panel and keep the base values.
+        Needs RW connected to a GPIO. The LCD is initialized again and the screen content restored afterwards.
+        :param base: 基准时序配置名称或字典
+        The base timing profile name or dict.
+        :param steps: 依次尝试的基准值百分比
+        The percentages of the base values to try, in order.
+        :param rounds: 每一档测试的轮数
+        The number of test rounds per step.
+        :param margin: 在最短可靠值上增加的余量百分比，结果不超过基准值
+        The margin in percent added to the shortest reliable value. The result never exceeds the base value.
+        :param path: 保存结果的文件路径，为 None 时不保存
+        The file to save the result to, None to not save it.
+        :return: 校准后正在使用的时序配置
+        Returns the calibrated timing profile now in use.
+        :raises ValueError: 如果不能读取，或基准配置本身不可靠，则抛出异常
+        Raises ValueError if reading is not possible or the base profile itself is not reliable.
+        """
+        if not self.is_read_ready:
+            raise ValueError("Read is not ready. Please connect the RW pin to a GPIO and initialize the pins first.")
+        if not self.is_write_ready:
+            raise ValueError("Write is not ready. Please initialize the write first.")
+        base = self.timing_profile(base)
+        previous = self.timing
+        fb = self.framebuffer
+        frame = [bytes(row) for row in fb["frame"]]
+        shift = fb["shift"]
+        cursor = self.settings["cursor_position"]
+        # 只有固定延时才能被测试，校准期间不轮询忙标志，重新初始化时按设置恢复
+        self.transport.set_busy_polling(False)
+        best = None
+        try:
+            self.set_timing_profile(base)
+            if self.timing_check(rounds):
+                best = base
+                for key in ("pulse_us", "command_us", "clear_us"):
+                    for percent in steps:
+                        trial = dict(best)
+                        trial[key] = (base[key] * percent + 99) // 100
+                        if trial[key] >= best[key]:
+                            continue
+                        self.set_timing_profile(trial)
+                        if not self.timing_check(rounds):
+                            break
+                        best = trial
+        finally:
+            if best is None:
+                self.set_timing_profile(previous)
+            else:
+                result = dict(best)
+                result["name"] = "calibrated"
+                for key in ("pulse_us", "command_us", "clear_us"):
+                    result[key] = min(base[key], (best[key] * (100 + margin) + 99) // 100)
+                self.set_timing_profile(result)
+            # 失败的测试可能丢失命令或使4位模式的半字节错位，重新初始化后恢复屏幕内容和自定义字符
+            self.init_lcd_write()
+            glyphs = self.glyphs
+            for slot in range(8):
+                glyphs["shadow"][slot] = None
+                char = glyphs["slots"][slot]
+                if char in glyphs["patterns"]:
+                    self.write_cgram(slot, glyphs["patterns"][char])
+            for row in range(2):
+                fb["frame"][row][:] = frame[row]
+            self.settings["cursor_position"] = cursor
+            self.flush()
+            self.set_display_shift(shift)
+        if best is None:
+            raise ValueError("Timing calibration failed. The base timing profile is not reliable on this panel.")
+        if path is not None:
+            self.save_timing_profile(path)
+        return dict(self.timing)
+
+    # 用当前时序写入并读回测试图案
+    def timing_check(self, rounds=2):
+        """
+        用当前时序发送清屏、输入模式和地址命令并写入两行DDRAM测试图案，每次等待结束时读取忙标志，
+        之后轮询忙标志读回DDRAM比较。测试会覆盖屏幕内容，由 calibrate_timing() 调用
+        Send clear, entry mode and address commands and write a test pattern into both DDRAM rows with the
+        current timing, reading the busy flag at the end of every wait, then read DDRAM back with busy polling
+        and compare. The test overwrites the screen. Called by calibrate_timing().
+        :param rounds: 测试轮数，每轮使用不同的图案
+        The number of rounds, each with a different pattern.
+        :return: 每次等待结束时都已空闲且读回的内容全部一致返回 True
+        Returns True if the LCD was idle at the end of every wait and everything read back matches.
+        """
+        transport = self.transport
+        timing = self.timing
+        command = self.command
+        timeout_us = self.settings["busy_timeout_us"]
+        for r in range(rounds):
+            pattern = bytes(0x20 + (i * 7 + r * 13) % 0x5F for i in range(80))
+            transport.set_rs(0)
+            transport.write(command["LCD_CLEARDISPLAY"])
+            self.sleep_us(timing["clear_us"])
+            if transport.read(0) & 0x80:
+                return False
+            transport.write(command["LCD_ENTRYMODESET_3"])  # 光标自动右移，屏幕不移
+            self.sleep_us(timing["command_us"])
+            if transport.read(0) & 0x80:
+                return False
+            # 地址命令和数据只有脉冲后的等待
+            for row in range(2):
+                transport.set_rs(0)
+                transport.write(command["LCD_SETDDRAMADDR"] | (row * 0x40))
+                if transport.read(0) & 0x80:
+                    return False
+                transport.set_rs(1)
+                for i in range(row * 40, row * 40 + 40):
+                    transport.write(pattern[i])
+                    if transport.read(0) & 0x80:
+                        return False
+            # 读回时轮询忙标志，结果只取决于写入是否成功
+            for row in range(2):
+                transport.poll_busy(timeout_us)
+                transport.set_rs(0)
+                transport.write(command["LCD_SETDDRAMADDR"] | (row * 0x40))
+                for i in range(row * 40, row * 40 + 40):
+                    transport.poll_busy(timeout_us)
+                    if transport.read(1) != pattern[i]:
+                        return False
+        return True
+
+    # 保存时序配置
+    def save_timing_profile(self, path="lcd_timing.json"):
+        """
+        把当前时序配置保存为 JSON 文件，启动时用 load_timing_profile() 读取
+        Save the current timing profile as a JSON file, to be read at boot with load_timing_profile().
+        :param path: 文件路径
+        The file path.
+        """
+        import json
+        with open(path, "w") as file:
+            json.dump(self.timing, file)
+        return True
+
+    # 读取并使用保存的时序配置
+    def load_timing_profile(self, path="lcd_timing.json"):
+        """
+        读取 save_timing_profile() 保存的时序配置并使用
+        Read a timing profile saved by save_timing_profile() and use it.
+        :param path: 文件路径
+        The file path.
+        :return: 读取的时序配置
+        Returns the timing profile read.
+        """
+        import json
+        with open(path) as file:
+            profile = json.load(file)
+        self.set_timing_profile(profile)
+        return dict(self.timing)
+
+    # ########################################
+    # 以下是关于总线统计的方法
+    #
+
+    # 开启或关闭总线统计
+    def set_stats(self, mode=True):
+        """
+        开启或关闭总线统计。开启时为公共方法、传输对象的引脚和延时函数安装计数包装，关闭时全部恢复，不留下额外开销
+        Enable or disable the bus statistics. Enabling installs counting wrappers on the public methods,
+        the transport pins and the delay functions. Disabling restores them all, leaving no overhead.
+        :param mode: True 开启，False 关闭
+        True to enable, False to disable.
+        :return: 如果设置成功，返回 True
+        Returns True if the setting is successful.
+        """
+        counters = self.counters
+        mode = bool(mode)
+        if mode == counters["enabled"]:
+            return True
+        if mode:
+            counters["enabled"] = True
+            self.reset_stats()
+            # 用实例属性覆盖公共方法，只统计最外层调用的方法
+            for name in dir(type(self)):
+                if name.startswith("__") or name.startswith("stats") or name in ["set_stats", "reset_stats", "instrument_transport", "restore_transport"]:
+                    continue
+                # 异步方法和生成器在返回后才运行，其中的传输计入它们调用的公共方法
+                if name.endswith("_async") or name.endswith("_frames") or name.endswith("_steps"):
+                    continue
+                method = getattr(self, name)
+                if callable(method):
+                    setattr(self, name, self.stats_wrap_method(name, method))
+                    counters["wrapped"].append(name)
+            self.sleep = self.stats_wrap_sleep(time.sleep, 1000000)
+            self.sleep_ms = self.stats_wrap_sleep(time.sleep_ms, 1000)
+            self.sleep_us = self.stats_wrap_sleep(time.sleep_us, 1)
+            self.instrument_transport()
+        else:
+            self.restore_transport()
+            for name in counters["wrapped"]:
+                delattr(self, name)
+            counters["wrapped"] = []
+            self.sleep = time.sleep
+            self.sleep_ms = time.sleep_ms
+            self.sleep_us = time.sleep_us
+            counters["enabled"] = False
+        return True
+
+    # 获取总线统计
+    def stats(self):
+        """
+        获取总线统计，包括总计和按公共方法分类的计数
+        Get the bus statistics, in total and per public method.
+        计数项 Counters: calls 调用次数, commands 命令字节, data 数据字节, nibbles 4位模式半字节, e_pulses 使能脉冲,
+        pin_writes Pin.value() 写入, port_writes 端口寄存器写入, bus_writes I2C/SPI 传输, sleep_us 延时微秒数,
+        skipped_writes 传输对象因输出电平未变化而跳过的引脚/端口/扩展器写入
+        frames 为自动刷新的合并统计 Frame coalescing: updates 写入后请求刷新的次数, refreshes 实际刷新次数,
+        dropped 被合并丢弃的中间内容数, coalescing_ratio 合并比 updates/refreshes
+        :return: {"enabled": 是否开启, "total": 总计, "methods": {方法名: 计数}, "frames": 合并统计}
+        Returns {"enabled": enabled, "total": totals, "methods": {method name: counters}, "frames": coalescing}.
+        """
+        total = self.stats_new_counters()
+        methods = {}
+        for name, counts in self.counters["methods"].items():
+            if not any(counts.values()):
+                continue
+            methods[name] = dict(counts)
+            for key in total:
+                total[key] += counts[key]
+        fb = self.framebuffer
+        frames = {
+            "updates": fb["updates"],
+            "refreshes": fb["refreshes"],
+            "dropped": fb["updates"] - fb["refreshes"],
+            "coalescing_ratio": fb["updates"] / fb["refreshes"] if fb["refreshes"] else 0,
+        }
+        return {"enabled": self.counters["enabled"], "total": total, "methods": methods, "frames": frames}
+
+    # 清零总线统计
+    def reset_stats(self):
+        """
+        清零总线统计
+        Reset the bus statistics.
+        """
+        counters = self.counters
+        # other 记录不在任何公共方法内的传输，例如直接调用传输对象
+        counters["methods"] = {"other": self.stats_new_counters()}
+        counters["current"] = counters["methods"]["other"]
+        counters["depth"] = 0
+        self.framebuffer["updates"] = 0
+        self.framebuffer["refreshes"] = 0
+        return True
+
+    # 生成一组清零的计数
+    def stats_new_counters(self):
+        return {"calls": 0, "commands": 0, "data": 0, "nibbles": 0, "e_pulses": 0, "pin_writes": 0, "port_writes": 0, "bus_writes": 0, "sleep_us": 0, "skipped_writes": 0}
+
+    # 生成公共方法的计数包装
+    def stats_wrap_method(self, name, method):
+        """
+        生成公共方法的计数包装，最外层调用期间的传输都计入该方法
+        Build the counting wrapper of a public method. Everything sent during the outermost call is counted for it.
+        """
+        counters = self.counters
+        def wrapper(*args, **kwargs):
+            if counters["depth"]:
+                return method(*args, **kwargs)
+            if name not in counters["methods"]:
+                counters["methods"][name] = self.stats_new_counters()
+            current = counters["methods"][name]
+            current["calls"] += 1
+            counters["current"] = current
+            counters["depth"] = 1
+            # 传输对象自行累计跳过的写入，按调用前后的差值计入该方法
+            skipped = getattr(self.transport, "skipped_writes", 0)
+            try:
+                return method(*args, **kwargs)
+            finally:
+                current["skipped_writes"] += max(0, getattr(self.transport, "skipped_writes", 0) - skipped)
+                counters["depth"] = 0
+                counters["current"] = counters["methods"]["other"]
+        return wrapper
+
+    # 生成引脚 value 方法的计数包装
+    def stats_wrap_pin(self, function):
+        counters = self.counters
+        def wrapper(*args):
+            if args:
+                counters["current"]["pin_writes"] += 1
+            return function(*args)
+        return wrapper
+
+    # 生成延时函数的计数包装
+    def stats_wrap_sleep(self, function, scale):
+        """
+        生成延时函数的计数包装，按 scale 把参数换算为微秒计数
+        Build the counting wrapper of a delay function, converting the argument to microseconds with scale.
+        """
+        counters = self.counters
+        def wrapper(value):
+            counters["current"]["sleep_us"] += int(value * scale)
+            function(value)
+        return wrapper
+
+    # 为传输对象安装计数包装
+    def instrument_transport(self):
+        """
+        统计开启时为传输对象的引脚、端口寄存器、I2C/SPI 和延时函数安装计数包装，并用计数传输对象代理它
+        While the statistics are enabled, install counting wrappers on the pins, port registers, I2C/SPI
+        and delay function of the transport, and put a counting proxy in front of it.
+        :return: 如果安装了计数包装，返回 True
+        Returns True if the wrappers are installed.
+        """
+        counters = self.counters
+        if not counters["enabled"] or self.transport is None:
+            return False
+        self.restore_transport()
+        transport = self.transport
+        saved = counters["saved"]
+        for name in ["rs", "rw", "e", "latch", "clock", "data"]:
+            value = getattr(transport, name, None)
+            if isinstance(value, tuple):
+                wrapped = tuple(self.stats_wrap_pin(function) for function in value)
+            elif callable(value):
+                wrapped = self.stats_wrap_pin(value)
+            else:
+                continue
+            saved.append((transport, name, value))
+            setattr(transport, name, wrapped)
+        for name in ["mem", "i2c", "spi"]:
+            value = getattr(transport, name, None)
+            if value is not None:
+                saved.append((transport, name, value))
+                setattr(transport, name, StatsBus(value, counters))
+        if hasattr(transport, "sleep_us"):
+            saved.append((transport, "sleep_us", transport.sleep_us))
+            transport.sleep_us = self.stats_wrap_sleep(transport.sleep_us, 1)
+        self.transport = StatsTransport(transport, counters)
+        return True
+
+    # 恢复传输对象
+    def restore_transport(self):
+        """
+        移除传输对象的计数包装和代理
+        Remove the counting wrappers and the proxy from the transport.
+        """
+        saved = self.counters["saved"]
+        while saved:
+            transport, name, value = saved.pop()
+            setattr(transport, name, value)
+        if isinstance(self.transport, StatsTransport):
+            self.transport = self.transport.transport
         return True
 
     # ########################################
@@ -1136,7 +2543,9 @@ class LCD1602:
         if not (0 <= column < 40):
             raise ValueError("Invalid column position. Column must be between 0 and 39.")
         self.settings["cursor_position"] = (row * 0x40) + column
-        self.send_byte_command(self.command["LCD_SETDDRAMADDR"] | self.settings["cursor_position"])
+        # 光标隐藏时只更新光标指示器，下一次需要时再发送地址命令
+        if not self.cursor_is_lazy():
+            self.cursor_sync()
         return True
 
     # 光标位置指示器左移
@@ -1179,9 +2588,12 @@ class LCD1602:
         光标往左移动1格
         Move the cursor to the left.
         """
+        # 光标移动命令是相对硬件地址计数器的
+        self.cursor_sync()
         if self.settings["cursor_position"] & 0x3F > 0:
             self.settings["cursor_position"] -= 1
             self.send_byte_command(self.command["LCD_CURSORSHIFT_1"])  # 光标左移
+            self.framebuffer["address"] = self.settings["cursor_position"]
         elif self.settings["cursor_position"] & 0x3F == 0:
             self.settings["cursor_position"] = self.settings["cursor_position"] + 0x27  # 光标左移循环跳到末列
             self.cursor_position((self.settings["cursor_position"] & 0x40) >> 6, 0x27)
@@ -1193,9 +2605,12 @@ class LCD1602:
         光标往右移动1格
         Move the cursor to the right.
         """
+        # 光标移动命令是相对硬件地址计数器的
+        self.cursor_sync()
         if self.settings["cursor_position"] & 0x3F < 0x27:
             self.settings["cursor_position"] += 1
             self.send_byte_command(self.command["LCD_CURSORSHIFT_2"])  # 光标右移
+            self.framebuffer["address"] = self.settings["cursor_position"]
         elif self.settings["cursor_position"] & 0x3F == 0x27:
             self.settings["cursor_position"] = self.settings["cursor_position"] - 0x27  # 光标左右循环跳到首列
             self.cursor_position((self.settings["cursor_position"] & 0x40) >> 6, 0x00)
@@ -1209,7 +2624,9 @@ class LCD1602:
         """
         if self.settings["cursor_position"] >= 0x40:
             self.settings["cursor_position"] -= 0x40
-            self.send_byte_command(self.command["LCD_SETDDRAMADDR"] | self.settings["cursor_position"])  # 光标上移
+            # 光标上移，光标隐藏时延迟到下一次需要时再发送地址命令
+            if not self.cursor_is_lazy():
+                self.cursor_sync()
         return True
 
     # 光标往下移动
@@ -1220,7 +2637,9 @@ class LCD1602:
         """
         if self.settings["cursor_position"] < 40:
             self.settings["cursor_position"] += 0x40
-            self.send_byte_command(self.command["LCD_SETDDRAMADDR"] | self.settings["cursor_position"])  # 光标下移
+            # 光标下移，光标隐藏时延迟到下一次需要时再发送地址命令
+            if not self.cursor_is_lazy():
+                self.cursor_sync()
         return True
 
     # ########################################
@@ -1230,11 +2649,37 @@ class LCD1602:
     # 设置Browser缓冲区大小
     def browser_set_content_max_length(self, content_max_length=1024):
         """
-        设置Browser缓冲区大小
-        Set the size of the browser buffer.
+        设置Browser缓冲区大小，一次分配环形缓冲区，保留最近的内容
+        Set the size of the browser buffer. Allocates the ring buffer once and keeps the most recent content.
+        环形缓冲区末尾多分配40字节，镜像开头的40字节，使任意一行（行宽≤40）都可以不经复制连续读取
+        The ring buffer has 40 extra bytes at the end mirroring its first 40 bytes,
+        so any line (width ≤ 40) can be read contiguously without copying.
         :param content_max_length: 缓冲区最大内容长度
         """
-        self.browser["content_max_length"] = content_max_length
+        if content_max_length < 1:
+            raise ValueError("Invalid content max length. It must be at least 1.")
+        browser = self.browser
+        old_buffer = browser["buffer"]
+        length = min(browser["content_length"], content_max_length)
+        buffer = bytearray(content_max_length + 40)
+        # 按顺序复制最近的内容到新缓冲区开头
+        if old_buffer is not None:
+            old_size = browser["content_max_length"]
+            index = (browser["head"] + browser["content_length"] - length) % old_size
+            for i in range(length):
+                buffer[i] = old_buffer[index]
+                index += 1
+                if index == old_size:
+                    index = 0
+            buffer[content_max_length:content_max_length + 40] = buffer[0:40]
+        browser["buffer"] = buffer
+        browser["head"] = 0
+        browser["offset"] += browser["content_length"] - length
+        browser["content_max_length"] = content_max_length
+        browser["content_length"] = length
+        self.browser_index_rebuild()
+        if browser["line_pointer"] >= browser["line_count"]:
+            browser["line_pointer"] = max(browser["line_count"] - 1, 0)
         return True
     # 设置Browser缓冲区大小的别名
     def browser_set_buffer_size(self, content_max_length=1024):
@@ -1259,7 +2704,15 @@ class LCD1602:
         Get all content from the browser.
         :return: 所有内容
         """
-        return self.browser["content"]
+        browser = self.browser
+        if browser["file"] is not None:
+            raise ValueError("The browser is showing a file. Read the file directly instead.")
+        if browser["buffer"] is None:
+            return ""
+        size = browser["content_max_length"]
+        buffer = browser["buffer"]
+        head = browser["head"]
+        return "".join(chr(buffer[(head + i) % size]) for i in range(browser["content_length"]))
 
     # 获取Browser内容长度
     def browser_get_content_length(self):
@@ -1268,6 +2721,8 @@ class LCD1602:
         Get the content length of the browser.
         :return: 内容长度
         """
+        if self.browser["file"] is not None:
+            return self.browser["file"]["size"]
         return self.browser["content_length"]
 
     # 设置Browser行宽
@@ -1280,12 +2735,27 @@ class LCD1602:
         if line_width < 1 or line_width > 40:
             return False
         self.browser["line_width"] = line_width
-        # 更新行数
-        self.browser["line_count"] = (self.browser["content_length"] + line_width - 1) // line_width
+        # 按新行宽重建行索引
+        self.browser_index_rebuild()
         # 初始化行指针
         self.browser["line_pointer"] = 0
         return True
 
+    # 设置Browser是否按单词换行
+    def browser_set_word_wrap(self, mode=True):
+        """
+        设置Browser超出行宽时是否在最后一个空格处换行，而不是从单词中间截断
+        Set whether the browser breaks over-long lines at the last space instead of in the middle of a word.
+        :param mode: True 按单词换行，False 按行宽截断
+        True to wrap at words, False to cut at the line width.
+        """
+        if mode not in [True, False]:
+            return False
+        self.browser["word_wrap"] = mode
+        self.browser_index_rebuild()
+        self.browser["line_pointer"] = 0
+        return True
+
     # 获取Browser行宽
     def browser_get_line_width(self):
         """
@@ -1337,13 +2807,38 @@ class LCD1602:
         self.browser["print_speed"] = print_speed
         return True
 
+    # 设置跟随模式
+    def browser_set_follow(self, mode=True, rate=4):
+        """
+        设置跟随模式（类似 tail -f）。开启后 browser_write() 只追加内容，不再逐行滚动和清屏；
+        屏幕显示最新的2行，每秒最多刷新 rate 次，刷新间隔内的多次写入合并为一次刷新。
+        间隔内未显示的内容由 browser_follow_update() 或 browser_follow_async() 补充显示
+        Set the follow mode, like tail -f. When on, browser_write() only appends and no longer scrolls line by
+        line or clears the screen. The screen shows the newest 2 lines and is repainted at most rate times per
+        second, so writes within an interval are merged into one repaint. Content still pending after an interval
+        is shown by browser_follow_update() or browser_follow_async().
+        :param mode: 是否开启跟随模式
+        Whether to turn on the follow mode.
+        :param rate: 每秒最多刷新次数
+        The maximum number of repaints per second.
+        """
+        if rate <= 0:
+            raise ValueError("Follow rate must be greater than 0.")
+        browser = self.browser
+        browser["follow"] = bool(mode)
+        browser["follow_rate"] = rate
+        browser["follow_pending"] = False
+        # 开启后的第一次写入立即显示
+        browser["follow_last_ms"] = time.ticks_add(time.ticks_ms(), -int(1000 / rate))
+        return True
+
     # 打开Browser内容，并从第1行开始显示
     def browser_open(self):
         """
         打开Browser内容，并从第1行开始显示
         Open the browser content and display from the first line.
         """
-        if self.browser["content_length"] == 0:
+        if self.browser["line_count"] == 0:
             self.print("Browser is Empty", 0.33)
             return False
         else:
@@ -1357,31 +2852,53 @@ class LCD1602:
         清空Browser内容
         Clear the browser content.
         """
-        self.browser["content"] = ""
+        if self.browser["file"] is not None:
+            self.browser_close_file()
+        self.browser["head"] = 0
+        self.browser["offset"] = 0
         self.browser["content_length"] = 0
+        self.browser_index_reset()
         self.browser["line_count"] = 0
         self.browser["line_pointer"] = 0
+        # 保留搜索内容供 browser_find_next() 使用，清空匹配位置缓存
+        if self.browser["search"] is not None:
+            self.browser_search_reset(self.browser["search"]["pattern"])
         return True
 
     # 返回指定行的内容，不考虑内容格式只按存储字符长度划分行
     def browser_get_1line(self, line_pointer=None):
         """
-        从浏览器缓冲区获取指定行的文本内容
-        Get the text content of the specified line from the browser buffer.
+        从浏览器缓冲区获取指定行的显示字符码，通过 memoryview 读取，不复制内容
+        Get the display codes of the specified line from the browser buffer as a memoryview, without copying.
         :param line: 行号
 
-        :return: 指定行的文本内容
-        Returns the text content of the specified line.
+        :return: 指定行内容的 memoryview，行不存在时为空 bytes
+        Returns a memoryview of the line, or empty bytes if the line does not exist.
         """
+        browser = self.browser
         if line_pointer is None:
-            line_pointer = self.browser["line_pointer"]
-        if 0 <= line_pointer <= self.browser["line_count"] - 1:
-            # 获取当前行的内容
-            start = line_pointer * self.browser["line_width"]
-            end = start + self.browser["line_width"]
-            return self.browser["content"][start:end] if start < self.browser["content_length"] else ""
+            line_pointer = browser["line_pointer"]
+        if browser["file"] is not None:
+            return self.browser_file_get_line(line_pointer)
+        if 0 <= line_pointer <= browser["line_count"] - 1:
+            # 由行索引得到该行的起止位置，去掉行尾换行符，超出行宽的部分（按单词换行时的分隔空格）不显示
+            index = browser["index"]
+            starts = index["starts"]
+            i = index["first"] + line_pointer
+            start = starts[i]
+            end = starts[i + 1] if i + 1 < len(starts) else browser["offset"] + browser["content_length"]
+            position = (browser["head"] + start - browser["offset"]) % browser["content_max_length"]
+            buffer = browser["buffer"]
+            length = end - start
+            # 按单词换行时行可长达行宽加2（分隔空格和换行符），只在不超出行宽时检查行尾换行符，避免读出镜像区
+            if length > browser["line_width"]:
+                length = browser["line_width"]
+            elif length and buffer[position + length - 1] == 0x0A:
+                length -= 1
+            # 末尾的镜像区使跨越缓冲区末尾的行也是连续的
+            return memoryview(buffer)[position:position + length]
         else:
-            return ""
+            return b""
 
     # 打印行指针内容到屏幕指定行
     def browser_print_1line(self, line_pointer=None, line=0):
@@ -1404,10 +2921,11 @@ class LCD1602:
         """
         if line_pointer is None:
             line_pointer = self.browser["line_pointer"]
-        content0 = self.browser_get_1line(line_pointer)
-        content1 = self.browser_get_1line(line_pointer + 1)
-        self.print_line(content0, 0)
-        self.print_line(content1, 1)
+        # 先写入两行缓冲区再统一刷新；文件内容源读取下一行可能重新填充行缓存，
+        # 因此每行取得后立即复制到显示缓冲区
+        self.frame_print_line(self.browser_get_1line(line_pointer), 0)
+        self.frame_print_line(self.browser_get_1line(line_pointer + 1), 1)
+        self.frame_update()
         return True
 
     # 向上移动行指针并打印2行内容
@@ -1462,22 +2980,35 @@ class LCD1602:
         """
         if count < 1:
             return False
-        if line_pointer is None:
-            line_pointer = self.browser["line_pointer"]
-        if line_pointer < 0:
-            line_pointer = 0
-        if line_pointer >= self.browser["line_count"]:
-            line_pointer = self.browser["line_count"] - 1
-        start_line = line_pointer
-        end_line = start_line + count
-        if end_line > self.browser["line_count"]:
-            end_line = self.browser["line_count"]
         interval = 1 / (speed if speed is not None else self.browser["print_speed"])
+        for _ in self.browser_scroll_1lines_frames(line_pointer, count, line):
+            self.sleep(interval)
+        return True
+
+    # browser_scroll_1lines 的异步版本
+    async def browser_scroll_1lines_async(self, line_pointer=None, count=1, line=0, speed=None):
+        """
+        browser_scroll_1lines 的异步版本，每行之间让出执行权，可被取消
+        The async version of browser_scroll_1lines. Yields between lines and can be cancelled.
+        """
+        if count < 1:
+            return False
+        interval = 1 / (speed if speed is not None else self.browser["print_speed"])
+        for _ in self.browser_scroll_1lines_frames(line_pointer, count, line):
+            await asyncio.sleep(interval)
+        return True
+
+    # 在LCD指定行逐行轮播显示多行内容，每显示一行后暂停
+    def browser_scroll_1lines_frames(self, line_pointer=None, count=1, line=0):
+        """
+        在LCD指定1行轮播显示多行内容的生成器，每显示一行后 yield 一次
+        A generator that shows multiple lines on the specified LCD line and yields after each one.
+        """
+        start_line, end_line = self.browser_scroll_range(line_pointer, count)
         for lp in range(start_line, end_line):
             self.browser_print_1line(lp, line)
-            time.sleep(interval)
+            yield lp
         self.clear_line(line)
-        return True
 
     # 在LCD的2行滚屏轮播显示多行内容
     def browser_scroll_2lines(self, line_pointer=None, count=1, speed=None):
@@ -1490,6 +3021,46 @@ class LCD1602:
         """
         if count < 1:
             return False
+        interval = 1 / (speed if speed is not None else self.browser["print_speed"])
+        for _ in self.browser_scroll_2lines_frames(line_pointer, count):
+            self.sleep(interval)
+        return True
+
+    # browser_scroll_2lines 的异步版本
+    async def browser_scroll_2lines_async(self, line_pointer=None, count=1, speed=None):
+        """
+        browser_scroll_2lines 的异步版本，每行之间让出执行权，可被取消
+        The async version of browser_scroll_2lines. Yields between lines and can be cancelled.
+        """
+        if count < 1:
+            return False
+        interval = 1 / (speed if speed is not None else self.browser["print_speed"])
+        for _ in self.browser_scroll_2lines_frames(line_pointer, count):
+            await asyncio.sleep(interval)
+        return True
+
+    # 在LCD的2行逐行轮播显示多行内容，每显示一行后暂停
+    def browser_scroll_2lines_frames(self, line_pointer=None, count=1):
+        """
+        在LCD的2行轮播显示多行内容的生成器，每显示一行后 yield 一次
+        A generator that shows multiple lines on the 2 LCD lines and yields after each step.
+        """
+        start_line, end_line = self.browser_scroll_range(line_pointer, count)
+        for lp in range(start_line, end_line):
+            if lp + 1 < end_line:
+                self.browser_print_2lines(lp)
+            else:
+                self.browser_print_1line(lp)
+                self.clear_line(1)  # 最后一行只显示一行
+            yield lp
+        self.set_clear()
+
+    # 计算轮播显示的起止行
+    def browser_scroll_range(self, line_pointer=None, count=1):
+        """
+        把行指针限制在内容范围内，返回轮播显示的起始行和结束行（不含）
+        Clamp the line pointer to the content and return the start line and the end line (exclusive) to show.
+        """
         if line_pointer is None:
             line_pointer = self.browser["line_pointer"]
         if line_pointer < 0:
@@ -1500,16 +3071,7 @@ class LCD1602:
         end_line = start_line + count
         if end_line > self.browser["line_count"]:
             end_line = self.browser["line_count"]
-        interval = 1 / (speed if speed is not None else self.browser["print_speed"])
-        for lp in range(start_line, end_line):
-            if lp + 1 < end_line:
-                self.browser_print_2lines(lp)
-            else:
-                self.browser_print_1line(lp)
-                self.clear_line(1)  # 最后一行只显示一行
-            time.sleep(interval)
-        self.set_clear()
-        return True
+        return start_line, end_line
 
     # 向浏览器缓冲区追加写入内容并显示到LCD
     def browser_write(self, text):
@@ -1517,23 +3079,667 @@ class LCD1602:
         打印浏览器缓冲区的内容
         Print the content of the browser buffer.
         """
-        # 计算内容长度
+        line_pointer, count = self.browser_append(text)
+        # 跟随模式只标记有新内容，由限速刷新显示
+        if self.browser["follow"]:
+            self.browser["follow_pending"] = True
+            self.browser_follow_update()
+            return True
+        # 滚动显示新内容
+        self.browser_scroll_2lines(line_pointer, count, self.browser["print_speed"])
+        return True
+
+    # browser_write 的异步版本
+    async def browser_write_async(self, text):
+        """
+        browser_write 的异步版本，滚动显示新内容时每行之间让出执行权，可被取消
+        The async version of browser_write. Yields between lines while showing the new content and can be cancelled.
+        """
+        line_pointer, count = self.browser_append(text)
+        if self.browser["follow"]:
+            self.browser["follow_pending"] = True
+            self.browser_follow_update()
+            return True
+        await self.browser_scroll_2lines_async(line_pointer, count, self.browser["print_speed"])
+        return True
+
+    # 跟随模式下显示最新内容
+    def browser_follow_update(self, force=False):
+        """
+        跟随模式下有新内容且距上次刷新已超过刷新间隔时，显示最新的2行；只写入变化的字符，不清屏
+        In follow mode, show the newest 2 lines if there is new content and the repaint interval has passed.
+        Only changed cells are written and the screen is not cleared.
+        :param force: 是否忽略刷新间隔立即显示
+        Whether to ignore the repaint interval and show the content now.
+        :return: 如果刷新了屏幕，返回 True
+        Returns True if the screen was repainted.
+        """
+        browser = self.browser
+        if not browser["follow_pending"]:
+            return False
+        now = time.ticks_ms()
+        if not force and time.ticks_diff(now, browser["follow_last_ms"]) < 1000 / browser["follow_rate"]:
+            return False
+        browser["follow_last_ms"] = now
+        browser["follow_pending"] = False
+        browser["line_pointer"] = max(browser["line_count"] - 2, 0)
+        self.browser_print_2lines()
+        return True
+
+    # 跟随模式的异步刷新任务
+    async def browser_follow_async(self):
+        """
+        跟随模式的刷新任务，每个刷新间隔检查一次并显示间隔内写入的新内容，直到被取消
+        The follow mode repaint task. It checks once per repaint interval and shows the content written in
+        the interval, until it is cancelled.
+        """
+        while True:
+            self.browser_follow_update()
+            await asyncio.sleep(1 / self.browser["follow_rate"])
+
+    # 向浏览器缓冲区追加内容
+    def browser_append(self, text):
+        """
+        向浏览器缓冲区追加内容，超出最大长度时删除最早的内容，不刷新屏幕
+        Append text to the browser buffer, dropping the oldest content beyond the maximum length, without drawing.
+        :return: (新内容的起始行指针, 新内容的行数)
+        Returns (the line pointer of the new content, the number of new lines).
+        """
+        browser = self.browser
+        if browser["file"] is not None:
+            raise ValueError("The browser is showing a file. Call browser_clear() before writing.")
+        if browser["buffer"] is None:
+            self.browser_set_content_max_length(browser["content_max_length"])
+        # 按字符 ROM 编码表转换为显示字符码，再计算内容长度
+        text = self.text_to_codes(text)
         text_length = len(text)
-        if text_length > self.browser["content_max_length"]:
+        size = browser["content_max_length"]
+        if text_length > size:
             raise ValueError("Content length exceeds maximum limit.")
-        # 如果当前内容长度加上新内容长度超过最大限制，则删除最早的内容
-        if self.browser["content_length"] + text_length > self.browser["content_max_length"]:
-            del_length = (self.browser["content_length"] + text_length) - self.browser["content_max_length"]
-            self.browser["content"] = self.browser["content"][del_length:]
-        # 追加新内容
-        self.browser["content"] += text
-        self.browser["content_length"] = len(self.browser["content"])
-        self.browser["line_count"] = (self.browser["content_length"] + self.browser["line_width"] - 1) // self.browser["line_width"]
-        self.browser["line_pointer"] = self.browser["line_count"] - 1  # 更新行指针到最后一行
-        # 滚动显示新内容
-        text_line_count = (text_length + self.browser["line_width"] - 1) // self.browser["line_width"]
-        self.browser_scroll_2lines(self.browser["line_pointer"] - text_line_count + 1, text_line_count, self.browser["print_speed"])
+        # 如果当前内容长度加上新内容长度超过最大限制，则移动头部丢弃最早的内容
+        if browser["content_length"] + text_length > size:
+            del_length = (browser["content_length"] + text_length) - size
+            browser["head"] = (browser["head"] + del_length) % size
+            browser["offset"] += del_length
+            browser["content_length"] -= del_length
+            self.browser_index_evict()
+        # 新内容从最后一行（未结束时）或新的一行开始显示
+        first_line = browser["line_count"] if browser["index"]["new_line"] else browser["line_count"] - 1
+        # 在尾部写入新内容的显示字符码，开头40字节同时写入末尾的镜像区
+        buffer = browser["buffer"]
+        start = (browser["head"] + browser["content_length"]) % size
+        index = start
+        for code in text:
+            buffer[index] = code
+            if index < 40:
+                buffer[size + index] = code
+            index += 1
+            if index == size:
+                index = 0
+        browser["content_length"] += text_length
+        self.browser_index_scan(start, text_length)
+        browser["line_pointer"] = max(browser["line_count"] - 1, 0)  # 更新行指针到最后一行
+        first_line = max(min(first_line, browser["line_pointer"]), 0)
+        return first_line, browser["line_count"] - first_line
+
+    # 清空行索引
+    def browser_index_reset(self):
+        """
+        清空行索引。行索引记录每行在写入流中的绝对起始位置，淘汰内容时只移动 first，不移动数组
+        Reset the line index. It holds the absolute stream offset where each line starts.
+        Evicting content only moves first, the array itself is not shifted.
+        """
+        self.browser["index"] = {
+            "starts": array("I"),  # 每行的绝对起始位置
+            "first": 0,  # 第0行在 starts 中的位置
+            "new_line": True,  # 下一个字符是否开始新的一行
+            "absorb_newline": False,  # 因行宽换行后紧跟的换行符并入上一行
+            "line_start": 0,  # 最后一行的绝对起始位置
+            "column": 0,  # 最后一行已有的字符数
+            "last_space": -1,  # 最后一行中最后一个空格的绝对位置
+        }
+        self.browser["line_count"] = 0
+        return True
+
+    # 重建行索引
+    def browser_index_rebuild(self):
+        """
+        按当前行宽和换行方式重新扫描全部内容，建立行索引
+        Rescan the whole content with the current line width and wrap mode to rebuild the line index.
+        """
+        browser = self.browser
+        if browser["file"] is not None:
+            return self.browser_file_scan()
+        self.browser_index_reset()
+        if browser["buffer"] is not None and browser["content_length"]:
+            browser["index"]["line_start"] = browser["offset"]
+            self.browser_index_scan(browser["head"], browser["content_length"])
+        return True
+
+    # 扫描新写入的内容，更新行索引
+    def browser_index_scan(self, position, count):
+        """
+        扫描缓冲区中从 position 开始的 count 个新字符，遇到换行符、行宽或单词边界时在行索引中追加新行
+        Scan count new characters from buffer position position and append lines to the index
+        at newlines, at the line width or at word boundaries.
+        """
+        browser = self.browser
+        index = browser["index"]
+        starts = index["starts"]
+        buffer = browser["buffer"]
+        size = browser["content_max_length"]
+        width = browser["line_width"]
+        word_wrap = browser["word_wrap"]
+        new_line = index["new_line"]
+        absorb_newline = index["absorb_newline"]
+        line_start = index["line_start"]
+        column = index["column"]
+        last_space = index["last_space"]
+        offset = browser["offset"] + browser["content_length"] - count
+        for offset in range(offset, offset + count):
+            code = buffer[position]
+            position += 1
+            if position == size:
+                position = 0
+            if new_line:
+                if code == 0x0A and absorb_newline:
+                    absorb_newline = False
+                    continue
+                starts.append(offset)
+                line_start = offset
+                column = 0
+                last_space = -1
+                new_line = False
+                absorb_newline = False
+            if code == 0x0A:
+                new_line = True
+                continue
+            if column == width:
+                # 行已满：按单词换行时空格作为分隔符并入上一行，或在最后一个空格后换行
+                if word_wrap and code == 0x20:
+                    new_line = True
+                    absorb_newline = True
+                    continue
+                line_start = last_space + 1 if word_wrap and last_space >= line_start else offset
+                starts.append(line_start)
+                column = offset - line_start
+                last_space = -1
+            if code == 0x20:
+                last_space = offset
+            column += 1
+            # 行宽换行后紧跟的换行符不产生空行
+            if column == width and not word_wrap:
+                new_line = True
+                absorb_newline = True
+        index["new_line"] = new_line
+        index["absorb_newline"] = absorb_newline
+        index["line_start"] = line_start
+        index["column"] = column
+        index["last_space"] = last_space
+        browser["line_count"] = len(starts) - index["first"]
+        return True
+
+    # 从行索引中移除已被淘汰的行
+    def browser_index_evict(self):
+        """
+        移除起始位置已被淘汰的行，部分被淘汰的行从最早的内容开始；已移除的行较多时压缩数组
+        Drop the lines whose start has been evicted. A partly evicted line starts at the oldest content.
+        Compacts the array once many lines have been dropped.
+        """
+        browser = self.browser
+        index = browser["index"]
+        starts = index["starts"]
+        offset = browser["offset"]
+        first = index["first"]
+        while first + 1 < len(starts) and starts[first + 1] <= offset:
+            first += 1
+        if first < len(starts) and starts[first] < offset:
+            starts[first] = offset
+            if index["line_start"] < offset:
+                index["line_start"] = offset
+        if first > 64 and first * 2 > len(starts):
+            index["starts"] = starts[first:]
+            first = 0
+        index["first"] = first
+        browser["line_count"] = len(index["starts"]) - first
+        return True
+
+    # 打开文件作为Browser内容
+    def browser_open_file(self, file, every=32, cache_lines=8, chunk_size=512):
+        """
+        以文件作为Browser内容，用于浏览大于内存的日志。打开时扫描一次文件，每 every 行记录一次文件位置；
+        之后只把屏幕上的行和预读的行通过 readinto() 读入复用的缓冲区，翻页、上下移动等方法保持不变
+        Use a file as the browser content, for logs larger than RAM. The file is scanned once on open,
+        recording the file offset of every every-th line. Afterwards only the lines on screen plus a prefetch
+        window are read through readinto() into reused buffers. Paging and line moves work unchanged.
+        换行规则与 browser_write() 写入的内容相同 Lines break the same way as content written by browser_write().
+        :param file: 文件路径，或以二进制方式打开、支持 seek()/readinto() 的文件对象
+        A file path, or a file object opened in binary mode that supports seek()/readinto().
+        :param every: 每隔多少行记录一次文件位置
+        Record the file offset every this many lines.
+        :param cache_lines: 行缓存的行数（屏幕上的行和预读的行）
+        The number of cached lines (the lines on screen plus the prefetch).
+        :param chunk_size: 读取缓冲区大小（字节），至少为行宽加2
+        The read buffer size in bytes, at least the line width plus 2.
+        :return: 如果打开成功，返回 True
+        Returns True if the file is opened.
+        """
+        if every < 1 or cache_lines < 2 or chunk_size < 42:
+            raise ValueError("Invalid file browser settings. Use every >= 1, cache_lines >= 2 and chunk_size >= 42.")
+        self.browser_clear()
+        is_path = isinstance(file, str)
+        if is_path:
+            file = open(file, "rb")
+        size = file.seek(0, 2)
+        chunk = bytearray(chunk_size)
+        self.browser["file"] = {
+            "file": file,
+            "is_path": is_path,  # 由路径打开的文件在关闭时一并关闭
+            "size": size,
+            "every": every,
+            "checkpoints": array("I"),  # 第 0、every、2*every... 行的文件位置
+            "chunk": chunk,  # 复用的读取缓冲区
+            "chunk_mv": memoryview(chunk),
+            "chunk_offset": 0,  # 读取缓冲区内容的文件位置
+            "chunk_length": 0,
+            "cache": bytearray(cache_lines * 40),  # 行缓存，每行40字节
+            "cache_lengths": bytearray(cache_lines),
+            "cache_lines": cache_lines,
+            "cache_first": 0,  # 行缓存第一行的行号
+            "cache_count": 0,
+        }
+        self.browser_file_scan()
         return True
+
+    # 关闭Browser文件内容源
+    def browser_close_file(self):
+        """
+        关闭Browser文件内容源，回到显示缓冲区内容；由路径打开的文件同时关闭
+        Close the browser file source and go back to the buffered content. A file opened from a path is closed.
+        """
+        source = self.browser["file"]
+        if source is None:
+            return False
+        if source["is_path"]:
+            source["file"].close()
+        self.browser["file"] = None
+        self.browser_index_rebuild()
+        self.browser["line_pointer"] = 0
+        return True
+
+    # 扫描文件，建立稀疏行索引
+    def browser_file_scan(self):
+        """
+        扫描整个文件，统计行数并每隔 every 行记录一次文件位置
+        Scan the whole file, counting the lines and recording the file offset every every lines.
+        """
+        browser = self.browser
+        source = browser["file"]
+        every = source["every"]
+        checkpoints = array("I")
+        source["chunk_length"] = 0
+        source["cache_count"] = 0
+        offset = 0
+        line = 0
+        size = source["size"]
+        while offset < size:
+            if line % every == 0:
+                checkpoints.append(offset)
+            offset = self.browser_file_line(offset)[1]
+            line += 1
+        source["checkpoints"] = checkpoints
+        browser["line_count"] = line
+        return True
+
+    # 确保文件指定范围在读取缓冲区中
+    def browser_file_read(self, offset, count):
+        """
+        确保文件从 offset 开始的 count 个字节在读取缓冲区中，必要时从 offset 处 readinto() 重新读取
+        Make sure count bytes from file offset offset are in the read buffer, refilling it with readinto() at offset if needed.
+        :return: (在读取缓冲区中的位置, 可用的字节数，文件末尾时可能少于 count)
+        Returns (the position in the read buffer, the available bytes, fewer than count at the end of the file).
+        """
+        source = self.browser["file"]
+        start = source["chunk_offset"]
+        end = start + source["chunk_length"]
+        if offset < start or (offset + count > end and end < source["size"]):
+            file = source["file"]
+            file.seek(offset)
+            source["chunk_offset"] = offset
+            source["chunk_length"] = file.readinto(source["chunk"]) or 0
+            start = offset
+        position = offset - start
+        return position, min(count, source["chunk_length"] - position)
+
+    # 计算文件中一行的长度和下一行的位置
+    def browser_file_line(self, offset):
+        """
+        计算文件中从 offset 开始的一行的显示长度和下一行的文件位置
+        Get the display length of the line starting at file offset offset and the offset of the next line.
+        :return: (显示长度, 下一行的文件位置)
+        Returns (the display length, the file offset of the next line).
+        """
+        width = self.browser["line_width"]
+        position, count = self.browser_file_read(offset, width + 2)
+        chunk = self.browser["file"]["chunk"]
+        # 行宽以内（含紧跟满行的位置）有换行符时在换行符处结束
+        for i in range(min(count, width + 1)):
+            if chunk[position + i] == 0x0A:
+                return i, offset + i + 1
+        if count <= width:
+            return count, offset + count
+        if self.browser["word_wrap"]:
+            # 满行后的空格作为分隔符并入本行，其后紧跟的换行符也并入本行
+            if chunk[position + width] == 0x20:
+                if count > width + 1 and chunk[position + width + 1] == 0x0A:
+                    return width, offset + width + 2
+                return width, offset + width + 1
+            for i in range(width - 1, -1, -1):
+                if chunk[position + i] == 0x20:
+                    return i + 1, offset + i + 1
+        return width, offset + width
+
+    # 获取文件内容源中的一行
+    def browser_file_get_line(self, line_pointer):
+        """
+        从行缓存获取文件中指定行的显示字符码，未缓存时从最近的记录位置开始读取并填充行缓存
+        Get the display codes of a file line from the line cache. On a miss, read from the nearest
+        recorded offset and refill the cache.
+        :return: 指定行内容的 memoryview，行不存在时为空 bytes。该视图指向共享的行缓存，再次读取其他行后可能失效
+        Returns a memoryview of the line, or empty bytes if the line does not exist. The view points into the
+        shared line cache and may be overwritten by the next read of another line.
+        """
+        browser = self.browser
+        source = browser["file"]
+        if not 0 <= line_pointer < browser["line_count"]:
+            return b""
+        i = line_pointer - source["cache_first"]
+        if not 0 <= i < source["cache_count"]:
+            # 从该行之前留出四分之一缓存，向上翻页时也能命中
+            first = max(0, line_pointer - source["cache_lines"] // 4)
+            every = source["every"]
+            line = first // every * every
+            offset = source["checkpoints"][first // every]
+            while line < first:
+                offset = self.browser_file_line(offset)[1]
+                line += 1
+            cache = source["cache"]
+            lengths = source["cache_lengths"]
+            chunk_mv = source["chunk_mv"]
+            count = 0
+            while count < source["cache_lines"] and line < browser["line_count"]:
+                length, next_offset = self.browser_file_line(offset)
+                position = self.browser_file_read(offset, length)[0]
+                cache[count * 40:count * 40 + length] = chunk_mv[position:position + length]
+                lengths[count] = length
+                count += 1
+                line += 1
+                offset = next_offset
+            source["cache_first"] = first
+            source["cache_count"] = count
+            i = line_pointer - first
+        return memoryview(source["cache"])[i * 40:i * 40 + source["cache_lengths"][i]]
+
+    # 获取内容的起止位置
+    def browser_content_range(self):
+        """
+        获取内容在写入流（文件内容源时为文件）中的绝对起止位置
+        Get the absolute start and end of the content in the write stream, or in the file for a file source.
+        :return: (起始位置, 结束位置)
+        Returns (start, end).
+        """
+        browser = self.browser
+        if browser["file"] is not None:
+            return 0, browser["file"]["size"]
+        return browser["offset"], browser["offset"] + browser["content_length"]
+
+    # 读取一段内容
+    def browser_content_view(self, position, count):
+        """
+        读取从绝对位置 position 开始的最多 count 个显示字符码。缓冲区内容不跨越末尾时直接返回 memoryview，
+        跨越末尾时复制这一段；文件内容源通过读取缓冲区返回
+        Read up to count display codes from absolute position position. Buffered content is returned as a
+        memoryview unless it wraps past the end of the ring, in which case that piece is copied.
+        A file source is read through its read buffer.
+        """
+        browser = self.browser
+        count = min(count, self.browser_content_range()[1] - position)
+        if browser["file"] is not None:
+            start, count = self.browser_file_read(position, count)
+            return browser["file"]["chunk_mv"][start:start + count]
+        size = browser["content_max_length"]
+        start = (browser["head"] + position - browser["offset"]) % size
+        view = memoryview(browser["buffer"])
+        if start + count <= size + 40:
+            return view[start:start + count]
+        return bytes(view[start:size]) + bytes(view[0:start + count - size])
+
+    # 获取行的起始位置
+    def browser_line_position(self, line_pointer):
+        """
+        获取指定行在内容中的绝对起始位置，行指针等于行数时返回内容结束位置
+        Get the absolute start of a line. A line pointer equal to the line count gives the end of the content.
+        """
+        browser = self.browser
+        if line_pointer >= browser["line_count"]:
+            return self.browser_content_range()[1]
+        if browser["file"] is not None:
+            every = browser["file"]["every"]
+            offset = browser["file"]["checkpoints"][line_pointer // every]
+            for _ in range(line_pointer % every):
+                offset = self.browser_file_line(offset)[1]
+            return offset
+        index = browser["index"]
+        return index["starts"][index["first"] + line_pointer]
+
+    # 获取绝对位置所在的行
+    def browser_line_at(self, position):
+        """
+        获取绝对位置所在行的行指针，缓冲区内容二分查找行索引，文件内容源从最近的记录位置开始计算
+        Get the line pointer of the line holding an absolute position. Buffered content bisects the line index,
+        a file source walks from the nearest recorded offset.
+        """
+        browser = self.browser
+        if browser["file"] is not None:
+            source = browser["file"]
+            starts = source["checkpoints"]
+            low, high = 0, len(starts)
+        else:
+            index = browser["index"]
+            starts = index["starts"]
+            low, high = index["first"], len(starts)
+        # 找到最后一个起始位置不大于 position 的记录
+        while high - low > 1:
+            middle = (low + high) // 2
+            if starts[middle] <= position:
+                low = middle
+            else:
+                high = middle
+        if browser["file"] is None:
+            return low - browser["index"]["first"]
+        line = low * source["every"]
+        offset = starts[low]
+        while line < browser["line_count"] - 1:
+            offset = self.browser_file_line(offset)[1]
+            if offset > position:
+                break
+            line += 1
+        return line
+
+    # 搜索内容并跳转到匹配的行
+    def browser_find(self, pattern, direction=1):
+        """
+        从行指针所在行开始搜索内容，找到后把行指针移动到匹配所在的行并打印2行内容。
+        分块搜索显示字符码，不复制整个内容；找到的匹配位置会被缓存，browser_find_next() 命中缓存时不再扫描
+        Search the content starting at the line under the line pointer, then move the line pointer to the
+        matching line and print 2 lines. The display codes are scanned in chunks without copying the whole
+        content, and found match offsets are cached so browser_find_next() does not rescan on a hit.
+        :param pattern: 搜索的文本（不超过40个字符），str 按 browser_write() 的方式编码，也可以是 bytes
+        The text to find, at most 40 characters. A str is encoded like browser_write(), bytes are used as is.
+        :param direction: 1 向后搜索（包括当前行），-1 向前搜索（包括当前行）
+        1 searches forward and -1 searches backward, both including the current line.
+        :return: 匹配所在的行指针，未找到时返回 -1
+        Returns the line pointer of the match, or -1 if there is no match.
+        """
+        if direction not in (1, -1):
+            raise ValueError("Invalid direction. Use 1 for forward or -1 for backward.")
+        pattern = bytes(self.text_to_codes(pattern))
+        if not 0 < len(pattern) <= 40:
+            raise ValueError("Pattern length must be between 1 and 40.")
+        browser = self.browser
+        search = browser["search"]
+        if search is None or search["pattern"] != pattern:
+            search = self.browser_search_reset(pattern)
+        search["direction"] = direction
+        search["last"] = -1
+        line_pointer = browser["line_pointer"]
+        if direction == 1:
+            position = self.browser_line_position(line_pointer)
+        else:
+            position = self.browser_line_position(line_pointer + 1)
+        return self.browser_find_from(position)
+
+    # 搜索下一个匹配
+    def browser_find_next(self):
+        """
+        按上次 browser_find() 的内容和方向搜索下一个匹配。行指针仍在上次匹配所在的行时从上次匹配之后继续，
+        否则从行指针所在行开始
+        Find the next match of the last browser_find() in the same direction. If the line pointer is still on the
+        line of the last match, the search continues after that match, otherwise it starts at the current line.
+        :return: 匹配所在的行指针，未找到时返回 -1
+        Returns the line pointer of the match, or -1 if there is no match.
+        """
+        search = self.browser["search"]
+        if search is None:
+            raise ValueError("No search pattern. Call browser_find() first.")
+        line_pointer = self.browser["line_pointer"]
+        last = search["last"]
+        if last >= 0 and self.browser_search_valid() and self.browser_line_at(last) == line_pointer:
+            position = last + 1 if search["direction"] == 1 else last
+        elif search["direction"] == 1:
+            position = self.browser_line_position(line_pointer)
+        else:
+            position = self.browser_line_position(line_pointer + 1)
+        return self.browser_find_from(position)
+
+    # 清空搜索状态
+    def browser_search_reset(self, pattern):
+        """
+        清空搜索状态和匹配位置缓存
+        Reset the search state and the match offset cache.
+        """
+        browser = self.browser
+        browser["search"] = {
+            "pattern": pattern,
+            "direction": 1,
+            "last": -1,  # 上一次匹配的绝对位置
+            "source": browser["file"],  # 缓存对应的内容，内容变化时缓存失效
+            "offset": browser["offset"],
+            "length": self.browser_get_content_length(),
+            "low": 0,  # 已扫描的范围 [low, high)，其中全部匹配的起始位置都在 matches 中
+            "high": 0,
+            "matches": array("I"),
+        }
+        return browser["search"]
+
+    # 检查匹配位置缓存是否仍然有效
+    def browser_search_valid(self):
+        """
+        检查内容在搜索后是否发生了变化
+        Check whether the content has changed since the search.
+        """
+        browser = self.browser
+        search = browser["search"]
+        return (search["source"] is browser["file"] and search["offset"] == browser["offset"]
+                and search["length"] == self.browser_get_content_length())
+
+    # 从指定位置搜索
+    def browser_find_from(self, position):
+        """
+        从绝对位置 position 开始搜索：向后搜索起始位置不小于 position 的匹配，向前搜索起始位置小于 position 的匹配。
+        先查匹配位置缓存，未命中时分块扫描，并把扫描过的范围和其中的匹配位置存入缓存
+        Search from absolute position position: forward for matches starting at or after it, backward for matches
+        starting before it. The match offset cache is checked first. On a miss the content is scanned in chunks
+        and the scanned range and its matches are cached.
+        :return: 匹配所在的行指针，未找到时返回 -1
+        Returns the line pointer of the match, or -1 if there is no match.
+        """
+        browser = self.browser
+        search = browser["search"]
+        if not self.browser_search_valid():
+            direction = search["direction"]
+            search = self.browser_search_reset(search["pattern"])
+            search["direction"] = direction
+        forward = search["direction"] == 1
+        matches = search["matches"]
+        match = -1
+        if search["low"] <= position <= search["high"]:
+            # 在已扫描的范围内查找缓存的匹配位置
+            if forward:
+                for value in matches:
+                    if value >= position:
+                        match = value
+                        break
+            else:
+                for value in matches:
+                    if value < position:
+                        match = value
+            if match < 0:
+                match = self.browser_search_scan(search["high"] if forward else search["low"], position)
+        else:
+            match = self.browser_search_scan(position, position)
+        if match < 0:
+            return -1
+        search["last"] = match
+        browser["line_pointer"] = self.browser_line_at(match)
+        self.browser_print_2lines()
+        return browser["line_pointer"]
+
+    # 分块扫描匹配
+    def browser_search_scan(self, position, origin):
+        """
+        从 position 开始分块扫描，直到找到匹配或到达内容边界。扫描范围 [origin, position) 或 [position, origin)
+        已确认没有匹配，与新扫描的范围合并后存入缓存，每个块中最多缓存16个匹配位置
+        Scan in chunks from position until a match is found or the content ends. The range between origin and
+        position is already known to hold no matches and is merged with the newly scanned range into the cache.
+        At most 16 match offsets are cached per chunk.
+        :return: 匹配的绝对位置，未找到时返回 -1
+        Returns the absolute position of the match, or -1 if there is no match.
+        """
+        browser = self.browser
+        search = browser["search"]
+        pattern = search["pattern"]
+        extra = len(pattern) - 1
+        forward = search["direction"] == 1
+        start, end = self.browser_content_range()
+        # 每块可能的匹配起始位置数，文件内容源受读取缓冲区大小限制
+        step = 256 if browser["file"] is None else len(browser["file"]["chunk"]) - extra
+        found = array("I")
+        while not found and (position < end if forward else position > start):
+            if forward:
+                low = position
+                high = position = min(position + step, end)
+            else:
+                high = position
+                low = position = max(position - step, start)
+            data = bytes(self.browser_content_view(low, high - low + extra))
+            i = data.find(pattern)
+            while 0 <= i < high - low:
+                found.append(low + i)
+                i = data.find(pattern, i + 1)
+        if forward:
+            found = found[:16]
+            search["low"] = origin
+            search["high"] = found[-1] + 1 if found else end
+        else:
+            found = found[-16:]
+            search["low"] = found[0] if found else start
+            search["high"] = origin
+        search["matches"] = found
+        if not found:
+            return -1
+        return found[0] if forward else found[-1]
+
     # browser_write的别名
     def browser_print(self, text):
         return self.browser_write(text)
@@ -1564,22 +3770,12 @@ class LCD1602:
         :param percent: 对比度百分比，范围为 0-100
         The contrast percentage, range from 0 to 100.
         """
-        # 检查是否启用 V0 PWM 控制
-        if not self.v0_pwm["enable"]:
-            raise ValueError("V0 PWM control is not enabled. Please enable it first.")
-        pin_name = self.v0_pwm["pin_name"]
-        # 检查引脚是否已启用
-        if pin_name not in self.enabled_pins:
-            raise ValueError(f"Pin {pin_name} is not enabled. Please enable it first.")
-        # 检查引脚是否已经绑定到实际的 Pin 对象
-        if pin_name not in self.bind_mcu_pins:
-            raise ValueError(f"Pin {pin_name} is not initialized. Please bind it first.")
-        # 检查引脚是否为 PWM 引脚
-        if not isinstance(self.bind_mcu_pins[pin_name], PWM):
-            raise ValueError(f"Pin {pin_name} is not a PWM pin.")
+        pwm = self.get_pwm_pin(self.v0_pwm)
         # 检查百分比范围
         if not (0 <= percent <= 100):
             raise ValueError("Contrast percent must be between 0 and 100.")
+        # 直接设置时取消正在进行的渐变
+        self.fade_stop("V0")
 
         # 计算占空比
         duty = self.percent_to_pwm_duty_u16(percent)
@@ -1587,43 +3783,457 @@ class LCD1602:
         self.v0_pwm["duty_u16"] = duty
         self.v0_pwm["contrast_percent"] = percent
         # 刷新 PWM 引脚的占空比
-        self.bind_mcu_pins[pin_name].duty_u16(duty) # 设置 PWM 占空比
+        pwm.duty_u16(duty) # 设置 PWM 占空比
         return True
 
     # 设置背光亮度
     def backlight_brightness(self, percent):
         """
-        设置 LCD1602 背光亮度
-        Set the backlight brightness of the LCD1602.
+        设置 LCD1602 背光亮度，亮度按 gamma 查找表转换为占空比，使感知亮度均匀变化
+        Set the backlight brightness of the LCD1602. The brightness goes through the gamma lookup table,
+        so the perceived brightness changes evenly.
         :param percent: 背光亮度百分比，范围为 0-100
         The backlight brightness percentage, range from 0 to 100.
         """
-        # 检查是否启用 BLA PWM 控制
-        if not self.bla_pwm["enable"]:
-            raise ValueError("BLA PWM control is not enabled. Please enable it first.")
-        pin_name = self.bla_pwm["pin_name"]
-        # 检查引脚是否已启用
-        if pin_name not in self.enabled_pins:
-            raise ValueError(f"Pin {pin_name} is not enabled. Please enable it first.")
-        # 检查引脚是否已绑定
-        if pin_name not in self.bind_mcu_pins:
-            raise ValueError(f"Pin {pin_name} is not initialized. Please bind it first.")
-        # 检查引脚是否为 PWM 引脚
-        if not isinstance(self.bind_mcu_pins[pin_name], PWM):
-            raise ValueError(f"Pin {pin_name} is not a PWM pin.")
+        pwm = self.get_pwm_pin(self.bla_pwm)
         # 检查百分比范围
         if not (0 <= percent <= 100):
             raise ValueError("Backlight brightness percent must be between 0 and 100.")
+        # 直接设置时取消正在进行的渐变
+        self.fade_stop("BLA")
 
         # 计算占空比
-        duty = self.percent_to_pwm_duty_u16(percent)
+        duty = self.backlight_duty(percent)
         # 更新 PWM 设置
         self.bla_pwm["duty_u16"] = duty
         self.bla_pwm["brightness_percent"] = percent
         # 刷新 PWM 引脚的占空比
-        self.bind_mcu_pins[pin_name].duty_u16(duty)
+        pwm.duty_u16(duty)
+        return True
+
+    # 取得 PWM 设置对应的 PWM 对象
+    def get_pwm_pin(self, pwm):
+        """
+        检查 PWM 设置（v0_pwm 或 bla_pwm）对应的引脚已启用并绑定为 PWM，返回 PWM 对象
+        Check that the pin of a PWM setting (v0_pwm or bla_pwm) is enabled and bound as PWM, and return the PWM object.
+        """
+        pin_name = pwm["pin_name"]
+        # 检查是否启用 PWM 控制
+        if not pwm["enable"]:
+            raise ValueError(f"{pin_name} PWM control is not enabled. Please enable it first.")
+        # 检查引脚是否已启用
+        if pin_name not in self.enabled_pins:
+            raise ValueError(f"Pin {pin_name} is not enabled. Please enable it first.")
+        # 检查引脚是否已经绑定到实际的 Pin 对象
+        if pin_name not in self.bind_mcu_pins:
+            raise ValueError(f"Pin {pin_name} is not initialized. Please bind it first.")
+        # 检查引脚是否为 PWM 引脚
+        if not isinstance(self.bind_mcu_pins[pin_name], PWM):
+            raise ValueError(f"Pin {pin_name} is not a PWM pin.")
+        return self.bind_mcu_pins[pin_name]
+
+    # 设置背光 gamma 值
+    def set_backlight_gamma(self, gamma=2.2):
+        """
+        设置背光亮度的 gamma 值并预先生成256级亮度的占空比查找表，1.0 为线性
+        Set the gamma of the backlight brightness and precompute the duty lookup table of 256 levels. 1.0 is linear.
+        """
+        if gamma <= 0:
+            raise ValueError("Gamma must be greater than 0.")
+        self.fade["gamma"] = gamma
+        self.fade["levels"] = array("H", [int(65535 * (i / 255) ** gamma + 0.5) for i in range(256)])
+        return True
+
+    # 背光亮度百分比转换为占空比
+    def backlight_duty(self, percent):
+        """
+        按 gamma 查找表把背光亮度百分比转换为 PWM 占空比
+        Convert a backlight brightness percentage to a PWM duty through the gamma lookup table.
+        """
+        return self.fade["levels"][int(percent * 255 / 100 + 0.5)]
+
+    # 渐变背光亮度
+    def fade_backlight(self, to, ms=500):
+        """
+        用 machine.Timer 在后台把背光亮度渐变到目标值，立即返回。按 gamma 查找表逐级变化，占空比不变时不写入；
+        新的渐变从当前亮度开始接管正在进行的渐变
+        Fade the backlight brightness to the target in the background with a machine.Timer and return at once.
+        The duty steps through the gamma lookup table and is not written when it does not change.
+        A new fade takes over from the current brightness of a fade still running.
+        :param to: 目标亮度百分比 0-100
+        The target brightness percentage, 0-100.
+        :param ms: 渐变时间（毫秒）
+        The fade time in milliseconds.
+        """
+        self.fade_start(self.bla_pwm, to, ms, True)
+        return True
+
+    # 渐变显示对比度
+    def fade_contrast(self, to, ms=500):
+        """
+        用 machine.Timer 在后台把显示对比度渐变到目标值，立即返回。对比度与 display_contrast() 相同按线性变化
+        Fade the display contrast to the target in the background with a machine.Timer and return at once.
+        The contrast changes linearly, the same as display_contrast().
+        :param to: 目标对比度百分比 0-100
+        The target contrast percentage, 0-100.
+        :param ms: 渐变时间（毫秒）
+        The fade time in milliseconds.
+        """
+        self.fade_start(self.v0_pwm, to, ms, True)
+        return True
+
+    # fade_backlight 的异步版本
+    async def fade_backlight_async(self, to, ms=500):
+        """
+        fade_backlight 的异步版本，由 asyncio 任务逐步渐变，不使用定时器，完成或被新的渐变接管时返回
+        The async version of fade_backlight. Steps in the asyncio task without a timer and returns when
+        the fade is done or taken over by a new fade.
+        """
+        await self.fade_run_async(self.fade_start(self.bla_pwm, to, ms, False))
+        return True
+
+    # fade_contrast 的异步版本
+    async def fade_contrast_async(self, to, ms=500):
+        """
+        fade_contrast 的异步版本，由 asyncio 任务逐步渐变，不使用定时器，完成或被新的渐变接管时返回
+        The async version of fade_contrast. Steps in the asyncio task without a timer and returns when
+        the fade is done or taken over by a new fade.
+        """
+        await self.fade_run_async(self.fade_start(self.v0_pwm, to, ms, False))
         return True
 
+    # 开始一次渐变
+    def fade_start(self, pwm, to, ms, timer):
+        """
+        开始一次渐变并接管同一引脚正在进行的渐变，从当前占空比在查找表中的级数开始
+        Start a fade, taking over any fade running on the same pin and starting from the level of the current duty
+        in the lookup table.
+        :param pwm: v0_pwm 或 bla_pwm
+        v0_pwm or bla_pwm.
+        :param timer: 为 True 时由 machine.Timer 驱动，否则由调用者逐步调用 fade_step()
+        True to drive it with a machine.Timer, otherwise the caller steps it with fade_step().
+        :return: 渐变状态
+        Returns the fade state.
+        """
+        pin = self.get_pwm_pin(pwm)
+        if not (0 <= to <= 100):
+            raise ValueError("Fade percent must be between 0 and 100.")
+        if ms < 0:
+            raise ValueError("Fade time must not be negative.")
+        fade = self.fade
+        backlight = pwm is self.bla_pwm
+        # 背光按 gamma 查找表，对比度为线性：第 i 级占空比为 i * 257
+        levels = fade["levels"] if backlight else None
+        duty = pwm["duty_u16"]
+        if levels is None:
+            start = (duty + 128) // 257
+        else:
+            # 查找表单调递增，二分查找最接近当前占空比的级数
+            low, high = 0, 255
+            while low < high:
+                middle = (low + high) // 2
+                if levels[middle] < duty:
+                    low = middle + 1
+                else:
+                    high = middle
+            start = low
+        job = {
+            "pwm": pwm,
+            "pin": pin,
+            "key": "brightness_percent" if backlight else "contrast_percent",
+            "levels": levels,
+            "start": start,
+            "level": start,
+            "end": int(to * 255 / 100 + 0.5),
+            "to": to,
+            "end_duty": self.backlight_duty(to) if backlight else self.percent_to_pwm_duty_u16(to),
+            "start_ms": time.ticks_ms(),
+            "ms": ms,
+            "timer": timer,
+        }
+        # 接管正在进行的渐变时先停止它，百分比更新为当前占空比对应的值
+        if pwm["pin_name"] in fade["jobs"]:
+            self.fade_stop(pwm["pin_name"])
+        fade["jobs"][pwm["pin_name"]] = job
+        if timer and fade["timer"] is None:
+            try:
+                from machine import Timer
+            except ImportError:
+                del fade["jobs"][pwm["pin_name"]]
+                raise ValueError("machine.Timer is not available. Use fade_backlight_async() or fade_contrast_async() instead.")
+            fade["timer"] = Timer(fade["timer_id"])
+            fade["timer"].init(mode=Timer.PERIODIC, period=fade["step_ms"], callback=self.fade_tick)
+        return job
+
+    # 渐变一步
+    def fade_step(self, job):
+        """
+        按经过的时间计算渐变的当前级数并写入占空比，占空比不变时不写入；渐变结束时写入目标值并移除渐变
+        Compute the current level of a fade from the elapsed time and write the duty, skipping the write when
+        the duty does not change. At the end the target is written and the fade removed.
+        :return: 渐变结束返回 True
+        Returns True when the fade is done.
+        """
+        pwm = job["pwm"]
+        elapsed = time.ticks_diff(time.ticks_ms(), job["start_ms"])
+        done = elapsed >= job["ms"]
+        if done:
+            duty = job["end_duty"]
+        else:
+            level = job["start"] + (job["end"] - job["start"]) * elapsed // job["ms"]
+            job["level"] = level
+            levels = job["levels"]
+            duty = levels[level] if levels is not None else level * 257
+        if duty != pwm["duty_u16"]:
+            job["pin"].duty_u16(duty)
+            pwm["duty_u16"] = duty
+        if done:
+            self.fade_stop(pwm["pin_name"])
+            pwm[job["key"]] = job["to"]
+        return done
+
+    # 定时器回调，推进所有由定时器驱动的渐变
+    def fade_tick(self, timer=None):
+        """
+        定时器回调：推进所有由定时器驱动的渐变，没有渐变时停止定时器
+        The timer callback. Steps every timer-driven fade and stops the timer when none is left.
+        """
+        jobs = self.fade["jobs"]
+        running = False
+        for pin_name in ("BLA", "V0"):
+            job = jobs.get(pin_name)
+            if job is not None and job["timer"]:
+                running = not self.fade_step(job) or running
+        if not running:
+            self.fade_stop_timer()
+
+    # 停止渐变
+    def fade_stop(self, pin_name=None):
+        """
+        停止指定 PWM 引脚（"BLA" 或 "V0"）的渐变，为 None 时停止全部渐变，占空比停在当前值，百分比更新为当前级数对应的整数百分比
+        Stop the fade of a PWM pin ("BLA" or "V0"), or all fades when None. The duty stays at its current value
+        and the percentage is updated to the whole percent nearest the current level.
+        """
+        jobs = self.fade["jobs"]
+        for name in ("BLA", "V0"):
+            if (pin_name is None or name == pin_name) and name in jobs:
+                job = jobs.pop(name)
+                job["pwm"][job["key"]] = round(job["level"] * 100 / 255)
+        for job in jobs.values():
+            if job["timer"]:
+                return True
+        self.fade_stop_timer()
+        return True
+
+    # 停止渐变定时器
+    def fade_stop_timer(self):
+        """
+        停止并释放渐变定时器
+        Stop and release the fade timer.
+        """
+        timer = self.fade["timer"]
+        if timer is not None:
+            timer.deinit()
+            self.fade["timer"] = None
+
+    # 由 asyncio 任务逐步执行渐变
+    async def fade_run_async(self, job):
+        """
+        在 asyncio 任务中逐步执行渐变，直到完成或被新的渐变接管
+        Step a fade in the asyncio task until it is done or taken over by a new fade.
+        """
+        jobs = self.fade["jobs"]
+        name = job["pwm"]["pin_name"]
+        while jobs.get(name) is job and not self.fade_step(job):
+            await asyncio.sleep(self.fade["step_ms"] / 1000)
+
+    # ########################################
+    # 以下是关于空闲电源管理的方法
+    #
+
+    # 开启或关闭空闲电源管理
+    def set_power_manager(self, mode=True, dim_s=30, off_s=60, dim_percent=10, fade_ms=1000):
+        """
+        开启或关闭空闲电源管理：内容 dim_s 秒没有变化后把背光渐变调暗到 dim_percent，再过 off_s 秒关闭显示和背光；
+        下一次写入内容或调用 wake() 时按保存的 settings/bla_pwm 状态立即恢复，不重新初始化。
+        状态切换由 power_update() 或 power_manager_async() 执行，不在定时器中断中发送命令
+        Enable or disable the idle power manager. After dim_s seconds without content changes the backlight fades
+        to dim_percent, and off_s seconds later the display and the backlight are turned off. The next content
+        write or wake() restores the saved settings/bla_pwm state at once without running init() again.
+        The state changes are made by power_update() or power_manager_async(), never from a timer interrupt.
+        :param mode: True 开启，False 关闭（关闭时先唤醒）
+        True to enable, False to disable (waking first).
+        :param dim_s: 内容无变化多少秒后调暗背光
+        The seconds without content changes before the backlight is dimmed.
+        :param off_s: 调暗后再过多少秒关闭显示
+        The seconds after dimming before the display is turned off.
+        :param dim_percent: 调暗后的背光亮度百分比
+        The dimmed backlight brightness percentage.
+        :param fade_ms: 调暗的渐变时间（毫秒），0 为立即调暗，没有 machine.Timer 时须为 0
+        The dimming fade time in milliseconds. 0 dims at once, and must be used without machine.Timer.
+        """
+        if mode not in [True, False]:
+            return False
+        power = self.power
+        if not mode:
+            self.wake()
+            power["enabled"] = False
+            return True
+        if dim_s < 0 or off_s < 0 or fade_ms < 0:
+            raise ValueError("Power manager times must not be negative.")
+        if not (0 <= dim_percent <= 100):
+            raise ValueError("Dim percent must be between 0 and 100.")
+        self.wake()
+        power["dim_s"] = dim_s
+        power["off_s"] = off_s
+        power["dim_percent"] = dim_percent
+        power["fade_ms"] = fade_ms
+        # 重新开始计时
+        now = time.ticks_ms()
+        power["enabled"] = True
+        power["last_ms"] = now
+        power["state_ms"] = now
+        power["time_ms"] = {"on": 0, "dim": 0, "off": 0}
+        return True
+
+    # 按空闲时间切换电源状态
+    def power_update(self):
+        """
+        按内容无变化的时间把电源状态切换为调暗或关闭，须在主循环中定期调用，或使用 power_manager_async()
+        Move the power state to dim or off by the time without content changes. Call it regularly from the main
+        loop, or use power_manager_async().
+        :return: 当前电源状态 "on"、"dim" 或 "off"
+        Returns the current power state, "on", "dim" or "off".
+        """
+        power = self.power
+        if not power["enabled"]:
+            return power["state"]
+        idle = time.ticks_diff(time.ticks_ms(), power["last_ms"])
+        if power["state"] == "on" and idle >= power["dim_s"] * 1000:
+            self.power_dim()
+        if power["state"] == "dim" and idle >= (power["dim_s"] + power["off_s"]) * 1000:
+            self.power_off()
+        return power["state"]
+
+    # power_update 的异步版本
+    async def power_manager_async(self, interval=1):
+        """
+        在 asyncio 任务中定期调用 power_update()，关闭空闲电源管理时返回，可被取消
+        Call power_update() regularly in an asyncio task. Returns when the power manager is disabled and can be cancelled.
+        :param interval: 检查间隔（秒）
+        The check interval in seconds.
+        """
+        while self.power["enabled"]:
+            self.power_update()
+            await asyncio.sleep(interval)
+        return True
+
+    # 调暗背光
+    def power_dim(self):
+        """
+        保存背光占空比和亮度（正在渐变时为渐变目标）、显示开关和传输对象背光，把 PWM 背光渐变调暗，进入 "dim" 状态
+        Save the backlight duty and brightness (the target of a running fade), the display switch and the transport
+        backlight, fade the PWM backlight down and enter the "dim" state.
+        """
+        power = self.power
+        bla_pwm = self.bla_pwm
+        job = self.fade["jobs"].get(bla_pwm["pin_name"])
+        power["saved"] = {
+            "duty": bla_pwm["duty_u16"] if job is None else job["end_duty"],
+            "brightness": bla_pwm["brightness_percent"] if job is None else job["to"],
+            "display_on": self.settings["display_on"],
+            "backlight": getattr(self.transport, "backlight", None),  # PCF8574 等传输对象的背光开关
+        }
+        if bla_pwm["enable"] and power["saved"]["brightness"] > power["dim_percent"]:
+            if power["fade_ms"]:
+                self.fade_backlight(power["dim_percent"], power["fade_ms"])
+            else:
+                self.backlight_brightness(power["dim_percent"])
+        self.power_enter("dim")
+        return True
+
+    # 关闭显示
+    def power_off(self):
+        """
+        关闭背光并发送关闭显示命令，DDRAM 内容保持不变，进入 "off" 状态
+        Turn the backlight off and send display off. DDRAM is kept. Enters the "off" state.
+        """
+        if self.power["saved"] is None:
+            self.power_dim()
+        if self.bla_pwm["enable"]:
+            self.backlight_brightness(0)
+        if self.power["saved"]["backlight"] is not None:
+            self.transport.set_backlight(False)
+        self.set_display_on(False)
+        self.power_enter("off")
+        return True
+
+    # 唤醒
+    def wake(self):
+        """
+        立即恢复调暗或关闭前保存的背光占空比、显示开关和传输对象背光，不重新初始化，并重新开始计算空闲时间
+        Restore at once the backlight duty, display switch and transport backlight saved before dimming,
+        without running init() again, and restart the idle time.
+        """
+        power = self.power
+        power["last_ms"] = time.ticks_ms()
+        state = power["state"]
+        if state == "on":
+            return True
+        saved = power["saved"]
+        # 先切换状态，恢复过程中的写入不会再次唤醒
+        self.power_enter("on")
+        power["saved"] = None
+        if self.bla_pwm["enable"]:
+            # 直接写回保存的占空比，不经 gamma 查找表重新换算
+            pwm = self.get_pwm_pin(self.bla_pwm)
+            self.fade_stop("BLA")
+            self.bla_pwm["duty_u16"] = saved["duty"]
+            self.bla_pwm["brightness_percent"] = saved["brightness"]
+            pwm.duty_u16(saved["duty"])
+        if state == "off":
+            if saved["backlight"] is not None:
+                self.transport.set_backlight(saved["backlight"])
+            self.set_display_on(saved["display_on"])
+        return True
+
+    # 记录内容变化
+    def power_activity(self):
+        """
+        记录一次内容变化，屏幕调暗或关闭时立即唤醒，由 flush() 和 send_byte_data() 调用
+        Record a content change and wake at once when dimmed or off. Called by flush() and send_byte_data().
+        """
+        power = self.power
+        power["last_ms"] = time.ticks_ms()
+        if power["state"] != "on":
+            self.wake()
+
+    # 切换电源状态
+    def power_enter(self, state):
+        """
+        切换电源状态，把上一个状态经过的时间计入累计
+        Change the power state, adding the time spent in the previous state to its total.
+        """
+        power = self.power
+        now = time.ticks_ms()
+        power["time_ms"][power["state"]] += time.ticks_diff(now, power["state_ms"])
+        power["state"] = state
+        power["state_ms"] = now
+
+    # 获取电源状态统计
+    def power_stats(self):
+        """
+        获取当前电源状态和各状态累计的时间
+        Get the current power state and the time spent in each state.
+        :return: {"enabled": 是否开启, "state": 当前状态, "time_ms": {"on": 毫秒, "dim": 毫秒, "off": 毫秒}}
+        Returns {"enabled": enabled, "state": current state, "time_ms": {"on": ms, "dim": ms, "off": ms}}.
+        """
+        power = self.power
+        time_ms = dict(power["time_ms"])
+        if power["enabled"]:
+            time_ms[power["state"]] += time.ticks_diff(time.ticks_ms(), power["state_ms"])
+        return {"enabled": power["enabled"], "state": power["state"], "time_ms": time_ms}
+
     # ########################################
     # 以下是关于功能整体初始化的方法
     #
@@ -1634,21 +4244,57 @@ class LCD1602:
         初始化LED写模式
         Initialize the LED write mode.
         """
+        for delay_ms in self.init_lcd_write_steps():
+            self.sleep_ms(delay_ms)
+        return True
+
+    # init_lcd_write 的异步版本
+    async def init_lcd_write_async(self):
+        """
+        init_lcd_write 的异步版本，上电延时和唤醒等待期间让出执行权，可被取消
+        The async version of init_lcd_write. Yields during the power-on and wake-up delays and can be cancelled.
+        """
+        for delay_ms in self.init_lcd_write_steps():
+            await asyncio.sleep(delay_ms / 1000)
+        return True
+
+    # LCD写入模式启动流程，遇到毫秒级等待时暂停
+    def init_lcd_write_steps(self):
+        """
+        LCD写入模式启动流程的生成器，遇到毫秒级等待时 yield 等待的毫秒数，由调用者决定等待方式
+        A generator running the LCD write start-up sequence. It yields the milliseconds to wait at each
+        long delay, leaving the way of waiting to the caller.
+        """
+        # 唤醒完成前无法读取忙标志，启动流程使用固定延时
+        self.transport.set_busy_polling(False)
+        # 其他驱动程序可能使用过同一组引脚，重新写入引脚电平，使传输对象的电平记录与引脚一致
+        if hasattr(self.transport, "resync"):
+            self.transport.resync()
         # LCD写入模式启动流程
-        time.sleep_ms(15) # 上电延时（≥15ms）
-        self.set_data_lines_matrix_mode() # 第一次唤醒（试探） 之后等待≥4.1ms
-        time.sleep_ms(5)
-        self.set_data_lines_matrix_mode() # 第二次唤醒（确认状态） 之后等待≥100μs
-        time.sleep_us(100)
-        self.set_data_lines_matrix_mode() # 第三次唤醒（强制模式） 之后等待≥40μs
-        time.sleep_us(40)
+        # 上电后控制器处于8位模式，唤醒指令只发送一次使能脉冲（4位连接时为半字节0x3），
+        # 否则4位模式的高低半字节会与控制器错位
+        # After power-on the controller is in 8-bit mode, so each wake-up is a single enable pulse
+        # (nibble 0x3 on a 4-bit bus), otherwise the 4-bit nibbles get out of step with the controller
+        bits = self.transport.bits
+        wake_up = 0x03 if bits == 4 else 0x30
+        self.transport.set_rs(0)
+        yield self.timing["power_on_ms"] # 上电延时（≥15ms，3.3V 供电时≥40ms）
+        self.send_bits(wake_up, bits) # 第一次唤醒（试探） 之后等待≥4.1ms
+        yield self.timing["wake_ms"]
+        self.send_bits(wake_up, bits) # 第二次唤醒（确认状态） 之后等待≥100μs
+        self.sleep_us(100)
+        self.send_bits(wake_up, bits) # 第三次唤醒（强制模式） 之后等待≥40μs
+        self.sleep_us(40)
+        if bits == 4:
+            self.send_bits(0x02, bits) # 切换到4位模式 之后等待≥40μs
+            self.sleep_us(40)
+        self.transport.set_busy_polling(self.settings["busy_flag_polling"] and self.is_read_ready, self.settings["busy_timeout_us"])
         self.set_data_lines_matrix_mode() # 默认：4bits数据传输，2行显示，5x7字符点阵
         self.set_clear() # 清屏（含延时2ms）
         self.set_cursor_return_home() # 光标归位（含延时2ms）
         self.set_ac_display_mode() # 默认：光标自动右移，屏幕不移
         self.set_display_cursor_blink_mode() # 默认：开显示，开光标，开闪烁
         self.is_write_ready = True
-        return True
 
     # 按默认设置初始化引脚
     def init_default_pins(self):
@@ -1659,6 +4305,8 @@ class LCD1602:
         Returns True if the initialization is successful.
         """
         self.is_pin_ready = False
+        # 恢复为GPIO直连
+        self.is_external_transport = False
         # 初始化功能引脚
         self.enable_function_pins_by_default()
         self.bind_function_pins_by_set()
@@ -1667,7 +4315,11 @@ class LCD1602:
         self.bind_data_pins_by_set()
         # 初始化PWM引脚
         self.bind_pwm_pins_by_set()
+        # 生成固定的传输对象
+        self.init_transport()
         self.is_pin_ready = True
+        # RW引脚连接到GPIO时才能读取
+        self.is_read_ready = self.transport.can_read
         return True
 
     # 初始化引脚
@@ -1679,13 +4331,75 @@ class LCD1602:
         Returns True if the initialization is successful.
         """
         self.is_pin_ready = False
+        # 外部传输对象不需要绑定GPIO数据和控制引脚
+        if self.is_external_transport:
+            self.is_pin_ready = True
+            self.is_read_ready = self.transport.can_read
+            return True
         # 绑定功能引脚
         self.bind_function_pins_by_set()
         # 绑定数据引脚
         self.bind_data_pins_by_set()
         # 绑定PWM引脚
         self.bind_pwm_pins_by_set()
+        # 生成固定的传输对象
+        self.init_transport()
+        self.is_pin_ready = True
+        # RW引脚连接到GPIO时才能读取
+        self.is_read_ready = self.transport.can_read
+        return True
+
+    # 使用外部传输对象
+    def set_transport(self, transport):
+        """
+        使用外部传输对象（如 I2C 转接板、移位寄存器）代替GPIO直连，之后调用 init() 只初始化LCD写入
+        Use an external transport (such as an I2C backpack or a shift register) instead of direct GPIO.
+        Afterwards init() only initializes the LCD write mode.
+        :param transport: 提供 bits、can_read、set_rs()、write()、write_run()、write_bits() 等接口的传输对象
+        A transport providing bits, can_read, set_rs(), write(), write_run(), write_bits() and so on.
+        :return: 如果设置成功，返回 True
+        Returns True if the setting is successful.
+        """
+        if transport.bits not in [4, 8]:
+            raise ValueError("Invalid data transmission mode. Use 4 or 8.")
+        self.transport = transport
+        self.is_external_transport = True
+        self.settings["data_trans_bits"] = transport.bits
+        self.transport.set_busy_polling(self.settings["busy_flag_polling"] and transport.can_read, self.settings["busy_timeout_us"])
         self.is_pin_ready = True
+        self.is_read_ready = transport.can_read
+        self.is_write_ready = False
+        self.instrument_transport()
+        return True
+
+    # 根据已绑定的引脚生成传输对象
+    def init_transport(self):
+        """
+        根据已绑定的引脚生成固定的GPIO传输对象，预先取得各引脚的 value 方法和每个字节的电平表
+        Build the fixed GPIO transport from the bound pins, holding the Pin.value methods and the per-byte level table.
+        :return: 如果生成成功，返回 True
+        Returns True if the transport is built successfully.
+        """
+        data_pins_list = self.get_bind_mcu_data_pins_list()
+        if len(data_pins_list) != self.settings["data_trans_bits"]:
+            raise ValueError("Invalid bits count. Please check the data pins configuration.")
+        for pin_name in (self.__default_pins__[3], self.__default_pins__[5]):
+            if pin_name not in self.bind_mcu_pins:
+                raise ValueError(f"Pin {pin_name} is not initialized. Please bind it first.")
+        rw_pin_name = self.__default_pins__[4]
+        rs = self.bind_mcu_pins[self.__default_pins__[3]]
+        rw = self.bind_mcu_pins[rw_pin_name] if rw_pin_name in self.bind_mcu_pins else None
+        e = self.bind_mcu_pins[self.__default_pins__[5]]
+        data_pins = [self.bind_mcu_pins[pin_name] for pin_name in data_pins_list]
+        # 数据引脚都在同一端口时使用整端口写入，否则逐个引脚写入
+        if self.check_data_port():
+            gpio_numbers = [self.enabled_pins[pin_name] for pin_name in data_pins_list]
+            self.transport = PortTransport(rs, rw, e, data_pins, gpio_numbers, self.data_port)
+        else:
+            self.transport = GPIOTransport(rs, rw, e, data_pins)
+        self.transport.set_pulse_delay(self.timing["pulse_us"], self.timing["enable_us"])
+        self.transport.set_busy_polling(self.settings["busy_flag_polling"] and self.transport.can_read, self.settings["busy_timeout_us"])
+        self.instrument_transport()
         return True
 
     # 按默认配置初始化并启动LCD1602
@@ -1719,3 +4433,623 @@ class LCD1602:
 
         # 这里可以添加更多初始化代码
         return True
+
+
+class GPIOTransport:
+    """
+    LCD1602 GPIO 直连传输
+    LCD1602 direct GPIO transport.
+    初始化时取得 RS/RW/E 和数据引脚的 value 方法，并生成256个字节对应的电平表，发送时不再分配内存和查找字典
+    Holds the bound value methods of the RS/RW/E and data pins plus a 256-entry level table,
+    so sending a byte needs no allocation and no dict lookups.
+    同时记录 RS 和数据引脚最后写入的电平，只写入电平发生变化的引脚，跳过的写入次数记录在 skipped_writes 中
+    It also remembers the last level written to RS and each data pin, writes only the pins whose level
+    changes, and counts the skipped writes in skipped_writes.
+    """
+    def __init__(self, rs, rw, e, data_pins, pulse_delay_us=100):
+        """
+        :param rs: RS 引脚的 Pin 对象
+        The Pin object of RS.
+        :param rw: RW 引脚的 Pin 对象，未连接到GPIO时为 None
+        The Pin object of RW, None if RW is not connected to a GPIO.
+        :param e: E 引脚的 Pin 对象
+        The Pin object of E.
+        :param data_pins: 按 D0-D7 或 D4-D7 顺序排列的数据引脚 Pin 对象列表
+        The data pin objects in D0-D7 or D4-D7 order.
+        :param pulse_delay_us: 每次使能脉冲后的等待时间（微秒）
+        The delay after each enable pulse in microseconds.
+        """
+        if len(data_pins) not in [4, 8]:
+            raise ValueError("Invalid bits count. Please check the data pins configuration.")
+        self.bits = len(data_pins)
+        self.data_pins = tuple(data_pins)
+        self.rs = rs.value
+        self.rw = rw.value if rw is not None else None
+        self.e = e.value
+        self.data = tuple(pin.value for pin in data_pins)
+        self.can_read = rw is not None
+        self.rs_level = 0
+        self.pulse_delay_us = pulse_delay_us
+        self.default_pulse_delay_us = pulse_delay_us
+        self.enable_delay_us = 1  # 使能脉冲高电平宽度（微秒）
+        self.busy_polling = False
+        self.busy_timeout_us = 10000
+        # 延时函数，统计开启时被替换为计数的版本
+        self.sleep_us = time.sleep_us
+        # 半字节中发生变化的位对应的数据线序号，按 新半字节 ^ 旧半字节 查表
+        self.changes = tuple(tuple(i for i in range(4) if (x >> i) & 1) for x in range(16))
+        if self.bits == 4:
+            self.write = self.write_4bits
+        else:
+            self.write = self.write_8bits
+        self.skipped_writes = 0
+        # 先把 RS 和数据线置为已知的低电平，之后只写入电平发生变化的引脚
+        GPIOTransport.resync(self)
+
+    # 重新写入引脚电平并刷新电平记录
+    def resync(self):
+        """
+        把 RW、RS 和数据线重新写为低电平并刷新电平记录。其他驱动程序使用过同一组引脚后电平记录不再可信，
+        由 LCD1602.init_lcd_write() 调用
+        Drive RW, RS and the data lines low again and refresh the recorded levels. The records cannot be
+        trusted after another driver has used the same pins. Called by LCD1602.init_lcd_write().
+        """
+        # 写入状态下RW保持为低
+        if self.rw is not None:
+            self.rw(0)
+        self.rs_level = 0
+        self.rs(0)
+        self.rs_pin_level = 0
+        for write in self.data:
+            write(0)
+        self.data_level = 0  # 数据线当前电平，D0（或D4）为最低位
+
+    # 设置RS电平，0为命令，1为数据
+    def set_rs(self, level):
+        """
+        设置RS电平
+        Set the RS level.
+        """
+        self.rs_level = level
+        if level == self.rs_pin_level:
+            self.skipped_writes += 1
+        else:
+            self.rs(level)
+            self.rs_pin_level = level
+
+    # 把数值放到4根数据线上，只写入电平变化的数据线
+    def write_data_nibble(self, value, offset=0):
+        """
+        把半字节放到从 offset 开始的4根数据线上，只写入电平发生变化的数据线
+        Put a nibble on the 4 data lines starting at offset, writing only the lines whose level changes.
+        """
+        old = (self.data_level >> offset) & 0x0F
+        changed = self.changes[value ^ old]
+        data = self.data
+        for i in changed:
+            data[offset + i]((value >> i) & 1)
+        self.skipped_writes += 4 - len(changed)
+        self.data_level = (self.data_level & ~(0x0F << offset)) | (value << offset)
+
+    # 发送使能脉冲
+    def pulse(self):
+        """
+        发送使能脉冲信号
+        Send a pulse to the enable pin.
+        """
+        e = self.e
+        e(1)
+        self.sleep_us(self.enable_delay_us)
+        e(0)
+        if self.pulse_delay_us:
+            self.sleep_us(self.pulse_delay_us)
+
+    # 4位模式发送一个字节
+    def write_4bits(self, value):
+        """
+        4位模式发送一个字节，先高4位后低4位，只写入电平发生变化的数据线
+        Send a byte in 4-bit mode, high nibble first, writing only the data lines whose level changes.
+        """
+        data = self.data
+        changes = self.changes
+        e = self.e
+        sleep_us = self.sleep_us
+        delay = self.pulse_delay_us
+        enable = self.enable_delay_us
+        high = (value >> 4) & 0x0F
+        low = value & 0x0F
+        changed = changes[high ^ self.data_level]
+        for i in changed:
+            data[i]((high >> i) & 1)
+        skipped = 4 - len(changed)
+        e(1)
+        sleep_us(enable)
+        e(0)
+        if delay:
+            sleep_us(delay)
+        changed = changes[low ^ high]
+        for i in changed:
+            data[i]((low >> i) & 1)
+        self.skipped_writes += skipped + 4 - len(changed)
+        self.data_level = low
+        e(1)
+        sleep_us(enable)
+        e(0)
+        if delay:
+            sleep_us(delay)
+        if self.busy_polling:
+            self.poll_busy(self.busy_timeout_us)
+
+    # 8位模式发送一个字节
+    def write_8bits(self, value):
+        """
+        8位模式发送一个字节，只写入电平发生变化的数据线
+        Send a byte in 8-bit mode, writing only the data lines whose level changes.
+        """
+        e = self.e
+        self.write_data_nibble(value & 0x0F, 0)
+        self.write_data_nibble((value >> 4) & 0x0F, 4)
+        e(1)
+        self.sleep_us(self.enable_delay_us)
+        e(0)
+        if self.pulse_delay_us:
+            self.sleep_us(self.pulse_delay_us)
+        if self.busy_polling:
+            self.poll_busy(self.busy_timeout_us)
+
+    # 连续发送多个字节
+    def write_run(self, buf):
+        """
+        以当前RS电平连续发送多个字节
+        Send several bytes with the current RS level.
+        """
+        write = self.write
+        for value in buf:
+            write(value)
+
+    # 估算写入代价
+    def write_cost(self):
+        """
+        估算每个数据字节和每条地址命令（含两次切换RS）的时间（微秒），每次引脚访问按 5 微秒估算，供写入计划使用
+        Estimate the time in microseconds of a data byte and of an address command, including the two RS
+        switches, counting 5 microseconds per pin access. Used by the write planner.
+        :return: (数据字节代价, 地址命令代价)
+        Returns (the data byte cost, the address command cost).
+        """
+        nibbles = 2 if self.bits == 4 else 1
+        # 每个半字节写入数据线，再拉高、拉低 E
+        pins = (4 if self.bits == 4 else 8) + 2
+        data = nibbles * (pins * 5 + 1 + self.pulse_delay_us)
+        if self.busy_polling:
+            data += 40  # 轮询忙标志等待指令执行完成
+        return data, data + 2 * 5
+
+    # 把数值的低4位或低8位放到数据线上并发送一次使能脉冲
+    def write_bits(self, value):
+        """
+        把数值放到数据线上并发送一次使能脉冲
+        Put the value on the data lines and pulse the enable pin once.
+        """
+        self.write_data_nibble(value & 0x0F, 0)
+        if self.bits == 8:
+            self.write_data_nibble((value >> 4) & 0x0F, 4)
+        self.pulse()
+
+    # 设置是否在每个字节后轮询忙标志
+    def set_busy_polling(self, mode, timeout_us=10000):
+        """
+        设置是否在每个字节后轮询忙标志
+        Set whether to poll the busy flag after every byte.
+        """
+        self.busy_polling = bool(mode) and self.can_read
+        self.busy_timeout_us = timeout_us
+        # 轮询忙标志时不再需要每次脉冲后的固定延时
+        self.pulse_delay_us = 0 if self.busy_polling else self.default_pulse_delay_us
+
+    # 设置使能脉冲宽度和每次脉冲后的等待时间
+    def set_pulse_delay(self, pulse_us, enable_us=1):
+        """
+        设置每次使能脉冲后的等待时间和使能脉冲高电平宽度，轮询忙标志时脉冲后仍不等待
+        Set the delay after each enable pulse and the width of the enable pulse. While polling the busy flag
+        there is still no delay after the pulse.
+        :param pulse_us: 每次使能脉冲后的等待时间（微秒）
+        The delay after each enable pulse in microseconds.
+        :param enable_us: 使能脉冲高电平宽度（微秒）
+        The high time of the enable pulse in microseconds.
+        """
+        self.default_pulse_delay_us = pulse_us
+        self.pulse_delay_us = 0 if self.busy_polling else pulse_us
+        self.enable_delay_us = enable_us
+
+    # 切换数据引脚方向并拉高RW，进入读取状态
+    def begin_read(self, rs):
+        """
+        数据引脚切换为输入并拉高RW，进入读取状态
+        Switch the data pins to input and raise RW.
+        """
+        if rs != self.rs_pin_level:
+            self.rs(rs)
+            self.rs_pin_level = rs
+        for pin in self.data_pins:
+            pin.init(Pin.IN)
+        self.rw(1)
+
+    # 拉低RW并恢复数据引脚为输出，回到写入状态
+    def end_read(self):
+        """
+        拉低RW并恢复数据引脚为输出，回到写入状态
+        Lower RW and switch the data pins back to output.
+        """
+        self.rw(0)
+        # 恢复为输出时同时恢复记录的电平，使电平记录与引脚保持一致
+        level = self.data_level
+        for i, pin in enumerate(self.data_pins):
+            pin.init(Pin.OUT, value=(level >> i) & 1)
+        self.set_rs(self.rs_level)
+
+    # 在读取状态下读取一个字节
+    def read_value(self):
+        """
+        在读取状态下读取一个字节
+        Read a byte while in the read state.
+        """
+        e = self.e
+        data = self.data
+        value = 0
+        for nibble in range(8 // self.bits):
+            e(1)
+            self.sleep_us(1)  # 等待数据输出稳定
+            for i in range(self.bits):
+                value |= data[i]() << i
+            e(0)
+            self.sleep_us(1)
+            if self.bits == 4 and nibble == 0:
+                value <<= 4
+        return value
+
+    # 读取一个字节，RS为0时读取忙标志和地址计数器，RS为1时读取数据
+    def read(self, rs=0):
+        """
+        读取一个字节，RS为0时读取忙标志和地址计数器，RS为1时读取数据
+        Read a byte. With RS low it reads the busy flag and address counter, with RS high it reads data.
+        """
+        if not self.can_read:
+            raise ValueError("Read is not ready. Please connect the RW pin to a GPIO and initialize the pins first.")
+        self.begin_read(rs)
+        try:
+            return self.read_value()
+        finally:
+            self.end_read()
+
+    # 轮询忙标志直到空闲，返回地址计数器
+    def poll_busy(self, timeout_us=10000):
+        """
+        轮询忙标志直到空闲，超时抛出 ValueError
+        Poll the busy flag until idle, raising ValueError on timeout.
+        """
+        self.begin_read(0)
+        start = time.ticks_us()
+        try:
+            while True:
+                value = self.read_value()
+                if not value & 0x80:
+                    return value & 0x7F
+                if time.ticks_diff(time.ticks_us(), start) > timeout_us:
+                    raise ValueError("Busy flag timeout. Please check the RW pin connection.")
+        finally:
+            self.end_read()
+
+
+class PortTransport(GPIOTransport):
+    """
+    LCD1602 GPIO 整端口传输
+    LCD1602 whole-port GPIO transport.
+    数据引脚都在同一GPIO端口时，通过端口的置位/清零（或翻转）寄存器一次写入全部数据线，减少调用次数和数据线之间的时间差
+    When all data pins are on one GPIO port, all data lines are written at once through the port
+    set/clear (or XOR) registers, which saves calls and removes skew between the lines.
+    """
+    def __init__(self, rs, rw, e, data_pins, gpio_numbers, port, pulse_delay_us=100):
+        """
+        :param gpio_numbers: 与 data_pins 顺序对应的GPIO编号列表
+        The GPIO numbers in the same order as data_pins.
+        :param port: 端口描述字典，见 LCD1602.set_gpio_port()
+        The port description, see LCD1602.set_gpio_port().
+        """
+        super().__init__(rs, rw, e, data_pins, pulse_delay_us)
+        self.mem = port["mem"]
+        self.set_addr = port["set"]
+        self.clr_addr = port["clr"]
+        self.xor_addr = port.get("xor")
+        masks = [1 << (gpio - port["first"]) for gpio in gpio_numbers]
+        self.masks = masks
+        self.mask = 0
+        for mask in masks:
+            self.mask |= mask
+        # 每个字节对应的数据线端口电平，4位模式为 (高4位, 低4位)，8位模式为整个字节
+        if self.bits == 4:
+            nibbles = tuple(self.port_bits(masks, n) for n in range(16))
+            self.port_table = tuple((nibbles[v >> 4], nibbles[v & 0x0F]) for v in range(256))
+            self.write = self.write_port_4bits
+        else:
+            self.port_table = tuple(self.port_bits(masks, v) for v in range(256))
+            self.write = self.write_port_8bits
+        # 有翻转寄存器时只需一次写入，否则先清零再置位
+        if self.xor_addr is not None:
+            self.write_port = self.write_port_xor
+        else:
+            self.write_port = self.write_port_set_clr
+        # 数据线初始全部为低电平
+        self.resync()
+
+    # 重新写入引脚电平并刷新电平记录
+    def resync(self):
+        """
+        把 RW、RS 和数据线重新写为低电平，并通过清零寄存器清零数据线，刷新端口电平记录
+        Drive RW, RS and the data lines low again, clear the data lines through the clear register and
+        refresh the recorded port levels.
+        """
+        GPIOTransport.resync(self)
+        self.mem[self.clr_addr] = self.mask
+        self.port_level = 0
+
+    # 计算数值对应的端口电平
+    def port_bits(self, masks, value):
+        """
+        计算数值各位对应数据线的端口电平
+        Get the port levels of the data lines for a value.
+        """
+        bits = 0
+        for i in range(len(masks)):
+            if (value >> i) & 1:
+                bits |= masks[i]
+        return bits
+
+    # 通过翻转寄存器一次写入全部数据线
+    def write_port_xor(self, bits):
+        """
+        通过翻转寄存器一次写入全部数据线，电平不变时跳过
+        Write all data lines at once through the XOR register, skipping the write when the levels do not change.
+        """
+        if bits == self.port_level:
+            self.skipped_writes += 1
+            return
+        self.mem[self.xor_addr] = bits ^ self.port_level
+        self.port_level = bits
+
+    # 通过清零和置位寄存器写入全部数据线
+    def write_port_set_clr(self, bits):
+        """
+        通过清零和置位寄存器写入全部数据线，电平不变时跳过
+        Write all data lines through the clear and set registers, skipping the writes when the levels do not change.
+        """
+        if bits == self.port_level:
+            self.skipped_writes += 2
+            return
+        mem = self.mem
+        mem[self.clr_addr] = self.mask ^ bits
+        mem[self.set_addr] = bits
+        self.port_level = bits
+
+    # 4位模式发送一个字节
+    def write_port_4bits(self, value):
+        """
+        4位模式通过端口寄存器发送一个字节，先高4位后低4位
+        Send a byte in 4-bit mode through the port registers, high nibble first.
+        """
+        e = self.e
+        sleep_us = self.sleep_us
+        delay = self.pulse_delay_us
+        enable = self.enable_delay_us
+        write_port = self.write_port
+        high, low = self.port_table[value & 0xFF]
+        write_port(high)
+        e(1)
+        sleep_us(enable)
+        e(0)
+        if delay:
+            sleep_us(delay)
+        write_port(low)
+        e(1)
+        sleep_us(enable)
+        e(0)
+        if delay:
+            sleep_us(delay)
+        if self.busy_polling:
+            self.poll_busy(self.busy_timeout_us)
+
+    # 8位模式发送一个字节
+    def write_port_8bits(self, value):
+        """
+        8位模式通过端口寄存器发送一个字节
+        Send a byte in 8-bit mode through the port registers.
+        """
+        e = self.e
+        self.write_port(self.port_table[value & 0xFF])
+        e(1)
+        self.sleep_us(self.enable_delay_us)
+        e(0)
+        if self.pulse_delay_us:
+            self.sleep_us(self.pulse_delay_us)
+        if self.busy_polling:
+            self.poll_busy(self.busy_timeout_us)
+
+    # 把数值放到数据线上并发送一次使能脉冲
+    def write_bits(self, value):
+        """
+        把数值的低4位或低8位通过端口寄存器放到数据线上并发送一次使能脉冲
+        Put the low 4 or 8 bits of the value on the data lines through the port registers and pulse once.
+        """
+        if self.bits == 4:
+            self.write_port(self.port_table[value & 0x0F][1])
+        else:
+            self.write_port(self.port_table[value & 0xFF])
+        self.pulse()
+
+    # 拉低RW并恢复数据引脚为输出，回到写入状态
+    def end_read(self):
+        """
+        拉低RW并恢复数据引脚为输出，输出电平恢复为端口电平记录
+        Lower RW and switch the data pins back to output, restoring the recorded port levels.
+        """
+        self.rw(0)
+        level = self.port_level
+        for mask, pin in zip(self.masks, self.data_pins):
+            pin.init(Pin.OUT, value=1 if level & mask else 0)
+        self.set_rs(self.rs_level)
+
+    # 估算写入代价
+    def write_cost(self):
+        """
+        估算每个数据字节和每条地址命令的时间（微秒），数据线通过端口寄存器一次写入
+        Estimate the time in microseconds of a data byte and of an address command. The data lines are written
+        at once through the port registers.
+        """
+        nibbles = 2 if self.bits == 4 else 1
+        # 每个半字节写入端口寄存器，再拉高、拉低 E
+        data = nibbles * (3 * 5 + 1 + self.pulse_delay_us)
+        if self.busy_polling:
+            data += 40
+        return data, data + 2 * 5
+
+
+class SimulatedPort:
+    """
+    模拟的GPIO端口寄存器，代替 machine.mem32 在Linux下测试整端口写入的掩码逻辑
+    A simulated GPIO port register block that stands in for machine.mem32,
+    so the whole-port masking logic can be tested on Linux.
+    """
+    def __init__(self, first=0, last=31, xor=True):
+        """
+        :param first: 端口第一个GPIO编号
+        The first GPIO number of the port.
+        :param last: 端口最后一个GPIO编号
+        The last GPIO number of the port.
+        :param xor: 是否提供翻转寄存器
+        Whether the port has an XOR register.
+        """
+        self.first = first
+        self.last = last
+        self.set_addr = 0x14
+        self.clr_addr = 0x18
+        self.xor_addr = 0x1C if xor else None
+        self.out = 0  # 输出寄存器
+        self.writes = 0  # 寄存器写入次数
+
+    # 写入寄存器
+    def __setitem__(self, address, value):
+        self.writes += 1
+        if address == self.set_addr:
+            self.out |= value
+        elif address == self.clr_addr:
+            self.out &= ~value
+        elif self.xor_addr is not None and address == self.xor_addr:
+            self.out ^= value
+        else:
+            raise ValueError(f"Invalid register address: {address:#x}.")
+
+    # 读取寄存器，返回输出寄存器的值
+    def __getitem__(self, address):
+        return self.out
+
+    # 获取可传给 LCD1602.set_gpio_port() 的端口描述
+    def port(self):
+        """
+        获取可传给 LCD1602.set_gpio_port() 的端口描述
+        Get the port description for LCD1602.set_gpio_port().
+        """
+        port = {"mem": self, "set": self.set_addr, "clr": self.clr_addr, "first": self.first, "last": self.last}
+        if self.xor_addr is not None:
+            port["xor"] = self.xor_addr
+        return port
+
+    # 获取指定GPIO的输出电平
+    def level(self, gpio):
+        """
+        获取指定GPIO的输出电平
+        Get the output level of a GPIO.
+        """
+        return (self.out >> (gpio - self.first)) & 1
+
+
+class StatsTransport:
+    """
+    计数传输代理，仅在开启总线统计时放在传输对象之前，统计命令/数据字节、半字节和使能脉冲
+    A counting transport proxy, only placed in front of the transport while the bus statistics are enabled.
+    Counts command/data bytes, nibbles and enable pulses.
+    """
+    def __init__(self, transport, counters):
+        """
+        :param transport: 被代理的传输对象
+        The transport behind the proxy.
+        :param counters: LCD1602.counters 统计字典
+        The LCD1602.counters statistics dict.
+        """
+        self.transport = transport
+        self.counters = counters
+        self.bits = transport.bits
+        self.can_read = transport.can_read
+        # 每个字节的半字节数和使能脉冲数
+        self.nibbles = 2 if transport.bits == 4 else 0
+        self.pulses = 2 if transport.bits == 4 else 1
+
+    # 其余属性和方法直接访问被代理的传输对象
+    def __getattr__(self, name):
+        return getattr(self.transport, name)
+
+    # 按当前RS电平计数字节
+    def count(self, count):
+        current = self.counters["current"]
+        if self.transport.rs_level:
+            current["data"] += count
+        else:
+            current["commands"] += count
+        current["nibbles"] += count * self.nibbles
+        current["e_pulses"] += count * self.pulses
+
+    def write(self, value):
+        self.count(1)
+        self.transport.write(value)
+
+    def write_run(self, buf):
+        self.count(len(buf))
+        self.transport.write_run(buf)
+
+    def write_bits(self, value):
+        current = self.counters["current"]
+        if self.bits == 4:
+            current["nibbles"] += 1
+        current["e_pulses"] += 1
+        self.transport.write_bits(value)
+
+    def pulse(self):
+        self.counters["current"]["e_pulses"] += 1
+        self.transport.pulse()
+
+
+class StatsBus:
+    """
+    计数总线代理，统计端口寄存器写入（machine.mem32）和 I2C/SPI 传输次数
+    A counting bus proxy. Counts port register writes (machine.mem32) and I2C/SPI transfers.
+    """
+    def __init__(self, bus, counters):
+        self.bus = bus
+        self.counters = counters
+
+    # 其余属性和方法直接访问被代理的对象
+    def __getattr__(self, name):
+        return getattr(self.bus, name)
+
+    def __setitem__(self, address, value):
+        self.counters["current"]["port_writes"] += 1
+        self.bus[address] = value
+
+    def __getitem__(self, address):
+        return self.bus[address]
+
+    def writeto(self, address, buf, *args):
+        self.counters["current"]["bus_writes"] += 1
+        return self.bus.writeto(address, buf, *args)
+
+    def write(self, buf):
+        self.counters["current"]["bus_writes"] += 1
+        return self.bus.write(buf)
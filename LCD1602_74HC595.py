@@ -0,0 +1,277 @@
+import time
+
+class ShiftRegisterTransport:
+    """
+    MicroPython LCD1602 HD44780 74HC595 移位寄存器传输模块
+    MicroPython LCD1602 HD44780 74HC595 shift register transport.
+    把 RS/E/背光和4位数据映射到移位寄存器输出，预先生成一段字符的全部字节序列，
+    再逐个字节通过硬件 SPI.write() 发送；没有硬件 SPI 时通过 Pin 软件模拟移位
+    Maps the RS/E/backlight bits and the nibbles onto the shift register outputs, pre-builds the byte
+    sequence of a run of characters, then sends it one byte at a time with hardware SPI.write().
+    Without hardware SPI it bit-bangs through Pin.
+    74HC595 每个字节都需要一次锁存脉冲才会输出，因此每个字节需要单独一次 SPI.write() 和锁存，不能一次发送整段序列；
+    RW 接地，只能写入
+    The 74HC595 only updates its outputs on a latch pulse, so every byte needs its own SPI.write() and
+    latch, and a whole sequence cannot go out in one write. RW is tied to GND, so the LCD is write only.
+    记录最后锁存的字节，单独发送的控制字节与之相同时跳过，跳过的次数记录在 skipped_writes 中
+    The last latched byte is remembered, and a standalone control byte equal to it is skipped and
+    counted in skipped_writes.
+    使用方法 Usage:
+        spi = SPI(0, baudrate=1000000, sck=Pin(2), mosi=Pin(3))
+        lcd = LCD1602(transport=ShiftRegisterTransport(Pin(5, Pin.OUT), spi=spi))
+        lcd = LCD1602(transport=ShiftRegisterTransport(Pin(5, Pin.OUT), data=Pin(3, Pin.OUT), clock=Pin(2, Pin.OUT)))
+    """
+    def __init__(self, latch, spi=None, data=None, clock=None, pins=(1, 2, 7, 3, 4, 5, 6), backlight=True, run_length=40, write_delay_us=40):
+        """
+        :param latch: 连接 74HC595 RCLK 的 Pin 对象
+        The Pin object connected to the 74HC595 RCLK.
+        :param spi: machine.SPI 对象，为 None 时使用 data 和 clock 软件移位
+        A machine.SPI object. When None, data and clock are bit-banged.
+        :param data: 连接 SER 的 Pin 对象，仅软件移位时使用
+        The Pin object connected to SER, only for bit-banging.
+        :param clock: 连接 SRCLK 的 Pin 对象，仅软件移位时使用
+        The Pin object connected to SRCLK, only for bit-banging.
+        :param pins: 移位寄存器输出序号 (RS, E, 背光, D4, D5, D6, D7)，默认与常见的 SPI 转接板一致
+        The shift register outputs of (RS, E, backlight, D4, D5, D6, D7), matching common SPI backpacks by default.
+        :param backlight: 是否点亮背光
+        Whether the backlight is on.
+        :param run_length: 预先生成字节序列的最大字符数
+        The maximum number of characters in one pre-built sequence.
+        :param write_delay_us: 每个字节发送后的等待时间（微秒）
+        The delay after each byte in microseconds.
+        """
+        if spi is None and (data is None or clock is None):
+            raise ValueError("Invalid shift register connection. Provide an SPI object or both data and clock pins.")
+        self.latch = latch.value
+        self.spi = spi
+        self.data = data.value if data is not None else None
+        self.clock = clock.value if clock is not None else None
+        self.bits = 4  # 74HC595 只有8个输出，只能使用4位模式
+        self.can_read = False  # RW 接地，不能读取忙标志
+        self.rs_bit = 1 << pins[0]
+        self.e_bit = 1 << pins[1]
+        self.backlight_bit = 1 << pins[2]
+        data_bits = [1 << pin for pin in pins[3:]]
+        # 16种半字节对应的移位寄存器数据位
+        self.nibbles = tuple(self.register_bits(data_bits, n) for n in range(16))
+        self.rs_level = 0
+        self.backlight = backlight
+        self.control = self.backlight_bit if backlight else 0  # 当前 RS 和背光位
+        self.busy_polling = False
+        self.write_delay_us = write_delay_us
+        # 延时函数，统计开启时被替换为计数的版本
+        self.sleep_us = time.sleep_us
+        self.run_length = run_length
+        # 预先分配的字节序列缓冲区，每个字符4个字节，并为硬件 SPI 预先生成每个字节的视图
+        self.run_buf = bytearray(4 * run_length)
+        mv = memoryview(self.run_buf)
+        self.views = [mv[i:i + 1] for i in range(len(self.run_buf))]
+        self.skipped_writes = 0
+        self.level = None  # 最后锁存的字节，None 表示未知
+        self.latch(0)
+        if self.clock is not None:
+            self.clock(0)
+        self.resync()
+
+    # 重新锁存输出并刷新输出记录
+    def resync(self):
+        """
+        把移位寄存器输出重新锁存为当前的 RS 和背光位，其他驱动程序使用过同一移位寄存器后调用，由 LCD1602.init_lcd_write() 调用
+        Latch the current RS and backlight bits into the shift register again. Needed after another driver
+        has used the same shift register. Called by LCD1602.init_lcd_write().
+        """
+        self.level = None
+        self.send_buf(1, self.control)
+
+    # 计算半字节对应的移位寄存器数据位
+    def register_bits(self, data_bits, value):
+        """
+        计算半字节各位对应的移位寄存器数据位
+        Get the shift register data bits for a nibble.
+        """
+        bits = 0
+        for i in range(4):
+            if (value >> i) & 1:
+                bits |= data_bits[i]
+        return bits
+
+    # 软件移位输出一个字节
+    def shift_byte(self, value):
+        """
+        通过 Pin 软件移位输出一个字节，高位在前
+        Bit-bang a byte through Pin, MSB first.
+        """
+        data = self.data
+        clock = self.clock
+        for i in range(7, -1, -1):
+            data((value >> i) & 1)
+            clock(1)
+            clock(0)
+
+    # 依次移位并锁存缓冲区中的字节
+    def send_buf(self, count, value=None):
+        """
+        依次移位并锁存缓冲区前 count 个字节；指定 value 时只发送这一个字节，与最后锁存的字节相同时跳过
+        Shift out and latch the first count bytes of the buffer. With value, send only that byte,
+        skipping it when it equals the last latched byte.
+        """
+        if value is not None:
+            if value == self.level:
+                self.skipped_writes += 1
+                return
+            self.run_buf[0] = value
+        latch = self.latch
+        delay = self.write_delay_us
+        sleep_us = self.sleep_us
+        run_buf = self.run_buf
+        # 每个字节单独移位并锁存，硬件 SPI 和软件移位分开循环，循环内不再判断
+        if self.spi is not None:
+            write = self.spi.write
+            views = self.views
+            for i in range(count):
+                write(views[i])
+                latch(1)
+                latch(0)
+                # 每个字符的最后一个字节后等待LCD执行完成
+                if delay and i & 3 == 3:
+                    sleep_us(delay)
+        else:
+            shift_byte = self.shift_byte
+            for i in range(count):
+                shift_byte(run_buf[i])
+                latch(1)
+                latch(0)
+                if delay and i & 3 == 3:
+                    sleep_us(delay)
+        if count:
+            self.level = run_buf[count - 1]
+
+    # 设置RS电平，0为命令，1为数据
+    def set_rs(self, level):
+        """
+        设置RS电平，在下一次发送时随移位寄存器字节输出
+        Set the RS level. It is sent together with the next shift register bytes.
+        """
+        self.rs_level = level
+        self.control = (self.rs_bit if level else 0) | (self.backlight_bit if self.backlight else 0)
+
+    # 设置背光开关
+    def set_backlight(self, mode=True):
+        """
+        设置背光开关
+        Turn the backlight on or off.
+        """
+        self.backlight = bool(mode)
+        self.set_rs(self.rs_level)
+        self.send_buf(1, self.control)
+        return True
+
+    # 把一个字节的 E 高/E 低序列写入缓冲区
+    def fill(self, index, value):
+        """
+        把一个字节的高4位和低4位的 E 高/E 低序列写入缓冲区
+        Put the E-high/E-low sequence of a byte's two nibbles into the buffer.
+        """
+        buf = self.run_buf
+        control = self.control
+        e_bit = self.e_bit
+        high = self.nibbles[(value >> 4) & 0x0F] | control
+        low = self.nibbles[value & 0x0F] | control
+        buf[index] = high | e_bit
+        buf[index + 1] = high
+        buf[index + 2] = low | e_bit
+        buf[index + 3] = low
+
+    # 发送一个字节
+    def write(self, value):
+        """
+        发送一个字节，共4个移位寄存器字节
+        Send a byte as 4 shift register bytes.
+        """
+        self.fill(0, value)
+        self.send_buf(4)
+
+    # 连续发送多个字节
+    def write_run(self, buf):
+        """
+        以当前RS电平连续发送多个字节，每 run_length 个字符预先生成一次字节序列
+        Send several bytes with the current RS level, pre-building the sequence for every run_length characters.
+        """
+        fill = self.fill
+        size = len(self.run_buf)
+        index = 0
+        for value in buf:
+            fill(index, value)
+            index += 4
+            if index == size:
+                self.send_buf(index)
+                index = 0
+        if index:
+            self.send_buf(index)
+
+    # 估算写入代价
+    def write_cost(self):
+        """
+        估算每个数据字节和每条地址命令的时间（微秒）：每个字节4个移位寄存器字节，每个按 15 微秒（发送和锁存）估算；
+        RS 随数据字节一起输出，地址命令与数据字节代价相同
+        Estimate the time in microseconds of a data byte and of an address command: 4 shift register bytes
+        per byte at 15 microseconds each to send and latch. RS goes out with the data bytes, so an address
+        command costs the same as a data byte.
+        """
+        data = 4 * 15 + self.write_delay_us
+        return data, data
+
+    # 设置每个字符后的等待时间
+    def set_pulse_delay(self, pulse_us, enable_us=1):
+        """
+        设置每个字符发送后的等待时间；使能脉冲宽度由锁存间隔决定，enable_us 不使用
+        Set the delay after each character. The enable pulse width is set by the latch interval, so enable_us is unused.
+        """
+        self.write_delay_us = pulse_us
+
+    # 把半字节放到 D4-D7 上并发送一次使能脉冲
+    def write_bits(self, value):
+        """
+        把数值的低4位放到 D4-D7 上并发送一次使能脉冲
+        Put the low 4 bits of the value on D4-D7 and pulse the enable pin once.
+        """
+        bits = self.nibbles[value & 0x0F] | self.control
+        self.run_buf[0] = bits | self.e_bit
+        self.run_buf[1] = bits
+        self.send_buf(2)
+
+    # 发送使能脉冲
+    def pulse(self):
+        """
+        保持当前输出发送一次使能脉冲
+        Pulse the enable pin while keeping the current outputs.
+        """
+        self.run_buf[0] = self.control | self.e_bit
+        self.run_buf[1] = self.control
+        self.send_buf(2)
+
+    # 设置是否在每次发送后轮询忙标志
+    def set_busy_polling(self, mode, timeout_us=10000):
+        """
+        RW 接地不能读取忙标志，只能使用固定延时
+        RW is tied to GND, so the busy flag cannot be read and fixed delays are used.
+        """
+        if mode:
+            raise ValueError("Read is not supported. The RW pin of the shift register transport is tied to GND.")
+        self.busy_polling = False
+
+    # 读取一个字节
+    def read(self, rs=0):
+        """
+        RW 接地不能读取
+        RW is tied to GND, so reading is not supported.
+        """
+        raise ValueError("Read is not supported. The RW pin of the shift register transport is tied to GND.")
+
+    # 轮询忙标志
+    def poll_busy(self, timeout_us=10000):
+        """
+        RW 接地不能读取忙标志
+        RW is tied to GND, so the busy flag cannot be polled.
+        """
+        raise ValueError("Read is not supported. The RW pin of the shift register transport is tied to GND.")
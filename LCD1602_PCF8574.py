@@ -0,0 +1,255 @@
+import time
+
+class PCF8574Transport:
+    """
+    MicroPython LCD1602 HD44780 PCF8574 I2C 转接板传输模块
+    MicroPython LCD1602 HD44780 PCF8574 I2C backpack transport.
+    把 RS/RW/E/背光和4位数据打包为扩展器字节，一段连续字符的全部 E 高/E 低序列写入同一个 bytearray，
+    通过一次 i2c.writeto() 发送
+    Packs the RS/RW/E/backlight bits and each nibble into expander bytes. The whole E-high/E-low
+    sequence of a run of characters is built in one bytearray and sent with a single i2c.writeto().
+    记录扩展器最后输出的字节，单独写入的控制字节与之相同时跳过，跳过的次数记录在 skipped_writes 中
+    The last expander byte is remembered, and a standalone control byte equal to it is skipped and
+    counted in skipped_writes.
+    使用方法 Usage:
+        lcd = LCD1602(transport=PCF8574Transport(I2C(0, scl=Pin(1), sda=Pin(0)), 0x27))
+    """
+    def __init__(self, i2c, address=0x27, pins=(0, 1, 2, 3, 4, 5, 6, 7), backlight=True, run_length=40):
+        """
+        :param i2c: machine.I2C 或提供 writeto()/readfrom_into() 的对象
+        A machine.I2C or any object with writeto()/readfrom_into().
+        :param address: PCF8574 的 I2C 地址，常见为 0x27 或 0x3F
+        The I2C address of the PCF8574, usually 0x27 or 0x3F.
+        :param pins: 扩展器引脚序号 (RS, RW, E, 背光, D4, D5, D6, D7)
+        The expander bit numbers of (RS, RW, E, backlight, D4, D5, D6, D7).
+        :param backlight: 是否点亮背光
+        Whether the backlight is on.
+        :param run_length: 一次 writeto() 最多发送的字符数
+        The maximum number of characters sent by one writeto().
+        """
+        self.i2c = i2c
+        self.address = address
+        self.bits = 4  # PCF8574 只有8个输出，只能使用4位模式
+        self.can_read = True
+        self.rs_bit = 1 << pins[0]
+        self.rw_bit = 1 << pins[1]
+        self.e_bit = 1 << pins[2]
+        self.backlight_bit = 1 << pins[3]
+        data_bits = [1 << pin for pin in pins[4:]]
+        # 16种半字节对应的扩展器数据位
+        self.nibbles = tuple(self.expander_bits(data_bits, n) for n in range(16))
+        self.data_mask = self.nibbles[0x0F]
+        self.rs_level = 0
+        self.backlight = backlight
+        self.control = self.backlight_bit if backlight else 0  # 当前 RS 和背光位
+        self.busy_polling = False
+        self.busy_timeout_us = 10000
+        self.run_length = run_length
+        # 预先分配的发送缓冲区，每个字符4个扩展器字节
+        self.byte_buf = bytearray(4)
+        self.pulse_buf = bytearray(2)
+        self.run_buf = bytearray(4 * run_length)
+        self.run_mv = memoryview(self.run_buf)
+        self.ctrl_buf = bytearray(1)
+        self.read_buf = bytearray(1)
+        self.skipped_writes = 0
+        self.level = None  # 扩展器最后输出的字节，None 表示未知
+        # 扩展器输出初始为全部低电平并设置背光
+        self.resync()
+
+    # 重新写入扩展器输出并刷新输出记录
+    def resync(self):
+        """
+        把扩展器输出重新写为当前的 RS 和背光位，其他驱动程序使用过同一扩展器后调用，由 LCD1602.init_lcd_write() 调用
+        Write the current RS and backlight bits to the expander again. Needed after another driver has used
+        the same expander. Called by LCD1602.init_lcd_write().
+        """
+        self.level = None
+        self.write_control(self.control)
+
+    # 计算半字节对应的扩展器数据位
+    def expander_bits(self, data_bits, value):
+        """
+        计算半字节各位对应的扩展器数据位
+        Get the expander data bits for a nibble.
+        """
+        bits = 0
+        for i in range(4):
+            if (value >> i) & 1:
+                bits |= data_bits[i]
+        return bits
+
+    # 直接写入一个扩展器字节
+    def write_control(self, value):
+        """
+        直接向扩展器写入一个字节，与扩展器当前输出相同时跳过
+        Write one byte to the expander, skipping it when the expander already outputs it.
+        """
+        if value == self.level:
+            self.skipped_writes += 1
+            return
+        self.ctrl_buf[0] = value
+        self.i2c.writeto(self.address, self.ctrl_buf)
+        self.level = value
+
+    # 设置RS电平，0为命令，1为数据
+    def set_rs(self, level):
+        """
+        设置RS电平，在下一次发送时随扩展器字节输出
+        Set the RS level. It is sent together with the next expander bytes.
+        """
+        self.rs_level = level
+        self.control = (self.rs_bit if level else 0) | (self.backlight_bit if self.backlight else 0)
+
+    # 设置背光开关
+    def set_backlight(self, mode=True):
+        """
+        设置背光开关
+        Turn the backlight on or off.
+        """
+        self.backlight = bool(mode)
+        self.set_rs(self.rs_level)
+        self.write_control(self.control)
+        return True
+
+    # 把一个字节的 E 高/E 低序列写入缓冲区
+    def fill(self, buf, index, value):
+        """
+        把一个字节的高4位和低4位的 E 高/E 低序列写入缓冲区
+        Put the E-high/E-low sequence of a byte's two nibbles into the buffer.
+        """
+        control = self.control
+        e_bit = self.e_bit
+        high = self.nibbles[(value >> 4) & 0x0F] | control
+        low = self.nibbles[value & 0x0F] | control
+        buf[index] = high | e_bit
+        buf[index + 1] = high
+        buf[index + 2] = low | e_bit
+        buf[index + 3] = low
+
+    # 发送一个字节
+    def write(self, value):
+        """
+        发送一个字节，一次 writeto() 包含4个扩展器字节
+        Send a byte. One writeto() carries 4 expander bytes.
+        """
+        self.fill(self.byte_buf, 0, value)
+        self.i2c.writeto(self.address, self.byte_buf)
+        self.level = self.byte_buf[3]
+        if self.busy_polling:
+            self.poll_busy(self.busy_timeout_us)
+
+    # 连续发送多个字节
+    def write_run(self, buf):
+        """
+        以当前RS电平连续发送多个字节，每 run_length 个字符合并为一次 writeto()
+        Send several bytes with the current RS level, merging every run_length characters into one writeto().
+        """
+        run_buf = self.run_buf
+        fill = self.fill
+        index = 0
+        for value in buf:
+            fill(run_buf, index, value)
+            index += 4
+            if index == len(run_buf):
+                self.i2c.writeto(self.address, run_buf)
+                index = 0
+        if index:
+            self.i2c.writeto(self.address, self.run_mv[:index])
+        if buf:
+            self.level = run_buf[index - 1 if index else len(run_buf) - 1]
+        if self.busy_polling:
+            self.poll_busy(self.busy_timeout_us)
+
+    # 估算写入代价
+    def write_cost(self):
+        """
+        估算每个数据字节和每条地址命令的时间（微秒），按 100kHz 时每个 I2C 字节 90 微秒估算。
+        每个数据字节是4个扩展器字节；地址命令另需一次 writeto()，之后的数据再开始一次 writeto()
+        Estimate the time in microseconds of a data byte and of an address command, at 90 microseconds per
+        I2C byte at 100kHz. A data byte is 4 expander bytes. An address command needs its own writeto(), and
+        the data after it starts another writeto().
+        """
+        data = 4 * 90
+        return data, data + 2 * 90
+
+    # 把半字节放到 D4-D7 上并发送一次使能脉冲
+    def write_bits(self, value):
+        """
+        把数值的低4位放到 D4-D7 上并发送一次使能脉冲
+        Put the low 4 bits of the value on D4-D7 and pulse the enable pin once.
+        """
+        bits = self.nibbles[value & 0x0F] | self.control
+        self.pulse_buf[0] = bits | self.e_bit
+        self.pulse_buf[1] = bits
+        self.i2c.writeto(self.address, self.pulse_buf)
+        self.level = bits
+
+    # 发送使能脉冲
+    def pulse(self):
+        """
+        保持当前输出发送一次使能脉冲
+        Pulse the enable pin while keeping the current outputs.
+        """
+        self.pulse_buf[0] = self.control | self.e_bit
+        self.pulse_buf[1] = self.control
+        self.i2c.writeto(self.address, self.pulse_buf)
+        self.level = self.control
+
+    # 设置是否在每次发送后轮询忙标志
+    def set_busy_polling(self, mode, timeout_us=10000):
+        """
+        设置是否在每次发送后轮询忙标志，I2C 传输本身较慢，通常不需要开启
+        Set whether to poll the busy flag after each write. I2C is slow enough that this is rarely needed.
+        """
+        self.busy_polling = bool(mode)
+        self.busy_timeout_us = timeout_us
+
+    # 在读取状态下读取一个字节
+    def read_value(self, control):
+        """
+        在读取状态下读取一个字节，先高4位后低4位
+        Read a byte while in the read state, high nibble first.
+        """
+        value = 0
+        for shift in (4, 0):
+            self.write_control(control | self.e_bit)
+            self.i2c.readfrom_into(self.address, self.read_buf)
+            self.write_control(control)
+            nibble = 0
+            for i in range(4):
+                if self.read_buf[0] & self.nibbles[1 << i]:
+                    nibble |= 1 << i
+            value |= nibble << shift
+        return value
+
+    # 读取一个字节
+    def read(self, rs=0):
+        """
+        读取一个字节，RS为0时读取忙标志和地址计数器，RS为1时读取数据
+        Read a byte. With RS low it reads the busy flag and address counter, with RS high it reads data.
+        """
+        # 准双向口需先输出高电平才能读取
+        control = self.data_mask | self.rw_bit | (self.rs_bit if rs else 0) | (self.backlight_bit if self.backlight else 0)
+        try:
+            return self.read_value(control)
+        finally:
+            self.write_control(self.control)
+
+    # 轮询忙标志直到空闲，返回地址计数器
+    def poll_busy(self, timeout_us=10000):
+        """
+        轮询忙标志直到空闲，超时抛出 ValueError
+        Poll the busy flag until idle, raising ValueError on timeout.
+        """
+        control = self.data_mask | self.rw_bit | (self.backlight_bit if self.backlight else 0)
+        start = time.ticks_us()
+        try:
+            while True:
+                value = self.read_value(control)
+                if not value & 0x80:
+                    return value & 0x7F
+                if time.ticks_diff(time.ticks_us(), start) > timeout_us:
+                    raise ValueError("Busy flag timeout. Please check the I2C backpack connection.")
+        finally:
+            self.write_control(self.control)
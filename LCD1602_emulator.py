@@ -0,0 +1,638 @@
+import sys
+import time
+
+# ########################################
+# LCD1602 HD44780 软件仿真模块
+# 代替 machine.Pin / machine.PWM / machine.Timer，在 Linux 上按引脚电平逐周期解码 HD44780 的行为，
+# 用于在没有开发板时运行、测试和测量 LCD1602.py
+# Software emulation of the HD44780 that stands in for machine.Pin / machine.PWM / machine.Timer and
+# decodes the pin levels cycle by cycle, so LCD1602.py can run, be tested and be measured on Linux.
+#
+# 使用方法 Usage:
+#     import LCD1602_emulator
+#     emu = LCD1602_emulator.install()   # 须在导入 LCD1602 之前调用
+#     from LCD1602 import LCD1602
+#     lcd = LCD1602()
+#     lcd.print_line("Hello", 0)
+#     print(emu.lines())
+#
+
+# LCD1602 默认引脚连接，与 LCD1602.py 的默认配置一致
+DEFAULT_PINS = {"RS": 2, "RW": 3, "E": 4, "D4": 5, "D5": 6, "D6": 7, "D7": 8}
+
+# HD44780 指令执行时间（纳秒），按 270kHz 振荡频率
+EXEC_TIME_NS = 37000
+CLEAR_HOME_TIME_NS = 1520000
+# 上电后须等待的时间，以及上电后第一次功能设置须等待的时间（纳秒）
+POWER_ON_TIME_NS = 15000000
+FIRST_FUNCTION_SET_TIME_NS = 4100000
+
+
+class VirtualClock:
+    """
+    虚拟时钟，代替 time.sleep_us / time.ticks_us 等函数，时间只随延时和引脚访问前进。
+    时间经过仿真定时器的到期时刻时，按时间顺序调用定时器回调
+    A virtual clock that replaces time.sleep_us / time.ticks_us and friends.
+    Time only advances through sleeps and pin accesses. When time passes the due time of an emulated timer,
+    the timer callbacks are called in time order.
+    """
+    def __init__(self):
+        self.now_ns = 0
+        self.timers = []  # 运行中的仿真定时器
+        self.firing = False  # 是否正在调用定时器回调，回调中的时间前进不再触发定时器
+
+    # 时间前进指定纳秒
+    def advance(self, ns):
+        end = self.now_ns + ns
+        while self.timers and not self.firing:
+            timer = min(self.timers, key=lambda t: t.due_ns)
+            if timer.due_ns > end:
+                break
+            self.now_ns = max(self.now_ns, timer.due_ns)
+            self.firing = True
+            try:
+                timer.fire()
+            finally:
+                self.firing = False
+        self.now_ns = max(self.now_ns, end)
+
+    def sleep(self, seconds):
+        self.advance(int(seconds * 1000000000))
+
+    def sleep_ms(self, ms):
+        self.advance(int(ms) * 1000000)
+
+    def sleep_us(self, us):
+        self.advance(int(us) * 1000)
+
+    def ticks_ms(self):
+        return self.now_ns // 1000000
+
+    def ticks_us(self):
+        return self.now_ns // 1000
+
+    def ticks_cpu(self):
+        return self.now_ns
+
+    def ticks_diff(self, ticks1, ticks2):
+        return ticks1 - ticks2
+
+    def ticks_add(self, ticks, delta):
+        return ticks + delta
+
+
+class Board:
+    """
+    仿真的开发板GPIO，记录每个GPIO的方向、MCU输出电平、LCD驱动电平和PWM占空比
+    The emulated board GPIOs. Records the direction, MCU output level, LCD driven level and PWM duty of each GPIO.
+    """
+    def __init__(self, pin_access_ns=2000):
+        """
+        :param pin_access_ns: 每次 Pin.value() 调用消耗的时间（纳秒），用于模拟MCU执行开销
+        The time in nanoseconds consumed by each Pin.value() call, modeling the MCU overhead.
+        """
+        self.clock = VirtualClock()
+        self.pin_access_ns = pin_access_ns
+        self.levels = {}  # MCU输出电平
+        self.modes = {}  # 引脚方向
+        self.driven = {}  # 读取时由LCD驱动的电平
+        self.pwm = {}  # PWM占空比
+        self.listeners = {}  # 电平变化回调
+        self.pin_writes = 0
+        self.pin_reads = 0
+
+    # 注册引脚电平变化回调
+    def listen(self, gpio, callback):
+        self.listeners.setdefault(gpio, []).append(callback)
+
+    # MCU写入引脚电平
+    def write(self, gpio, level):
+        self.clock.advance(self.pin_access_ns)
+        self.pin_writes += 1
+        level = 1 if level else 0
+        old = self.levels.get(gpio, 0)
+        self.levels[gpio] = level
+        if old != level:
+            for callback in self.listeners.get(gpio, ()):
+                callback(gpio, level)
+
+    # MCU读取引脚电平
+    def read(self, gpio):
+        self.clock.advance(self.pin_access_ns)
+        self.pin_reads += 1
+        if self.modes.get(gpio) == EmulatedPin.IN and gpio in self.driven:
+            return self.driven[gpio]
+        return self.levels.get(gpio, 0)
+
+
+class EmulatedPin:
+    """
+    代替 machine.Pin 的仿真引脚
+    An emulated pin that stands in for machine.Pin.
+    """
+    IN = 0
+    OUT = 1
+    OPEN_DRAIN = 2
+    PULL_UP = 1
+    PULL_DOWN = 2
+    IRQ_RISING = 1
+    IRQ_FALLING = 2
+
+    def __init__(self, id, mode=-1, pull=-1, value=None):
+        self.id = id
+        self.board = BOARD
+        self.init(mode, pull, value)
+
+    def init(self, mode=-1, pull=-1, value=None):
+        if mode != -1:
+            self.board.modes[self.id] = mode
+        if value is not None:
+            self.board.write(self.id, value)
+
+    def value(self, level=None):
+        if level is None:
+            return self.board.read(self.id)
+        self.board.write(self.id, level)
+
+    def on(self):
+        self.value(1)
+
+    def off(self):
+        self.value(0)
+
+    def __call__(self, level=None):
+        return self.value(level)
+
+    def __repr__(self):
+        return f"Pin({self.id})"
+
+
+class EmulatedPWM:
+    """
+    代替 machine.PWM 的仿真PWM，记录频率和占空比
+    An emulated PWM that stands in for machine.PWM and records the frequency and duty.
+    """
+    def __init__(self, pin, freq=1000, duty_u16=0):
+        self.pin = pin
+        self.board = pin.board
+        self.writes = 0
+        self._freq = freq
+        self.duty_u16(duty_u16)
+
+    def freq(self, value=None):
+        if value is None:
+            return self._freq
+        self._freq = value
+
+    def duty_u16(self, value=None):
+        if value is None:
+            return self.board.pwm.get(self.pin.id, 0)
+        self.writes += 1
+        self.board.clock.advance(self.board.pin_access_ns)
+        self.board.pwm[self.pin.id] = value
+
+    def deinit(self):
+        self.board.pwm.pop(self.pin.id, None)
+
+    def __repr__(self):
+        return f"PWM({self.pin})"
+
+
+class EmulatedTimer:
+    """
+    代替 machine.Timer 的仿真定时器，按虚拟时钟到期调用回调
+    An emulated timer that stands in for machine.Timer and calls its callback on the virtual clock.
+    """
+    ONE_SHOT = 0
+    PERIODIC = 1
+
+    def __init__(self, id=-1, **kwargs):
+        self.id = id
+        self.clock = BOARD.clock
+        self.mode = self.PERIODIC
+        self.period_ns = 0
+        self.due_ns = 0
+        self.callback = None
+        if kwargs:
+            self.init(**kwargs)
+
+    def init(self, mode=PERIODIC, period=-1, callback=None, freq=None):
+        self.deinit()
+        self.mode = mode
+        self.period_ns = 1000000000 // freq if freq else max(1, period) * 1000000
+        self.due_ns = self.clock.now_ns + self.period_ns
+        self.callback = callback
+        self.clock.timers.append(self)
+
+    def deinit(self):
+        if self in self.clock.timers:
+            self.clock.timers.remove(self)
+
+    # 到期时调用回调
+    def fire(self):
+        if self.mode == self.PERIODIC:
+            self.due_ns += self.period_ns
+        else:
+            self.deinit()
+        if self.callback is not None:
+            self.callback(self)
+
+    def __repr__(self):
+        return f"Timer({self.id})"
+
+
+class EmulatedPort:
+    """
+    代替 machine.mem32 的仿真GPIO端口寄存器，置位/清零/翻转写入转换为各GPIO的电平变化
+    Emulated GPIO port registers standing in for machine.mem32. Set/clear/XOR writes become GPIO level changes.
+    """
+    def __init__(self, board, first=0, last=31):
+        self.board = board
+        self.first = first
+        self.last = last
+        self.set_addr = 0x14
+        self.clr_addr = 0x18
+        self.xor_addr = 0x1C
+        self.writes = 0
+
+    def __setitem__(self, address, value):
+        self.writes += 1
+        board = self.board
+        board.clock.advance(board.pin_access_ns)
+        for gpio in range(self.first, self.last + 1):
+            bit = (value >> (gpio - self.first)) & 1
+            if not bit:
+                continue
+            level = board.levels.get(gpio, 0)
+            if address == self.set_addr:
+                level = 1
+            elif address == self.clr_addr:
+                level = 0
+            elif address == self.xor_addr:
+                level ^= 1
+            else:
+                raise ValueError(f"Invalid register address: {address:#x}.")
+            # 端口写入不计入 Pin.value() 次数
+            if board.levels.get(gpio, 0) != level:
+                board.levels[gpio] = level
+                for callback in board.listeners.get(gpio, ()):
+                    callback(gpio, level)
+
+    def __getitem__(self, address):
+        value = 0
+        for gpio in range(self.first, self.last + 1):
+            value |= self.board.levels.get(gpio, 0) << (gpio - self.first)
+        return value
+
+    # 获取可传给 LCD1602.set_gpio_port() 的端口描述
+    def port(self):
+        return {"mem": self, "set": self.set_addr, "clr": self.clr_addr, "xor": self.xor_addr, "first": self.first, "last": self.last}
+
+
+class HD44780Emulator:
+    """
+    HD44780 控制器仿真
+    HD44780 controller emulation.
+    在 E 下降沿按 RS/RW 电平和4位/8位模式的半字节配对解码指令和数据，维护 DDRAM、CGRAM、地址计数器、
+    输入模式、显示移位等状态，并记录时序违规，例如忙标志未清除时发送指令
+    Decodes instructions and data on the falling edge of E from the RS/RW levels and the 4-bit/8-bit nibble pairing,
+    keeps DDRAM, CGRAM, the address counter, entry mode and display shift, and records timing violations
+    such as an instruction sent while the busy flag is still set.
+    """
+    def __init__(self, board=None, pins=None, strict=False):
+        """
+        :param board: 仿真开发板，默认为 install() 创建的开发板
+        The emulated board, defaults to the one created by install().
+        :param pins: LCD引脚名称到GPIO编号的字典，默认为 DEFAULT_PINS
+        A dict of LCD pin names to GPIO numbers, defaults to DEFAULT_PINS.
+        :param strict: 出现时序违规时是否立即抛出 ValueError
+        Whether to raise ValueError as soon as a timing violation happens.
+        """
+        self.board = board if board is not None else BOARD
+        self.clock = self.board.clock
+        self.strict = strict
+        self.pins = {}
+        self.violations = []
+        self.stats = {}
+        self.reset_stats()
+        self.power_on()
+        self.connect(pins if pins is not None else DEFAULT_PINS)
+
+    # 连接LCD引脚到GPIO
+    def connect(self, pins):
+        """
+        把LCD引脚连接到仿真开发板的GPIO，之后 E 引脚的电平变化会驱动仿真
+        Connect the LCD pins to the board GPIOs. Level changes on E then drive the emulation.
+        """
+        if "E" in self.pins:
+            callbacks = self.board.listeners.get(self.pins["E"], [])
+            if self.on_enable in callbacks:
+                callbacks.remove(self.on_enable)
+        self.pins = dict(pins)
+        self.board.listen(self.pins["E"], self.on_enable)
+        return True
+
+    # 上电复位
+    def power_on(self):
+        """
+        上电复位：8位模式、1行显示、显示关闭、AC自动加1、DDRAM清空
+        Power-on reset: 8-bit mode, 1 line, display off, increment, DDRAM cleared.
+        """
+        self.ddram = bytearray(b" " * 0x80)
+        self.cgram = bytearray(64)
+        self.ac = 0
+        self.cg_mode = False  # 地址计数器当前指向CGRAM
+        self.increment = True
+        self.entry_shift = False
+        self.display = False
+        self.cursor = False
+        self.blink = False
+        self.data_8bits = True
+        self.lines_2 = False
+        self.font_5x10 = False
+        self.shift = 0  # 显示移位量，左移为正
+        self.pending_nibble = None  # 4位模式下已接收的高4位
+        self.read_nibble = 0  # 4位模式读取时的半字节序号
+        self.read_value = 0
+        self.function_sets = 0
+        self.power_on_ns = self.clock.now_ns
+        self.busy_until_ns = self.clock.now_ns + POWER_ON_TIME_NS
+        return True
+
+    # 清零统计计数
+    def reset_stats(self):
+        for key in ["e_pulses", "nibbles", "commands", "data", "reads", "busy_reads", "cell_changes"]:
+            self.stats[key] = 0
+        return True
+
+    # 记录时序违规
+    def violation(self, message):
+        message = f"{self.clock.now_ns / 1000:.1f}us: {message}"
+        self.violations.append(message)
+        if self.strict:
+            raise ValueError(message)
+
+    # 是否处于忙状态
+    def busy(self):
+        return self.clock.now_ns < self.busy_until_ns
+
+    # 读取LCD引脚电平
+    def level(self, name):
+        if name not in self.pins:
+            return 0
+        return self.board.levels.get(self.pins[name], 0)
+
+    # E 引脚电平变化回调
+    def on_enable(self, gpio, level):
+        if self.level("RW"):
+            if level:
+                self.begin_read()
+            else:
+                self.end_read()
+            return
+        if level:
+            return
+        # E 下降沿锁存写入的数据
+        self.stats["e_pulses"] += 1
+        rs = self.level("RS")
+        self.check_bus_direction()
+        if self.data_8bits:
+            value = 0
+            for i in range(8):
+                value |= self.level(f"D{i}") << i
+            self.execute(rs, value)
+        else:
+            self.stats["nibbles"] += 1
+            nibble = 0
+            for i in range(4):
+                nibble |= self.level(f"D{i + 4}") << i
+            if self.pending_nibble is None:
+                self.pending_nibble = nibble
+            else:
+                value = (self.pending_nibble << 4) | nibble
+                self.pending_nibble = None
+                self.execute(rs, value)
+
+    # 检查写入时数据引脚是否为输出
+    def check_bus_direction(self):
+        for name in ["D0", "D1", "D2", "D3", "D4", "D5", "D6", "D7"]:
+            if name in self.pins and self.board.modes.get(self.pins[name]) == EmulatedPin.IN:
+                self.violation(f"Write while {name} is an input.")
+                return
+
+    # 读取周期开始，LCD驱动数据线
+    def begin_read(self):
+        board = self.board
+        for name in ["D0", "D1", "D2", "D3", "D4", "D5", "D6", "D7"]:
+            if name in self.pins and board.modes.get(self.pins[name]) != EmulatedPin.IN:
+                self.violation(f"Bus contention: {name} is an output during a read.")
+                break
+        if self.read_nibble == 0:
+            if self.level("RS"):
+                self.stats["reads"] += 1
+                memory = self.cgram if self.cg_mode else self.ddram
+                self.read_value = memory[self.ac & (0x3F if self.cg_mode else 0x7F)]
+            else:
+                self.stats["busy_reads"] += 1
+                self.read_value = (0x80 if self.busy() else 0) | (self.ac & 0x7F)
+        if self.data_8bits:
+            for i in range(8):
+                self.drive(f"D{i}", (self.read_value >> i) & 1)
+        else:
+            nibble = self.read_value >> 4 if self.read_nibble == 0 else self.read_value & 0x0F
+            for i in range(4):
+                self.drive(f"D{i + 4}", (nibble >> i) & 1)
+
+    # 读取周期结束
+    def end_read(self):
+        if not self.data_8bits and self.read_nibble == 0:
+            self.read_nibble = 1
+            return
+        self.read_nibble = 0
+        # 读取数据后AC自动计数
+        if self.level("RS"):
+            if self.busy():
+                self.violation("Data read while busy.")
+            self.step_address()
+            self.busy_until_ns = self.clock.now_ns + EXEC_TIME_NS
+
+    # LCD驱动一根数据线
+    def drive(self, name, level):
+        if name in self.pins:
+            self.board.driven[self.pins[name]] = level
+
+    # 执行一条指令或写入一个数据
+    def execute(self, rs, value):
+        if self.busy():
+            kind = "Data" if rs else f"Instruction {value:#04x}"
+            self.violation(f"{kind} sent while the busy flag is set ({(self.busy_until_ns - self.clock.now_ns) / 1000:.1f}us left).")
+        duration = EXEC_TIME_NS
+        if rs:
+            self.stats["data"] += 1
+            self.write_data(value)
+        else:
+            self.stats["commands"] += 1
+            duration = self.execute_command(value)
+        self.busy_until_ns = self.clock.now_ns + duration
+
+    # 执行一条指令，返回执行时间
+    def execute_command(self, value):
+        if value & 0x80:
+            self.cg_mode = False
+            self.ac = value & 0x7F
+        elif value & 0x40:
+            self.cg_mode = True
+            self.ac = value & 0x3F
+        elif value & 0x20:
+            self.data_8bits = bool(value & 0x10)
+            self.lines_2 = bool(value & 0x08)
+            self.font_5x10 = bool(value & 0x04)
+            self.function_sets += 1
+            # 上电后第一次功能设置须等待≥4.1ms
+            if self.function_sets == 1:
+                return FIRST_FUNCTION_SET_TIME_NS
+        elif value & 0x10:
+            right = bool(value & 0x04)
+            if value & 0x08:
+                self.shift += -1 if right else 1
+                self.shift %= 40
+            else:
+                self.step_address(right)
+        elif value & 0x08:
+            self.display = bool(value & 0x04)
+            self.cursor = bool(value & 0x02)
+            self.blink = bool(value & 0x01)
+        elif value & 0x04:
+            self.increment = bool(value & 0x02)
+            self.entry_shift = bool(value & 0x01)
+        elif value & 0x02:
+            self.cg_mode = False
+            self.ac = 0
+            self.shift = 0
+            return CLEAR_HOME_TIME_NS
+        elif value & 0x01:
+            for row in range(2):
+                for column in range(16):
+                    if self.ddram[self.visible_address(row, column)] != 0x20:
+                        self.stats["cell_changes"] += 1
+            self.ddram[:] = b" " * 0x80
+            self.cg_mode = False
+            self.ac = 0
+            self.shift = 0
+            self.increment = True
+            return CLEAR_HOME_TIME_NS
+        return EXEC_TIME_NS
+
+    # 写入数据到DDRAM或CGRAM
+    def write_data(self, value):
+        if self.cg_mode:
+            self.cgram[self.ac & 0x3F] = value
+        else:
+            address = self.ac & 0x7F
+            if self.ddram[address] != value and self.is_visible(address):
+                self.stats["cell_changes"] += 1
+            self.ddram[address] = value
+            if self.entry_shift:
+                self.shift += 1 if self.increment else -1
+                self.shift %= 40
+        self.step_address()
+
+    # 地址计数器按输入模式或指定方向前进一格
+    def step_address(self, increase=None):
+        if increase is None:
+            increase = self.increment
+        if self.cg_mode:
+            self.ac = (self.ac + (1 if increase else -1)) & 0x3F
+        elif self.lines_2:
+            if increase:
+                self.ac = {0x27: 0x40, 0x67: 0x00}.get(self.ac, self.ac + 1)
+            else:
+                self.ac = {0x00: 0x67, 0x40: 0x27}.get(self.ac, self.ac - 1)
+        else:
+            self.ac = (self.ac + (1 if increase else -1)) % 0x50
+
+    # 获取屏幕指定位置对应的DDRAM地址
+    def visible_address(self, row, column):
+        return row * 0x40 + (column + self.shift) % 40
+
+    # DDRAM地址当前是否显示在屏幕上
+    def is_visible(self, address, width=16):
+        row = 1 if address >= 0x40 else 0
+        column = (address - row * 0x40 - self.shift) % 40
+        return address - row * 0x40 < 40 and column < width
+
+    # 获取DDRAM一行40个单元的内容
+    def ddram_row(self, row):
+        """
+        获取DDRAM一行40个单元的内容
+        Get the 40 DDRAM cells of a row.
+        """
+        return bytes(self.ddram[row * 0x40:row * 0x40 + 40])
+
+    # 获取屏幕当前可见的内容
+    def lines(self, width=16):
+        """
+        获取考虑显示移位后屏幕当前可见的两行内容
+        Get the two visible lines, taking the display shift into account.
+        """
+        result = []
+        for row in range(2):
+            result.append("".join(chr(self.ddram[self.visible_address(row, column)]) for column in range(width)))
+        return result
+
+    # 获取对比度或背光的PWM占空比
+    def pwm_duty(self, gpio):
+        return self.board.pwm.get(gpio)
+
+
+# 仿真开发板，install() 时创建
+BOARD = Board()
+# install() 替换前的 time 模块函数
+saved_time_functions = {}
+
+
+# 安装仿真环境
+def install(pins=None, pin_access_ns=2000, strict=False):
+    """
+    创建仿真开发板，注册 machine 模块并用虚拟时钟替换 time 模块的 MicroPython 函数，须在导入 LCD1602 之前调用
+    Create the emulated board, register a machine module and replace the MicroPython time functions
+    with the virtual clock. Must be called before importing LCD1602.
+    :param pins: LCD引脚名称到GPIO编号的字典，默认为 DEFAULT_PINS
+    A dict of LCD pin names to GPIO numbers, defaults to DEFAULT_PINS.
+    :param pin_access_ns: 每次 Pin.value() 调用消耗的时间（纳秒）
+    The time in nanoseconds consumed by each Pin.value() call.
+    :param strict: 出现时序违规时是否立即抛出 ValueError
+    Whether to raise ValueError as soon as a timing violation happens.
+    :return: HD44780 仿真对象
+    Returns the HD44780 emulator.
+    """
+    global BOARD
+    BOARD = Board(pin_access_ns)
+    machine = type(sys)("machine")
+    machine.Pin = EmulatedPin
+    machine.PWM = EmulatedPWM
+    machine.Timer = EmulatedTimer
+    machine.mem32 = EmulatedPort(BOARD)
+    sys.modules["machine"] = machine
+    clock = BOARD.clock
+    for name in ["sleep", "sleep_ms", "sleep_us", "ticks_ms", "ticks_us", "ticks_cpu", "ticks_diff", "ticks_add"]:
+        if name not in saved_time_functions:
+            saved_time_functions[name] = getattr(time, name, None)
+        setattr(time, name, getattr(clock, name))
+    return HD44780Emulator(BOARD, pins, strict)
+
+
+# 卸载仿真环境
+def uninstall():
+    """
+    恢复 time 模块并移除仿真的 machine 模块
+    Restore the time module and remove the emulated machine module.
+    """
+    for name, function in saved_time_functions.items():
+        if function is None:
+            delattr(time, name)
+        else:
+            setattr(time, name, function)
+    saved_time_functions.clear()
+    sys.modules.pop("machine", None)
+    return True
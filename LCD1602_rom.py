@@ -0,0 +1,119 @@
+# ########################################
+# LCD1602 MicroPython 直连控制库
+# HD44780 字符 ROM 编码表
+# HD44780 character ROM code tables.
+#
+# A00 为日文 ROM（ASCII、半角片假名和部分希腊字母/符号），A02 为欧洲 ROM（ASCII、西欧字母、西里尔和希腊字母）
+# A00 is the Japanese ROM (ASCII, half-width katakana and some Greek letters and symbols),
+# A02 is the European ROM (ASCII, Western European, Cyrillic and Greek letters).
+# compile_rom() 把编码表、替代字符和半角片假名映射编译为一个查找表，由 LCD1602.set_rom_code() 调用
+# compile_rom() compiles a code table, the fallback substitutions and the katakana mapping into one
+# lookup table. It is called by LCD1602.set_rom_code().
+
+# A00 日文 ROM 中与 ASCII 不同的字符 Characters of the A00 Japanese ROM outside ASCII
+ROM_A00 = {
+    "¥": 0x5C, "→": 0x7E, "←": 0x7F,
+    "。": 0xA1, "「": 0xA2, "」": 0xA3, "、": 0xA4, "・": 0xA5, "·": 0xA5,
+    "゛": 0xDE, "゜": 0xDF, "°": 0xDF,
+    "α": 0xE0, "ä": 0xE1, "β": 0xE2, "ß": 0xE2, "ε": 0xE3, "μ": 0xE4, "µ": 0xE4,
+    "σ": 0xE5, "ρ": 0xE6, "√": 0xE8, "¢": 0xEC, "£": 0xED, "ñ": 0xEE, "ö": 0xEF,
+    "θ": 0xF2, "∞": 0xF3, "Ω": 0xF4, "ü": 0xF5, "Σ": 0xF6, "π": 0xF7,
+    "千": 0xFA, "万": 0xFB, "円": 0xFC, "÷": 0xFD, "█": 0xFF, "■": 0xFF,
+}
+
+# A02 欧洲 ROM 中与 ASCII 不同的字符，0xA0-0xFF 与 ISO 8859-1 相同
+# Characters of the A02 European ROM outside ASCII. 0xA0-0xFF match ISO 8859-1.
+ROM_A02 = {
+    "▶": 0x10, "◀": 0x11, "“": 0x12, "”": 0x13, "●": 0x16,
+    "↑": 0x18, "↓": 0x19, "→": 0x1A, "←": 0x1B, "≤": 0x1C, "≥": 0x1D, "▲": 0x1E, "▼": 0x1F,
+    "Б": 0x80, "Д": 0x81, "Ж": 0x82, "З": 0x83, "И": 0x84, "Й": 0x85, "Л": 0x86, "П": 0x87,
+    "У": 0x88, "Ц": 0x89, "Ч": 0x8A, "Ш": 0x8B, "Щ": 0x8C, "Ъ": 0x8D, "Ы": 0x8E, "Э": 0x8F,
+    "α": 0x90, "♪": 0x91, "Γ": 0x92, "π": 0x93, "Σ": 0x94, "σ": 0x95, "τ": 0x97,
+    "Θ": 0x99, "Ω": 0x9A, "δ": 0x9B, "∞": 0x9C, "♥": 0x9D, "ε": 0x9E, "∩": 0x9F,
+}
+
+# ROM 中没有的字符的替代字符 Substitutions for characters that are not in the ROM
+FALLBACK = {
+    "“": '"', "”": '"', "„": '"', "‘": "'", "’": "'", "‚": "'",
+    "–": "-", "—": "-", "…": "...", "•": ".", "×": "x",
+    "↑": "^", "↓": "v", "■": "#", "█": "#", "°": "o", "¥": "Y", "£": "L", "¢": "c",
+}
+
+# A00 的 0x5C 和 0x7E 显示为 ¥ 和 →，ASCII 的 \ 和 ~ 需要替代字符；需要原样显示时可用 LCD1602.define_glyph() 定义
+# A00 shows ¥ and → at 0x5C and 0x7E, so the ASCII \ and ~ need substitutions. Define them with
+# LCD1602.define_glyph() to show the real glyphs.
+FALLBACK_A00 = {"\\": "/", "~": "-"}
+
+# 带重音符号的字母替代为基本字母 Accented letters fall back to the base letter
+ACCENTS = (
+    ("ÀÁÂÃÄÅ", "A"), ("àáâãäå", "a"), ("Ç", "C"), ("ç", "c"), ("ÈÉÊË", "E"), ("èéêë", "e"),
+    ("ÌÍÎÏ", "I"), ("ìíîï", "i"), ("Ñ", "N"), ("ñ", "n"), ("ÒÓÔÕÖØ", "O"), ("òóôõöø", "o"),
+    ("ÙÚÛÜ", "U"), ("ùúûü", "u"), ("Ý", "Y"), ("ýÿ", "y"), ("ß", "ss"),
+)
+
+# 全角片假名，依次对应半角片假名 0xA6-0xDD
+# Full-width katakana in the order of the half-width codes 0xA6-0xDD
+KATAKANA = "ヲァィゥェォャュョッーアイウエオカキクケコサシスセソタチツテトナニヌネノハヒフヘホマミムメモヤユヨラリルレロワン"
+# 带浊点和半浊点的片假名，显示为基本片假名加 0xDE 或 0xDF
+# Katakana with a voiced or semi-voiced mark, shown as the base katakana plus 0xDE or 0xDF
+KATAKANA_VOICED = "ガギグゲゴザジズゼゾダヂヅデドバビブベボ"
+KATAKANA_SEMI_VOICED = "パピプペポ"
+
+# 未知字符显示为 "?" Unknown characters are shown as "?"
+REPLACEMENT = 0x3F
+
+ROMS = ("A00", "A02")
+
+
+# 编译字符查找表
+def compile_rom(rom="A00"):
+    """
+    把编码表、替代字符和片假名映射编译为一个查找表，键为 Unicode 码位，值为显示字符码（int）
+    或由多个显示字符码组成的 str，可直接用于 str.translate()。
+    0x80-0xFF 中没有对应字符的码位映射为 "?"，其余没有列出的码位（ASCII 除外）在转换时显示为 "?"
+    Compile a code table, the fallback substitutions and the katakana mapping into one lookup table.
+    Keys are Unicode code points and values are a display code (int) or a str of several display codes,
+    so the table can be passed to str.translate(). Code points 0x80-0xFF with no entry map to "?", and any
+    other code point outside ASCII that is not listed is shown as "?" by the conversion.
+    :param rom: ROM 编码表，"A00" 或 "A02"
+    The ROM code table, "A00" or "A02".
+    :return: 查找表
+    Returns the lookup table.
+    """
+    if rom not in ROMS:
+        raise ValueError("Invalid ROM code. Use 'A00' or 'A02'.")
+    table = {}
+    # 替代字符优先级最低，会被 ROM 中的字符覆盖
+    for letters, base in ACCENTS:
+        for char in letters:
+            table[ord(char)] = base
+    for char, text in FALLBACK.items():
+        table[ord(char)] = text
+    if rom == "A00":
+        # 半角片假名 U+FF61-U+FF9F 与 0xA1-0xDF 一一对应
+        for code in range(0xA1, 0xE0):
+            table[0xFF61 + code - 0xA1] = code
+        for i, char in enumerate(KATAKANA):
+            table[ord(char)] = 0xA6 + i
+        for char in KATAKANA_VOICED:
+            table[ord(char)] = chr(table[ord(char) - 1]) + "\xde"
+        for char in KATAKANA_SEMI_VOICED:
+            table[ord(char)] = chr(table[ord(char) - 2]) + "\xdf"
+        table[ord("ヴ")] = chr(table[ord("ウ")]) + "\xde"
+        for char, text in FALLBACK_A00.items():
+            table[ord(char)] = text
+        # 平假名显示为对应的片假名
+        for code in range(0x3041, 0x3097):
+            if code + 0x60 in table:
+                table[code] = table[code + 0x60]
+        source = ROM_A00
+    else:
+        for code in range(0xA0, 0x100):
+            table[code] = code
+        source = ROM_A02
+    for char, code in source.items():
+        table[ord(char)] = code
+    for code in range(0x80, 0x100):
+        if code not in table:
+            table[code] = REPLACEMENT
+    return table
@@ -0,0 +1,284 @@
+# ########################################
+# LCD1602 MicroPython 直连控制库
+# 示例程序：公共API吞吐量与延迟测试程序
+# 比较精简版 LCD1602_min.py 与主库 LCD1602.py 各公共方法的每秒字符数、每次调用延迟，
+# 以及每个可见字符变化所需的总线传输字节数，并输出 JSON 报告，用于发现热路径的性能退化
+# Compares LCD1602_min.py with LCD1602.py: characters per second, per-call latency and
+# bus transfers per visible change for each public method, and emits a JSON report.
+# 另外在主库上比较关闭和开启写入计划时典型仪表盘每帧的时间和总线字节数
+# It also compares typical dashboard frames on LCD1602.py with the write planner off and on.
+#
+# 在目标板上使用默认引脚连接运行，用 time.ticks_us 计时，不统计总线传输
+# 在 Linux 上自动使用 LCD1602_emulator 仿真，时间为虚拟时钟（延时和引脚访问），并统计总线传输
+# On target it runs on the default pins and times with time.ticks_us, without bus counters.
+# On Linux it runs on LCD1602_emulator: times are virtual (delays and pin accesses) and bus transfers are counted.
+
+import sys
+import json
+import time
+
+try:
+    import machine
+    emu = None
+except ImportError:
+    import LCD1602_emulator
+    emu = LCD1602_emulator.install()
+
+from LCD1602 import LCD1602
+from LCD1602_min import LCD1602 as LCD1602Min
+
+# 每个测试项的调用次数
+ITERATIONS = 20
+# JSON 报告文件，可由第一个命令行参数指定，如 python benchmark_lcd1602.py /tmp/report.json
+REPORT_FILE = sys.argv[1] if len(getattr(sys, "argv", ())) > 1 else "benchmark_lcd1602.json"
+# 滚动/翻页类方法的速度，使其内部的等待时间可以忽略
+FAST_SPEED = 1000000
+
+LONG_TEXT = "The quick brown fox jumps over the lazy dog. 0123456789"
+
+
+# 测试项：每项为 (名称, 调用前准备, 被测调用, 每次调用显示的字符数)
+def setup_none(lcd, i):
+    pass
+
+def setup_cursor_home(lcd, i):
+    if i == 0:
+        lcd.set_clear()
+        lcd.cursor_position(0, 0)
+
+def setup_filled_line(lcd, i):
+    lcd.print_line("Filled line %4d" % i, i % 2)
+
+def setup_browser(lcd, i):
+    if i == 0:
+        lcd.browser_clear()
+        lcd.browser_set_print_speed(FAST_SPEED)
+
+def setup_browser_content(lcd, i):
+    if i == 0:
+        setup_browser(lcd, i)
+        lcd.browser_write(LONG_TEXT * 4)
+        lcd.browser_set_line_pointer(0)
+
+def run_send_byte_data(lcd, i):
+    lcd.send_byte_data(0x41 + i % 26)
+
+def run_print_char(lcd, i):
+    lcd.print_char(chr(0x41 + i % 26))
+
+def run_print_line_full(lcd, i):
+    lcd.print_line(LONG_TEXT[i % 20:i % 20 + 16], i % 2)
+
+def run_print_line_counter(lcd, i):
+    lcd.print_line("Counter: %6d" % (i * 7), 0)
+
+def run_clear_line(lcd, i):
+    lcd.clear_line(i % 2)
+
+def run_scroll_line(lcd, i):
+    lcd.scroll_line(LONG_TEXT[:24], i % 2, FAST_SPEED)
+
+def run_print(lcd, i):
+    lcd.print(LONG_TEXT, FAST_SPEED)
+
+def run_browser_write(lcd, i):
+    lcd.browser_write(LONG_TEXT[:32])
+
+def run_browser_line_down(lcd, i):
+    lcd.browser_line_down()
+
+def run_browser_line_up(lcd, i):
+    lcd.browser_line_up()
+
+def run_browser_page_down(lcd, i):
+    lcd.browser_page_down()
+
+def run_browser_page_up(lcd, i):
+    lcd.browser_page_up()
+
+CASES = [
+    ("send_byte_data", setup_cursor_home, run_send_byte_data, 1),
+    ("print_char", setup_cursor_home, run_print_char, 1),
+    ("print_line_full", setup_none, run_print_line_full, 16),
+    ("print_line_counter", setup_none, run_print_line_counter, 16),
+    ("clear_line", setup_filled_line, run_clear_line, 16),
+    ("scroll_line", setup_none, run_scroll_line, 16 * (24 + 16) + 16),
+    ("print", setup_none, run_print, 16 * ((len(LONG_TEXT) + 15) // 16 * 2 - 1) + 16),
+    ("browser_write", setup_browser, run_browser_write, 32),
+    ("browser_line_down", setup_browser_content, run_browser_line_down, 32),
+    ("browser_line_up", setup_none, run_browser_line_up, 32),
+    ("browser_page_down", setup_none, run_browser_page_down, 32),
+    ("browser_page_up", setup_none, run_browser_page_up, 32),
+]
+
+
+# 仪表盘测试项：每项为 (名称, 生成第 i 帧两行内容的函数)，在主库上比较关闭和开启写入计划
+def dashboard_clock(i):
+    return "12:%02d:%02d  23.%dC" % (i // 60 % 60, i % 60, i // 10 % 10), "Uptime %7ds" % (i * 1000)
+
+def dashboard_sensors(i):
+    return "T:%4.1fC H:%2d%%" % (20 + i % 7 * 0.3, 40 + i % 5), "P:%4dhPa L:%3d" % (1000 + i % 3, i % 4 * 25)
+
+def dashboard_alarm(i):
+    if i % 2:
+        return "    ALARM!", ""
+    return "Flow %5.1f l/min" % (i * 0.7), "Total %8.2f l" % (i * 12.3)
+
+DASHBOARDS = [
+    ("dashboard_clock", dashboard_clock),
+    ("dashboard_sensors", dashboard_sensors),
+    ("dashboard_alarm", dashboard_alarm),
+]
+
+
+# 读取仿真的总线计数
+def bus_counters():
+    if emu is None:
+        return None
+    stats = emu.stats
+    return {
+        "commands": stats["commands"],
+        "data": stats["data"],
+        "e_pulses": stats["e_pulses"],
+        "pin_writes": emu.board.pin_writes,
+        "cell_changes": stats["cell_changes"],
+    }
+
+
+# 运行一个测试项，返回测试结果
+def bench_case(lcd, case, iterations=ITERATIONS):
+    name, setup, run, chars = case
+    elapsed = 0
+    host_ns = 0
+    bus = None
+    for i in range(iterations):
+        setup(lcd, i)
+        before = bus_counters()
+        if emu is not None:
+            host_start = time.perf_counter_ns()
+        start = time.ticks_us()
+        run(lcd, i)
+        elapsed += time.ticks_diff(time.ticks_us(), start)
+        if emu is not None:
+            host_ns += time.perf_counter_ns() - host_start
+            after = bus_counters()
+            if bus is None:
+                bus = {key: 0 for key in after}
+            for key in after:
+                bus[key] += after[key] - before[key]
+    elapsed = max(elapsed, 1)
+    result = {
+        "calls": iterations,
+        "total_us": elapsed,
+        "us_per_call": elapsed / iterations,
+        "chars_per_s": chars * iterations * 1000000 // elapsed,
+    }
+    if emu is not None:
+        result["host_us_per_call"] = host_ns / iterations / 1000
+        result["bus"] = bus
+        transfers = bus["commands"] + bus["data"]
+        result["transfers_per_call"] = transfers / iterations
+        result["transfers_per_change"] = transfers / bus["cell_changes"] if bus["cell_changes"] else None
+    return result
+
+
+# 运行全部测试项
+def bench_library(lcd):
+    results = {}
+    # 清屏，使主库的显示缓冲区与屏幕一致
+    lcd.set_clear()
+    for case in CASES:
+        results[case[0]] = bench_case(lcd, case)
+    if emu is not None and emu.violations:
+        results["timing_violations"] = len(emu.violations)
+        emu.violations.clear()
+    return results
+
+
+# 在主库上比较关闭和开启写入计划时仪表盘刷新的时间和总线传输
+def bench_planner(lcd, iterations=ITERATIONS):
+    results = {}
+    # 仪表盘通常隐藏光标，写入计划可以延迟光标定位
+    lcd.set_cursor_visible(False)
+    lcd.set_cursor_blink(False)
+    for name, frame in DASHBOARDS:
+        result = {}
+        for mode in (False, True):
+            lcd.set_write_planner(mode)
+            lcd.set_clear()
+            elapsed = 0
+            bytes_sent = 0
+            for i in range(iterations):
+                line0, line1 = frame(i)
+                before = bus_counters()
+                start = time.ticks_us()
+                lcd.set_auto_flush(False)
+                lcd.print_line(line0, 0)
+                lcd.print_line(line1, 1)
+                lcd.flush()
+                lcd.set_auto_flush(True)
+                elapsed += time.ticks_diff(time.ticks_us(), start)
+                if before is not None:
+                    after = bus_counters()
+                    bytes_sent += after["commands"] + after["data"] - before["commands"] - before["data"]
+            result["planner" if mode else "direct"] = {
+                "us_per_frame": elapsed / iterations,
+                "bytes_per_frame": bytes_sent / iterations if emu is not None else None,
+            }
+        direct = result["direct"]
+        planner = result["planner"]
+        result["us_saved_per_frame"] = direct["us_per_frame"] - planner["us_per_frame"]
+        if emu is not None:
+            result["bytes_saved_per_frame"] = direct["bytes_per_frame"] - planner["bytes_per_frame"]
+        results[name] = result
+    lcd.set_write_planner(True)
+    return results
+
+
+# 打印对比表格
+def print_report(report):
+    main = report["results"]["LCD1602"]
+    lite = report["results"]["LCD1602_min"]
+    print(f"{'case':<20}{'min us':>12}{'main us':>12}{'speedup':>9}{'min xfer/chg':>14}{'main xfer/chg':>14}")
+    for case in CASES:
+        name = case[0]
+        line = f"{name:<20}{lite[name]['us_per_call']:>12.1f}{main[name]['us_per_call']:>12.1f}{report['speedup'][name]:>8.2f}x"
+        if emu is not None:
+            for result in (lite, main):
+                value = result[name]["transfers_per_change"]
+                line += f"{value:>14.2f}" if value is not None else f"{'-':>14}"
+        print(line)
+    print()
+    print(f"{'dashboard':<20}{'direct us':>12}{'planner us':>12}{'us saved':>10}{'bytes saved':>13}")
+    for name, frame in DASHBOARDS:
+        result = report["planner"][name]
+        line = f"{name:<20}{result['direct']['us_per_frame']:>12.1f}{result['planner']['us_per_frame']:>12.1f}{result['us_saved_per_frame']:>10.1f}"
+        if emu is not None:
+            line += f"{result['bytes_saved_per_frame']:>13.2f}"
+        print(line)
+
+
+# 主库先构造，使仿真控制器从上电状态正确进入4位模式
+lcd = LCD1602()
+lcd_min = LCD1602Min()
+
+report = {
+    "platform": sys.platform,
+    "emulated": emu is not None,
+    "iterations": ITERATIONS,
+    "results": {},
+    "speedup": {},
+}
+report["results"]["LCD1602_min"] = bench_library(lcd_min)
+# 精简版使用同一组引脚后引脚电平已改变，重新初始化主库使其电平记录和显示内容与控制器一致
+lcd.init()
+report["results"]["LCD1602"] = bench_library(lcd)
+for case in CASES:
+    name = case[0]
+    report["speedup"][name] = report["results"]["LCD1602_min"][name]["total_us"] / report["results"]["LCD1602"][name]["total_us"]
+report["planner"] = bench_planner(lcd)
+
+print_report(report)
+with open(REPORT_FILE, "w") as f:
+    json.dump(report, f)
+print(f"Report saved to {REPORT_FILE}")
@@ -57,6 +57,8 @@ lcd.print(long_text, 2) # 打印速度2页/秒
 text1 = "Scroll test!"
 text2 = """! "#$%&'()*+,-./0123456789:;<=>?@ABCDEFGHIJKLMNOPQRSTUVWXYZ[\]^_`abcdefghijklmnopqrstuvwxyz{|}~°¢¥→←↑↓■"""
 lcd.scroll_line(text1, 0, speed=3)
+# 按屏幕的字符 ROM（A00 日文）转换 °、¥、→、← 等字符
+lcd.set_rom_code("A00")
 lcd.scroll_line(text2, 1, speed=7)
 time.sleep(1)  # 等待1秒
 
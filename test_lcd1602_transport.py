@@ -0,0 +1,181 @@
+# ########################################
+# LCD1602 MicroPython 直连控制库
+# 测试程序：传输对象测试，在 Linux 下通过仿真环境运行
+# Transport tests, run on Linux through the emulator:
+#   python -m pytest test_lcd1602_transport.py  或  python test_lcd1602_transport.py
+
+import random
+import LCD1602_emulator
+
+# 须在导入 LCD1602 之前安装仿真的 machine 模块
+LCD1602_emulator.install()
+
+from machine import Pin
+from LCD1602 import LCD1602, PortTransport, SimulatedPort
+from LCD1602_PCF8574 import PCF8574Transport
+
+
+# 生成通过模拟端口写入数据线的传输对象
+def make_port_transport(gpio_numbers, first=0, last=31, xor=True):
+    port = SimulatedPort(first, last, xor)
+    # 端口上其他GPIO（如RS、E 或其他外设）的输出电平不能被数据线写入改变
+    others = 0
+    for gpio in range(first, last + 1):
+        if gpio not in gpio_numbers and gpio % 3 == 0:
+            others |= 1 << (gpio - first)
+    port.out = others
+    rs = Pin(40, Pin.OUT)
+    e = Pin(41, Pin.OUT)
+    data_pins = [Pin(gpio, Pin.OUT) for gpio in gpio_numbers]
+    transport = PortTransport(rs, None, e, data_pins, gpio_numbers, port.port(), pulse_delay_us=0)
+    return transport, port, others
+
+
+# 检查端口上数据线的电平与数值一致，其他GPIO电平不变
+def check_port(port, gpio_numbers, value, others):
+    for i, gpio in enumerate(gpio_numbers):
+        assert port.level(gpio) == (value >> i) & 1, (gpio_numbers, value)
+    mask = 0
+    for gpio in gpio_numbers:
+        mask |= 1 << (gpio - port.first)
+    assert port.out & ~mask == others
+
+
+# 4位和8位模式、置位/清零和翻转寄存器、连续和不连续的数据引脚
+def test_port_transport_levels():
+    random.seed(4)
+    cases = (
+        [4, 5, 6, 7],
+        [9, 3, 14, 6],
+        [0, 1, 2, 3, 4, 5, 6, 7],
+        [2, 9, 3, 15, 20, 21, 30, 31],
+    )
+    for gpio_numbers in cases:
+        for xor in (True, False):
+            transport, port, others = make_port_transport(gpio_numbers, xor=xor)
+            check_port(port, gpio_numbers, 0, others)
+            values = list(range(256)) + [random.randrange(256) for _ in range(200)]
+            for value in values:
+                transport.write(value)
+                # 4位模式最后输出的是低4位
+                check_port(port, gpio_numbers, value & 0x0F if len(gpio_numbers) == 4 else value, others)
+            for value in range(16):
+                transport.write_bits(value)
+                check_port(port, gpio_numbers, value, others)
+
+
+# 电平不变时不写入端口寄存器
+def test_port_transport_skips_unchanged():
+    for xor in (True, False):
+        transport, port, others = make_port_transport([4, 5, 6, 7], xor=xor)
+        transport.write(0x55)
+        writes = port.writes
+        skipped = transport.skipped_writes
+        transport.write(0x55)
+        assert port.writes == writes
+        assert transport.skipped_writes == skipped + (2 if xor else 4)
+
+
+# 不在端口范围内的GPIO，偏移端口的第一个GPIO
+def test_port_transport_offset_port():
+    gpio_numbers = [34, 32, 39, 45]
+    transport, port, others = make_port_transport(gpio_numbers, first=32, last=63)
+    for value in range(256):
+        transport.write(value)
+        check_port(port, gpio_numbers, value & 0x0F, others)
+
+
+# 数据引脚不全在端口内时不使用整端口写入
+def test_data_pins_outside_port():
+    lcd = LCD1602()
+    for pin_name, gpio in (("D4", 4), ("D5", 5), ("D6", 6), ("D7", 7)):
+        lcd.enable_pin(pin_name, gpio)
+    assert lcd.set_gpio_port(SimulatedPort(0, 31).port())
+    assert lcd.data_port is not None
+    assert not lcd.set_gpio_port(SimulatedPort(6, 31).port())
+    assert lcd.data_port is None
+    assert not lcd.set_gpio_port(SimulatedPort(8, 15).port())
+    assert lcd.data_port is None
+
+
+# 记录每次 writeto() 发送内容的 I2C 对象
+class RecordingI2C:
+    def __init__(self):
+        self.frames = []  # (地址, 发送的字节)
+
+    def writeto(self, address, buf, stop=True):
+        self.frames.append((address, bytes(buf)))
+
+    def readfrom_into(self, address, buf):
+        # 忙标志和数据线都读为低电平
+        for i in range(len(buf)):
+            buf[i] = 0
+
+
+# fill() 生成的扩展器字节：每个字符依次为 高4位+E、高4位、低4位+E、低4位
+def test_pcf8574_frame_layout():
+    i2c = RecordingI2C()
+    transport = PCF8574Transport(i2c, 0x27)
+    # 初始化时输出背光位
+    assert i2c.frames == [(0x27, bytes([0x08]))]
+    transport.set_rs(1)
+    transport.write(0xA5)
+    assert i2c.frames[-1] == (0x27, bytes([0xAD, 0xA9, 0x5D, 0x59]))
+    transport.set_rs(0)
+    transport.set_backlight(False)
+    transport.write(0x3C)
+    assert i2c.frames[-1] == (0x27, bytes([0x34, 0x30, 0xC4, 0xC0]))
+    # 自定义扩展器引脚顺序 (RS, RW, E, 背光, D4, D5, D6, D7)
+    i2c = RecordingI2C()
+    transport = PCF8574Transport(i2c, 0x3F, pins=(6, 5, 4, 7, 0, 1, 2, 3))
+    transport.set_rs(1)
+    buf = bytearray(4)
+    transport.fill(buf, 0, 0xA5)
+    assert bytes(buf) == bytes([0xDA, 0xCA, 0xD5, 0xC5])
+
+
+# 一段字符每 run_length 个合并为一次 writeto()
+def test_pcf8574_write_run():
+    i2c = RecordingI2C()
+    transport = PCF8574Transport(i2c, 0x27, run_length=40)
+    transport.set_rs(1)
+    text = bytes(range(0x20, 0x20 + 100))
+    del i2c.frames[:]
+    transport.write_run(text)
+    assert [len(buf) for address, buf in i2c.frames] == [160, 160, 80]
+    expected = bytearray(4 * len(text))
+    for i, value in enumerate(text):
+        transport.fill(expected, 4 * i, value)
+    assert b"".join(buf for address, buf in i2c.frames) == bytes(expected)
+    assert transport.level == expected[-1]
+    del i2c.frames[:]
+    transport.write_run(b"")
+    assert i2c.frames == []
+
+
+# 与扩展器当前输出相同的控制字节不再发送
+def test_pcf8574_write_control_skips_repeats():
+    i2c = RecordingI2C()
+    transport = PCF8574Transport(i2c, 0x27)
+    transport.set_backlight(True)
+    assert len(i2c.frames) == 1
+    assert transport.skipped_writes == 1
+    transport.set_backlight(False)
+    transport.set_backlight(False)
+    assert i2c.frames[1:] == [(0x27, bytes([0x00]))]
+    assert transport.skipped_writes == 2
+    # 发送字符后扩展器输出为最后一个字节，相同的控制字节同样跳过
+    transport.write(0x41)
+    frames = len(i2c.frames)
+    transport.write_control(transport.level)
+    assert len(i2c.frames) == frames
+    assert transport.skipped_writes == 3
+    transport.write_control(0x08)
+    assert i2c.frames[-1] == (0x27, bytes([0x08]))
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(name, "ok")